@@ -3,9 +3,9 @@ import random
 import pygame
 from base_task import BaseTask
 from enum import Enum
-
-# Directory containing currency images
-ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
+from types import SimpleNamespace
+from layout import ASSETS, ASSETS_DIR, REFERENCE_SIZE, Layout, carry, pygame_cache, font as layout_font
+from sprite_pool import SpritePool
 
 
 class ChangeMode(Enum):
@@ -31,69 +31,141 @@ SPACING_X = 20
 SPACING_Y = 20
 
 
+@pygame_cache(maxsize=8)
+def resolve_layout(size):
+    """
+    Compute every rect, text anchor, font and sprite size for one display size.
+
+    Positions are designed on the 1124x768 reference canvas and scaled
+    uniformly; the result is cached until the display size changes.
+    """
+    L = Layout(size)
+    ref_w, ref_h = REFERENCE_SIZE
+    return SimpleNamespace(
+        layout=L,
+        payment_area=L.rect((ref_w - 400) // 2, (ref_h - 500) // 2, 400, 200),
+        change_box=L.rect((ref_w - 150) // 2, 20, 600, 550),
+        yes_btn=L.rect(50, ref_h - 100, 150, 50),
+        no_btn=L.rect(300, ref_h - 100, 150, 50),
+        surrender_btn=L.rect(150, 500, 200, 50),
+        guess_box=L.rect(50, 200, 200, 50),
+        submit_btn=L.rect(260, 200, 100, 40),
+        bill_start=L.point((ref_w - BILL_SIZE[0]) // 2, ref_h - BILL_SIZE[1] - 20),
+        bill_size=L.dims(BILL_SIZE),
+        coin_size=L.dims(COIN_SIZE),
+        spacing=(L.length(SPACING_X), L.length(SPACING_Y)),
+        instruction_pos=L.point(370, 20),
+        status_pos=L.point(20, 20),
+        message_pos=L.point(20, 100),
+        supportive_pos=L.point(500, 650),
+        question_pos=L.point(100, 600),
+        label_pad=(L.length(5), L.length(12)),
+        yes_label_x=L.length(50),
+        no_label_x=L.length(60),
+        font=layout_font(L.length(32)),
+        large_font=layout_font(L.length(48)),
+    )
+
+
+def split_change(amount):
+    """Bills and coins, largest first, that make up `amount` dollars."""
+    bills = []
+    coins = []
+    for denom in [5.00, 1.00]:
+        while amount >= denom - 1e-6:
+            bills.append(denom)
+            amount = round(amount - denom, 2)
+    for denom in [0.25, 0.10, 0.05, 0.01]:
+        while amount >= denom - 1e-6:
+            coins.append(denom)
+            amount = round(amount - denom, 2)
+    return bills, coins
+
+
 class MoneySprite(pygame.sprite.Sprite):
-    def __init__(self, value: float, pos):
+    def __init__(self, value: float, pos, size=None):
         super().__init__()
         self.value = round(value, 2)
         filename = CURRENCY_IMAGE_MAP.get(self.value)
         if not filename:
             raise ValueError(f"No image mapping for currency value {self.value}")
-        image_path = os.path.join(ASSETS_DIR, filename)
-        try:
-            img = pygame.image.load(image_path).convert_alpha()
-        except Exception:
-            raise FileNotFoundError(f"Could not load currency image: {image_path}")
-        size = BILL_SIZE if self.value >= 1.00 else COIN_SIZE
-        img = pygame.transform.smoothscale(img, size)
-        self.image = img
+        self.image = self.load_image(self.value, size or (BILL_SIZE if self.value >= 1.00 else COIN_SIZE))
         self.rect = self.image.get_rect(topleft=pos)
         self.initial_pos = pos
         self.dragging = False
         self.offset = (0, 0)
 
+    @staticmethod
+    def load_image(value, size):
+        """Shared, pre-scaled image for `value` at `size`."""
+        filename = CURRENCY_IMAGE_MAP[value]
+        try:
+            return ASSETS.image(filename, size)
+        except Exception:
+            raise FileNotFoundError(f"Could not load currency image: {os.path.join(ASSETS_DIR, filename)}")
+
+
+def _make_sprite(value, image, pos):
+    return MoneySprite(value, pos, image.get_size())
+
 
 class IncorrectChange(BaseTask):
-    def __init__(self, screen, change_mode):
-        super().__init__(screen, subtask_id="incorrect_change")
-        self.price = 1.25
-        self.payment_amount = 5.00
-        self.change_mode = change_mode
+    def __init__(self, screen, change_mode, price=1.25, payment_amount=5.00, change_offset=None, **kw):
+        super().__init__(screen, subtask_id="incorrect_change", config=kw)
+        if payment_amount != 5.00:
+            raise ValueError("payment_amount must be 5.0: phase 1 hands over the $5 bill")
+        if not 0 < price < payment_amount:
+            raise ValueError(f"price must be between $0 and ${payment_amount:.2f}")
+        self.price = price
+        self.payment_amount = payment_amount
+        self.change_mode = ChangeMode[change_mode] if isinstance(change_mode, str) else change_mode
+        self.change_offset = change_offset  # fixed error in the change given (overrides change_mode)
+
+        # Rects, text anchors and fonts (cached per display size)
+        self._apply_layout()
+
+        # Refuse change that cannot be shown now rather than mid-session
+        due = round(payment_amount - price, 2)
+        if change_offset is not None:
+            self._layout_change(round(due + change_offset, 2))
+        else:
+            for amount in (due, round(due - 0.20, 2), round(due + 0.20, 2)):
+                self._layout_change(amount)
+
+        # Sprites are pooled: both phases and restarts reuse them
+        self.pool = SpritePool(_make_sprite)
+        self.sprites = pygame.sprite.Group()
+        self.change_sprites = pygame.sprite.Group()
+        self._reset_state()
+
+        self.init_args = {
+            "change_mode": self.change_mode.name,
+            "price": price,
+            "payment_amount": payment_amount,
+            "change_offset": change_offset,
+        }
+
+        self._init_phase1()
+
+    def _reset_state(self):
         self.phase = 1
         self.dragging = False
         self.dragged_sprite = None
         self.show_change_guess = False
         self.change_guess_active = False
         self.correct = False
-
-        w, h = screen.get_size()
-        self.payment_area = pygame.Rect((w - 400) // 2, (h - 500) // 2, 400, 200)
-        self.change_box = pygame.Rect((w - 150) // 2, 20, 600, 550)
-        self.yes_btn = pygame.Rect(50, h - 100, 150, 50)
-        self.no_btn = pygame.Rect(300, h - 100, 150, 50)
-        self.surrender_btn = pygame.Rect(150, 500, 200, 50)
-        self.highlight_yes = False  # Flag for highlighting buttons
+        self.highlight_yes = False  # Flags for highlighting buttons
         self.highlight_no = False
 
         # When user needs to enter their guess
         self.collect_guess = False
         self.user_guess = ""
-        # Position button and textbox
-        self.guess_box = pygame.Rect(50, 200, 200, 50)
-        self.submit_btn = pygame.Rect(260, 200, 100, 40)
 
-        self.sprites = pygame.sprite.Group()
-        self.change_sprites = pygame.sprite.Group()
         self.message = ""  # General directions for the user
         self.change_guess = ""  # Used when the provided changed is wrong and the user needs to calculate correct change
         self.supportive_message = ""  # Used for independence scoring
 
-        shown_amount = sum(sprite.value for sprite in self.change_sprites)
-        correct_amount = round(self.payment_amount - self.price, 2)
-        self.diff = abs(shown_amount - correct_amount)   # Difference between the shown change and the target change
-
-        # Fonts
-        self.font = pygame.font.SysFont(None, 32)
-        self.large_font = pygame.font.SysFont(None, 48)
+        self.diff = 0.0  # Difference between the shown change and the target change (set in phase 2)
 
         # Scoring
         self.errors = 0
@@ -101,67 +173,121 @@ class IncorrectChange(BaseTask):
         self.inactive_seconds = 0.0
         self.elapsed = 0.0
 
+    def _restart(self):
+        self._reset_state()
         self._init_phase1()
 
+    def _apply_layout(self, size=None):
+        self.ui = resolve_layout(tuple(size or self.screen.get_size()))
+        self.payment_area = self.ui.payment_area
+        self.change_box = self.ui.change_box
+        self.yes_btn = self.ui.yes_btn
+        self.no_btn = self.ui.no_btn
+        self.surrender_btn = self.ui.surrender_btn
+        self.guess_box = self.ui.guess_box
+        self.submit_btn = self.ui.submit_btn
+        self.font = self.ui.font
+        self.large_font = self.ui.large_font
+
+    def _on_resize(self):
+        old = self.ui.layout
+        self._apply_layout()
+        new = self.ui.layout
+        ratio = new.scale / old.scale
+        for spr in list(self.sprites) + list(self.change_sprites):
+            size = self.ui.bill_size if spr.value >= 1.00 else self.ui.coin_size
+            spr.image = MoneySprite.load_image(spr.value, size)
+            spr.rect = spr.image.get_rect(topleft=carry(spr.rect.topleft, old, new))
+            spr.initial_pos = carry(spr.initial_pos, old, new)
+            spr.offset = (int(spr.offset[0] * ratio), int(spr.offset[1] * ratio))
+
     def _init_phase1(self):
-        self.sprites.empty()
-        self.change_sprites.empty()
+        self.pool.release(self.sprites)
+        self.pool.release(self.change_sprites)
         self.phase = 1
-        bx = (self.screen.get_width() - BILL_SIZE[0]) // 2
-        by = self.screen.get_height() - BILL_SIZE[1] - 20
-        self.sprites.add(MoneySprite(5.00, (bx, by)))
+        self.pool.acquire(5.00, MoneySprite.load_image(5.00, self.ui.bill_size), self.ui.bill_start, self.sprites)
 
     def _init_phase2(self):
         # Determine correctness
-        if self.change_mode == ChangeMode.ALWAYS_RIGHT:
+        if self.change_offset is not None:
+            self.correct = round(self.change_offset, 2) == 0
+        elif self.change_mode == ChangeMode.ALWAYS_RIGHT:
             self.correct = True
         elif self.change_mode == ChangeMode.ALWAYS_WRONG:
             self.correct = False
         else:
             self.correct = random.random() < 0.5
         correct_due = round(self.payment_amount - self.price, 2)
-        amt = correct_due if self.correct else round(correct_due + (0.20 if random.random() < 0.5 else -0.20), 2)
-
-        # Split into bills and coins
-        bills = []
-        coins = []
-        for denom in [5.00, 1.00]:
-            while amt >= denom - 1e-6:
-                bills.append(denom)
-                amt = round(amt - denom, 2)
-        for denom in [0.25, 0.10, 0.05, 0.01]:
-            while amt >= denom - 1e-6:
-                coins.append(denom)
-                amt = round(amt - denom, 2)
-
-        # Render bills on left side
-        self.change_sprites.empty()
-        start_x_b = self.change_box.left + SPACING_X
-        start_y = self.change_box.top + self.large_font.get_height() + SPACING_Y
-        max_b_y = self.change_box.bottom - SPACING_Y
-        col_x = start_x_b
-        col_y = start_y
-        for value in bills:
-            if col_y + BILL_SIZE[1] > max_b_y:
-                col_y = start_y
-                col_x += BILL_SIZE[0] + SPACING_X
-            self.change_sprites.add(MoneySprite(value, (col_x, col_y)))
-            col_y += BILL_SIZE[1] + SPACING_Y
+        if self.change_offset is not None:
+            amt = round(correct_due + self.change_offset, 2)
+        else:
+            amt = correct_due if self.correct else round(correct_due + (0.20 if random.random() < 0.5 else -0.20), 2)
 
-        # Render coins on right side
-        start_x_c = self.change_box.right - SPACING_X - COIN_SIZE[0]
-        col_x = start_x_c
-        col_y = start_y
-        max_c_y = self.change_box.bottom - SPACING_Y
-        for value in coins:
-            if col_y + COIN_SIZE[1] > max_c_y:
-                col_y = start_y
-                col_x -= COIN_SIZE[0] + SPACING_X
-            self.change_sprites.add(MoneySprite(value, (col_x, col_y)))
-            col_y += COIN_SIZE[1] + SPACING_Y
+        self.pool.release(self.change_sprites)
+        for value, pos in self._layout_change(amt):
+            size = self.ui.bill_size if value >= 1.00 else self.ui.coin_size
+            self.pool.acquire(value, MoneySprite.load_image(value, size), pos, self.change_sprites)
+        self.diff = self._change_diff()
 
         self.phase = 2
         self.message = ""
+        self.timeline.cue("change_shown")
+
+    def _layout_change(self, amount):
+        """
+        Place the bills and coins that make up `amount` in the change box.
+
+        Bills fill columns from the left, coins the free cells from the right
+        (see `_coin_slots`).
+
+        Returns:
+            list: (value, (x, y)) per piece, in drawing order.
+
+        Raises:
+            ValueError: The pieces do not fit in the change box.
+        """
+        bills, coins = split_change(amount)
+        bill_w, bill_h = self.ui.bill_size
+        space_x, space_y = self.ui.spacing
+        start_y = self.change_box.top + self.large_font.get_height() + space_y
+        placed = []
+
+        # Bills on the left side
+        col_x = self.change_box.left + space_x
+        col_y = start_y
+        for value in bills:
+            if col_y + bill_h > self.change_box.bottom - space_y:
+                col_y = start_y
+                col_x += bill_w + space_x
+            if col_x + bill_w > self.change_box.right - space_x:
+                raise ValueError(f"${amount:.2f} in change does not fit the change box")
+            placed.append((value, (col_x, col_y)))
+            col_y += bill_h + space_y
+
+        # Coins on the right side, around any bills that reach over
+        slots = self._coin_slots(start_y, [pygame.Rect(pos, (bill_w, bill_h)) for _, pos in placed])
+        for value in coins:
+            pos = next(slots, None)
+            if pos is None:
+                raise ValueError(f"${amount:.2f} in change does not fit the change box")
+            placed.append((value, pos))
+        return placed
+
+    def _coin_slots(self, start_y, taken):
+        """
+        Free coin positions in the change box: columns from the right edge
+        leftwards, top to bottom in each, skipping cells a bill covers.
+        """
+        coin_w, coin_h = self.ui.coin_size
+        space_x, space_y = self.ui.spacing
+        col_x = self.change_box.right - space_x - coin_w
+        while col_x >= self.change_box.left + space_x:
+            col_y = start_y
+            while col_y + coin_h <= self.change_box.bottom - space_y:
+                if pygame.Rect(col_x, col_y, coin_w, coin_h).collidelist(taken) < 0:
+                    yield col_x, col_y
+                col_y += coin_h + space_y
+            col_x -= coin_w + space_x
 
     def _custom_event_handler(self, event):
         # Phase 1 Event Handling
@@ -208,6 +334,7 @@ class IncorrectChange(BaseTask):
                 # still allow “Give Up” even while typing
                 elif self.surrender_btn.collidepoint(event.pos):
                     # exactly the same surrender logic you have in phase 2:
+                    self.end_reason = "surrender"
                     self._complete(False, self.diff)
             return
 
@@ -216,11 +343,12 @@ class IncorrectChange(BaseTask):
         elif self.phase == 2 and event.type == pygame.MOUSEBUTTONDOWN:
             self.inactive_seconds = 0.0  # Reset inactivity
 
-            total = sum(sp.value for sp in self.change_sprites)
+            total = round(sum(sp.value for sp in self.change_sprites), 2)
             correct_sum = round(self.payment_amount - self.price, 2)
             if self.yes_btn.collidepoint(event.pos):
                 if total == correct_sum:
                     self.message = "Yes — Thanks!"
+                    self.end_reason = "answer"
                     self._complete(True)
                 else:
                     self.message = "No - Actually it was wrong"
@@ -233,20 +361,11 @@ class IncorrectChange(BaseTask):
                 else:
                     self.message = "No — Actually it was right."
                     self.errors += 1
+                    self.end_reason = "answer"
                     self._complete(False, self.diff)
             elif self.surrender_btn.collidepoint(event.pos):
-                # Check for change accuracy difference
-                if not self.correct:
-                    # Minor miss
-                    if self.diff < 1.5:
-                        self.independence_score = 7
-                    # Major miss
-                    else:
-                        self.independence_score = 8
-                else:
-                    self.independence_score = 9
-
-                # Terminate the program
+                # Terminate the program (surrender tiers: scoring.Rules.incorrect_change)
+                self.end_reason = "surrender"
                 self._complete(False, self.diff)
 
     def _render(self):
@@ -258,12 +377,12 @@ class IncorrectChange(BaseTask):
             self.screen.blit(pa_label, (self.payment_area.centerx - pa_label.get_width() // 2,
                                         self.payment_area.y + 10))
             inst = "Drag the $5 bill into the payment area"
-            self.screen.blit(self.font.render(inst, True, (50, 50, 50)), (370, 20))
+            self.screen.blit(self.font.render(inst, True, (50, 50, 50)), self.ui.instruction_pos)
             self.sprites.draw(self.screen)
         else:
 
             status = f"You paid ${self.payment_amount:.2f} for an item that costed ${self.price:.2f}"
-            self.screen.blit(self.font.render(status, True, (0, 0, 0)), (20, 20))
+            self.screen.blit(self.font.render(status, True, (0, 0, 0)), self.ui.status_pos)
 
             if self.collect_guess:
                 # draw the input box
@@ -272,7 +391,8 @@ class IncorrectChange(BaseTask):
                 pygame.draw.rect(self.screen, (0, 0, 0), self.guess_box, 2)
                 # render the current input
                 txt_surf = self.font.render(self.user_guess, True, (0, 0, 0))
-                self.screen.blit(txt_surf, (self.guess_box.x + 5, self.guess_box.y + 5))
+                pad = self.ui.label_pad[0]
+                self.screen.blit(txt_surf, (self.guess_box.x + pad, self.guess_box.y + pad))
 
                 # draw submit button
                 pygame.draw.rect(self.screen, (100, 200, 100), self.submit_btn)
@@ -289,22 +409,21 @@ class IncorrectChange(BaseTask):
             pygame.draw.rect(self.screen, (240, 240, 200), self.change_box)
             lbl = self.large_font.render("Change Received", True, (80, 80, 0))
             self.screen.blit(lbl, ((self.change_box.centerx - lbl.get_width() // 2),
-                                   self.change_box.top + 10))
+                                   self.change_box.top + self.ui.spacing[1] // 2))
             self.change_sprites.draw(self.screen)
             q = self.font.render("Is this the correct change?", True, (0, 0, 0))
-            qy = self.change_box.bottom + SPACING_Y
-            self.screen.blit(q, (100, 600))
+            self.screen.blit(q, self.ui.question_pos)
             pygame.draw.rect(self.screen, (0, 200, 0), self.yes_btn)
             self.screen.blit(self.font.render("Yes", True, (0, 0, 0)),
-                             (self.yes_btn.x + 50, self.yes_btn.y + 12))  # Draw text on Yes button
+                             (self.yes_btn.x + self.ui.yes_label_x, self.yes_btn.y + self.ui.label_pad[1]))  # Draw text on Yes button
             pygame.draw.rect(self.screen, (200, 0, 0), self.no_btn)
             self.screen.blit(self.font.render("No", True, (0, 0, 0)),
-                             (self.no_btn.x + 60, self.no_btn.y + 12))  # Draw text on No button
+                             (self.no_btn.x + self.ui.no_label_x, self.no_btn.y + self.ui.label_pad[1]))  # Draw text on No button
 
             if self.highlight_no:
-                pygame.draw.rect(screen, (0, 0, 255), self.no_btn, 5)
+                pygame.draw.rect(self.screen, (0, 0, 255), self.no_btn, 5)
             if self.highlight_yes:
-                pygame.draw.rect(screen, (0, 0, 255), self.yes_btn, 5)
+                pygame.draw.rect(self.screen, (0, 0, 255), self.yes_btn, 5)
 
             # Render text box if necessary
             if self.show_change_guess:
@@ -314,15 +433,81 @@ class IncorrectChange(BaseTask):
 
                 # render the text
                 txt_surf = self.font.render(self.change_guess, True, (0, 0, 0))
-                screen.blit(txt_surf, (self.guess_box.x + 5, self.guess_box.y + 5))
+                pad = self.ui.label_pad[0]
+                self.screen.blit(txt_surf, (self.guess_box.x + pad, self.guess_box.y + pad))
 
         if self.message:
-            self.screen.blit(self.font.render(self.message, True, (100, 0, 0)), (20, 100))
+            self.screen.blit(self.font.render(self.message, True, (100, 0, 0)), self.ui.message_pos)
         if self.supportive_message:
-            self.screen.blit(self.font.render(self.supportive_message, True, (200, 10, 100)), (500, 650))
+            self.screen.blit(self.font.render(self.supportive_message, True, (200, 10, 100)), self.ui.supportive_pos)
         pygame.display.flip()
 
+    def observable_state(self):
+        state = super().observable_state()
+        if self.phase == 1:
+            areas = {"pay": list(self.payment_area)}
+        else:
+            areas = {"change": list(self.change_box), "yes": list(self.yes_btn), "no": list(self.no_btn),
+                     "give_up": list(self.surrender_btn)}
+            if self.collect_guess:
+                areas["guess"] = list(self.guess_box)
+        sprites = {"b": [s.value, s.rect.x, s.rect.y, s.rect.w, s.rect.h, False, False] for s in self.sprites}
+        for i, s in enumerate(self.change_sprites):
+            sprites[f"c{i}"] = [s.value, s.rect.x, s.rect.y, s.rect.w, s.rect.h, False, False]
+        state.update({
+            "phase": self.phase,
+            "areas": areas,
+            "sprites": sprites,
+            "assist": self.independence_score,
+            "msg": self.supportive_message or self.message,
+            "hl": [self.highlight_yes, self.highlight_no],
+            "guess": self.user_guess,
+        })
+        return state
+
+    def checkpoint_state(self):
+        state = self.observable_state()
+        state.update({
+            "correct": self.correct,
+            "errors": self.errors,
+            "collect_guess": self.collect_guess,
+            "message": self.message,
+            "support": self.supportive_message,
+            "elapsed": int(self.elapsed),
+        })
+        return state
+
+    def restore_state(self, state):
+        super().restore_state(state)
+        # Rebuild at the recorded size, then let resize() carry everything over
+        self._screen_size = tuple(state["size"])
+        self._apply_layout(self._screen_size)
+        self._init_phase1()
+        if state["phase"] == 2:
+            for bill in self.sprites:  # the handed-over $5 stays where it was dropped
+                bill.rect.topleft = tuple(state["sprites"]["b"][1:3])
+            for key in sorted((k for k in state["sprites"] if k.startswith("c")), key=lambda k: int(k[1:])):
+                value, x, y, w, h, _, _ = state["sprites"][key]
+                self.pool.acquire(value, MoneySprite.load_image(value, (w, h)), (x, y), self.change_sprites)
+            self.phase = 2
+        self.correct = state["correct"]
+        self.errors = state["errors"]
+        self.collect_guess = state["collect_guess"]
+        self.user_guess = state["guess"]
+        self.message = state["message"]
+        self.supportive_message = state["support"]
+        self.highlight_yes, self.highlight_no = state["hl"]
+        self.independence_score = state["assist"]
+        self.diff = self._change_diff() if self.phase == 2 else 0.0
+        self.elapsed = float(state["elapsed"])
+        self.inactive_seconds = 0.0
+        self.resize(self.screen)
+
     # ---- HELPER METHODS ----
+    def _change_diff(self):
+        shown = round(sum(sprite.value for sprite in self.change_sprites), 2)
+        return round(abs(shown - round(self.payment_amount - self.price, 2)), 2)
+
     def _finish_guess(self):
         s = self.user_guess.strip().lstrip('$')
         try:
@@ -335,37 +520,42 @@ class IncorrectChange(BaseTask):
         # compare to within a half‐cent
         if abs(entered - due) < 0.005:
             self.result_data["user_guess"] = entered
-            self.running = False
+            self.end_reason = "guess"
+            self._complete(True)
         else:
             self.message = f"You entered ${entered:.2f}. Try again or give up."
 
     def _update(self):
-        dt_ms = self.clock.tick(60)
+        dt_ms = self.clock.get_time()  # BaseTask.run already ticked this frame
         self.inactive_seconds += dt_ms / 1000
         self.elapsed += dt_ms / 1000
 
         if self.phase == 2:
             # Independence Calculations
-            if self.inactive_seconds > 5 and self.independence_score == 0:
+            cue_after = self.rules.ladder(self.subtask_id)  # idle seconds before each cue level
+            if self.inactive_seconds > cue_after[0] and self.independence_score == 0:
                 # Show an encouraging message
                 self.supportive_message = "You Got This!"
                 self.inactive_seconds = 0
                 self.independence_score = 1
+                self.timeline.cue("assist_1")
 
-            if self.inactive_seconds > 3 and self.independence_score == 1:
+            if self.inactive_seconds > cue_after[1] and self.independence_score == 1:
                 # Show a verbal directive cue
                 self.supportive_message = "Click YES if the change is correct and NO otherwise"
                 self.inactive_seconds = 0
                 self.independence_score = 2
+                self.timeline.cue("assist_2")
 
-            if self.inactive_seconds > 3 and self.independence_score == 2:
+            if self.inactive_seconds > cue_after[2] and self.independence_score == 2:
                 # Highlight the buttons
                 self.highlight_yes = True
                 self.highlight_no = True
                 self.inactive_seconds = 0
                 self.independence_score = 3
+                self.timeline.cue("assist_3")
 
-            if self.inactive_seconds > 3 and self.independence_score == 3:
+            if self.inactive_seconds > cue_after[3] and self.independence_score == 3:
                 # Highlight the correct button
                 self.highlight_yes = False
                 self.highlight_no = False
@@ -375,40 +565,35 @@ class IncorrectChange(BaseTask):
                     self.highlight_no = True
                 self.inactive_seconds = 0
                 self.independence_score = 4
+                self.timeline.cue("assist_4")
 
-            if self.inactive_seconds > 3 and self.independence_score == 4:
+            if self.inactive_seconds > cue_after[4] and self.independence_score == 4:
                 self.inactive_seconds = 0
                 self.independence_score = 5
+                self.timeline.cue("assist_5")
 
-            if self.inactive_seconds > 3 and self.independence_score == 5:
+            if self.inactive_seconds > cue_after[5] and self.independence_score == 5:
                 self.independence_score = 6
+                self.timeline.cue("assist_6")
 
     def _complete(self, success=False, error=None):
-        # Calculate quality and process scores
-        quality = 3
-        process = 0
-        if success:
-            if self.errors > 4:
-                process = 0
-            elif self.errors > 3:
-                process = 1
-            elif self.errors > 2:
-                process = 2
-
-        if self.diff < .1:
-            quality = 2
-        elif self.diff < .5:
-            quality = 1
-        else:
-            quality = 0
+        # Independence, quality and process scores (scoring.Rules.incorrect_change)
+        scores = self._score({
+            "end": self.end_reason,
+            "success": success,
+            "cue": self.independence_score,
+            "errors": self.errors,
+            "correct": self.correct,
+            "shown": round(sum(sprite.value for sprite in self.change_sprites), 2),
+            "due": round(self.payment_amount - self.price, 2),
+            "guessing": self.collect_guess,
+        })
+        self.independence_score = scores["independence_score"]
 
         self.result_data.update({
             "subtask_id": "Incorrect Change",
             "duration_sec": self.elapsed,
             "errors": self.errors,
-            "independence_score": self.independence_score,
-            "quality_score": quality,
-            "process_score": process,
             "success": success,
         })
         self.running = False
@@ -416,7 +601,7 @@ class IncorrectChange(BaseTask):
 
 if __name__ == "__main__":
     pygame.init()
-    screen = pygame.display.set_mode((1124, 768))
+    screen = pygame.display.set_mode((1124, 768), pygame.RESIZABLE)
     task = IncorrectChange(screen, ChangeMode.ALWAYS_WRONG)
     task.run()
     print(task.get_results())
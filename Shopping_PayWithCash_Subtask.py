@@ -1,12 +1,14 @@
-import os, random, pygame
+import random, pygame
+from types import SimpleNamespace
 from base_task import BaseTask
+from layout import ASSETS, REFERENCE_SIZE, Layout, carry, pygame_cache, font as layout_font
 from money_sprite import MoneySprite
+from sprite_pool import SpritePool, reset as reset_sprites
 
 # ---------------------------------------------------------------------------
 #  Constants & assets
 # ---------------------------------------------------------------------------
 WHITE, BLACK, GREY = (255, 255, 255), (0, 0, 0), (230, 230, 230)
-ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
 
 WALLET_COUNTS = {
     5.00: 1,  # one $5 bill
@@ -28,38 +30,106 @@ BILL_SIZE = (120, 55)  # width, height
 COIN_SIZE = (60, 60)
 
 RECEIPT_W, RECEIPT_H = 420, 240
+PAY_W, PAY_H = 550, 300
 
 # Submit‑button dimensions
 BTN_W, BTN_H = 160, 50
 
 
+# ---------------------------------------------------------------------------
+#  Layout – resolved once per (display size, wallet), reused until a resize
+# ---------------------------------------------------------------------------
+@pygame_cache(maxsize=8)
+def resolve_layout(size, wallet_key):
+    """
+    Compute every rect, wallet slot, font and scaled image for one display size.
+
+    Positions are designed on the 1124x768 reference canvas and scaled
+    uniformly, so nothing lands off-screen on short or narrow displays.
+    """
+    L = Layout(size)
+    ref_w, ref_h = REFERENCE_SIZE
+    pay_x, pay_y = ref_w - PAY_W - 60, ref_h - PAY_H - 430
+
+    # Wallet grid: rows of up to ten, stacked upward from the bottom-left; a
+    # row also wraps early when the next piece would run off the canvas
+    slots = []
+    x_start, x, y = 40, 40, ref_h - 140
+    in_row = 0
+    for denom, count in wallet_key:
+        w, h = BILL_SIZE if denom >= 1 else COIN_SIZE
+        for _ in range(count):
+            if in_row == 10 or (in_row and x + w > ref_w):
+                x, in_row = x_start, 0
+                y -= max(BILL_SIZE[1], COIN_SIZE[1]) + 10
+            slots.append(L.point(x, y))
+            x += w + 10
+            in_row += 1
+
+    images = {}
+    for denom, _ in wallet_key:
+        size_px = L.dims(BILL_SIZE if denom >= 1 else COIN_SIZE)
+        try:
+            images[denom] = ASSETS.image(f"{DENOM_NAME[denom]}.png", size_px)
+        except (pygame.error, FileNotFoundError):
+            img = pygame.Surface(size_px)
+            img.fill((190, 190, 190))
+            images[denom] = img
+
+    msg_h, padding = L.length(40), L.length(10)
+    return SimpleNamespace(
+        layout=L,
+        pay_area=L.rect(pay_x, pay_y, PAY_W, PAY_H),
+        submit_rect=L.rect(pay_x + PAY_W // 2 - BTN_W // 2, pay_y + PAY_H + 20, BTN_W, BTN_H),
+        surrender_rect=L.rect(20, (ref_h // 2 - BTN_H // 2) - 35, BTN_W, BTN_H),
+        receipt_rect=L.rect(40, 40, RECEIPT_W, RECEIPT_H),
+        timer_pos=L.point(40, ref_h - 40),
+        banner_rect=pygame.Rect(0, size[1] - msg_h - padding, size[0], msg_h),
+        pad=L.length(10),
+        slots=slots,
+        images=images,
+        font=layout_font(L.length(28)),
+    )
+
+
 # ---------------------------------------------------------------------------
 #  MakeChangeTask – limited wallet, manual submit, hidden running total
 # ---------------------------------------------------------------------------
 class MakeChangeTask(BaseTask):
     def __init__(self, screen: pygame.Surface, items=None, prices=None,
-                 max_time_sec: int = 120, max_attempts: int = 3, font=None, **kw):
+                 max_time_sec: int = 120, max_attempts: int = 3, font=None, wallet=None, **kw):
         super().__init__(screen, subtask_id="make_change_submit", config=kw)
-        self.font = font or pygame.font.SysFont(None, 28)
+        self._fixed_font = font
 
         # --- receipt
         self.items, self.prices, self.total = self._build_receipt(items, prices)
 
-        # --- wallet sprites (limited counts)
+        # --- layout: pay‑zone, buttons, wallet slots (cached per display size)
+        # JSON configs and journals give denominations as strings ("0.25")
+        self.wallet = {float(denom): count for denom, count in (wallet or WALLET_COUNTS).items()}
+        self._apply_layout()
+
+        # --- wallet sprites (limited counts), pooled so restore reuses them
+        self.pool = SpritePool(MoneySprite)
         self.wallet_sprites = pygame.sprite.Group()
         self._load_wallet_sprites()
 
-        # --- pay‑zone + buttons
-        self.pay_area = self._build_pay_area()
-        self.submit_rect = self._build_submit_rect()
-        self.surrender_rect = self._build_surrender_rect()
-
         # --- state
-        self.payment_total = 0.0  # not shown to player
         self.max_time = max_time_sec
+        self._reset_state(max_attempts)
+
+        self.init_args = {
+            "items": list(self.items),
+            "prices": list(self.prices),
+            "wallet": {str(denom): count for denom, count in self.wallet.items()},
+            "max_time_sec": max_time_sec,
+            "max_attempts": max_attempts,
+        }
+
+    def _reset_state(self, max_attempts):
+        self.payment_total = 0.0  # not shown to player
         self.max_attempts = max_attempts
-        self.start_ticks = pygame.time.get_ticks()
-        self.clock = pygame.time.Clock()
+        self.attempt_start = self.now()
         self.inactivity_seconds = 0.0
         self.assist_level_used = 0  # Independence Score
         self.process_score = 3  # Process Score
@@ -88,50 +158,37 @@ class MakeChangeTask(BaseTask):
         items, prices = zip(*random.sample(catalog, 4))
         return list(items), list(prices), round(sum(prices), 2)
 
-    def _build_pay_area(self):
-        w, h = 550, 300
-        x = self.screen.get_width() - w - 60
-        y = self.screen.get_height() - h - 430
-        return pygame.Rect(x, y, w, h)
-
-    def _build_submit_rect(self):
-        x = self.pay_area.centerx - BTN_W // 2
-        y = self.pay_area.bottom + 20
-        return pygame.Rect(x, y, BTN_W, BTN_H)
-
-    def _build_surrender_rect(self):
-        screen_w, screen_h = self.screen.get_size()
-        x = 20  # 20px from the left edge
-        y = (screen_h // 2 - BTN_H // 2) - 35
-        self.surrender_rect = pygame.Rect(x, y, BTN_W, BTN_H)
-        return pygame.Rect(x, y, BTN_W, BTN_H)
+    def _apply_layout(self, size=None):
+        self.ui = resolve_layout(tuple(size or self.screen.get_size()), tuple(self.wallet.items()))
+        self.font = self._fixed_font or self.ui.font
+        self.pay_area = self.ui.pay_area
+        self.submit_rect = self.ui.submit_rect
+        self.surrender_rect = self.ui.surrender_rect
 
     def _load_wallet_sprites(self):
-        x_start, y_start = 40, self.screen.get_height() - 140
-        x, y = x_start, y_start
-        row_spacing = 10
-        col_spacing = 10
-        max_per_row = 10
-
-        for denom, count in WALLET_COUNTS.items():
-            for i in range(count):
-                name = DENOM_NAME[denom]
-                path = os.path.join(ASSETS_DIR, f"{name}.png")
-                try:
-                    img = pygame.image.load(path).convert_alpha()
-                    img = pygame.transform.smoothscale(img, BILL_SIZE if denom >= 1 else COIN_SIZE)
-                except pygame.error:
-                    img = pygame.Surface(BILL_SIZE if denom >= 1 else COIN_SIZE)
-                    img.fill((190, 190, 190))
-                spr = MoneySprite(denom, img, (x, y))
-                self.wallet_sprites.add(spr)
-                spr.initial_pos = spr.rect.topleft
-
-                # advance grid
-                x += spr.rect.width + col_spacing
-                if (len(self.wallet_sprites) % max_per_row) == 0:
-                    x = x_start
-                    y -= (spr.rect.height + row_spacing)
+        denoms = [denom for denom, count in self.wallet.items() for _ in range(count)]
+        for slot, (denom, pos) in enumerate(zip(denoms, self.ui.slots)):
+            spr = self.pool.acquire(denom, self.ui.images[denom], pos, self.wallet_sprites)
+            spr.slot = spr.home = slot  # slot moves with cue swaps, home does not
+
+    def _restart(self):
+        # Undo cue swaps, then every sprite goes home; nothing is rebuilt
+        for spr in self.wallet_sprites:
+            spr.slot = spr.home
+            spr.initial_pos = self.ui.slots[spr.home]
+        reset_sprites(self.wallet_sprites, highlights=True)
+        self._reset_state(self.init_args["max_attempts"])
+
+    def _on_resize(self):
+        old = self.ui.layout
+        self._apply_layout()
+        new = self.ui.layout
+        ratio = new.scale / old.scale
+        for spr in self.wallet_sprites:
+            spr.image = self.ui.images[spr.value]
+            spr.rect = spr.image.get_rect(topleft=carry(spr.rect.topleft, old, new))
+            spr.initial_pos = self.ui.slots[spr.slot]
+            spr.offset = (int(spr.offset[0] * ratio), int(spr.offset[1] * ratio))
 
     # -------------------------------------------------------------- event loop
     def _custom_event_handler(self, event):
@@ -227,10 +284,13 @@ class MakeChangeTask(BaseTask):
         # swap stored initial positions (for resets)
         if hasattr(spr1, 'initial_pos') and hasattr(spr2, 'initial_pos'):
             spr1.initial_pos, spr2.initial_pos = spr2.initial_pos, spr1.initial_pos
+            spr1.slot, spr2.slot = spr2.slot, spr1.slot
 
     def pick_highlight(self, amount_left_to_pay):
-        # Sort the denominations by numeric value descending
-        for value in sorted(DENOM_NAME.keys(), reverse=True):
+        # Largest denomination that fits and still has a piece outside the
+        # pay area (a wallet need not hold every denomination)
+        loose = {spr.value for spr in self.wallet_sprites if not spr.in_pay_area}
+        for value in sorted(loose, reverse=True):
             if amount_left_to_pay >= value:
                 return DENOM_NAME[value]
         # if we get here, nothing fits (e.g. amount_left_to_pay == 0)
@@ -240,36 +300,24 @@ class MakeChangeTask(BaseTask):
         self.payment_total = round(sum(s.value for s in self.wallet_sprites if s.in_pay_area), 2)
 
     def _handle_submit(self):
+        self.end_reason = "submit"
         success = self.payment_total == self.total
         self._complete(success)
 
     def _handle_surrender(self):
-        difference = abs(self.total - self.payment_total)
-        # Threshold for a reasonable attempt ($1.50 but can be changed)
-        if difference < 1.5:
-            self.assist_level_used = 7
-        elif difference < self.payment_total:
-            self.assist_level_used = 8
-        else:
-            self.assist_level_used = 9
-        self.process_score = 0
+        self.end_reason = "surrender"
         self._complete(False)
 
     def _complete(self, success=False):
         # Calculate elapsed time
-        elapsed = (pygame.time.get_ticks() - self.start_ticks) / 1000
-
-        # Calculate quality score
-        difference = abs(self.total - self.payment_total)
-        # Threshold for a reasonable attempt when scoring quality ($1 but can be changed)
-        if difference == 0:
-            self.quality_score = 3
-        elif difference < 1:
-            self.quality_score = 2
-        elif difference < self.payment_total:
-            self.quality_score = 1
-        elif difference >= self.payment_total:
-            self.quality_score = 0
+        elapsed = self.now() - self.attempt_start
+
+        # Independence, quality and process scores (scoring.Rules.make_change_submit)
+        scores = self._score({"end": self.end_reason, "cue": self.assist_level_used,
+                              "target": self.total, "paid": self.payment_total})
+        self.assist_level_used = scores["independence_score"]
+        self.quality_score = scores["quality_score"]
+        self.process_score = scores["process_score"]
 
         self.result_data.update({
             "payment_given": self.payment_total,
@@ -277,33 +325,33 @@ class MakeChangeTask(BaseTask):
             "drag_events": self.drag_events,
             "extraneous_moves": self.extraneous_moves,
             "duration_sec": elapsed,
-            "independence_score": self.assist_level_used,
-            "quality_score": self.quality_score,
-            "process_score": self.process_score,
             "success": success,
         })
         self.running = False
 
     def _update(self):
-        dt_ms = self.clock.tick(60)
+        dt_ms = self.clock.get_time()  # BaseTask.run already ticked this frame
         self.inactivity_seconds += dt_ms / 1000
+        cue_after = self.rules.ladder(self.subtask_id)  # idle seconds before each cue level
 
         # Independence Score --> 1
-        if self.inactivity_seconds > 3 and self.assist_level_used == 0:
+        if self.inactivity_seconds > cue_after[0] and self.assist_level_used == 0:
             # Tell the _render() method to show the message (Verbal Supportive)
             self.show_encouraging_message = True
             self.assist_level_used = 1  # Update independence score
+            self.timeline.cue("assist_1")
 
         # Independence Score --> 2
-        if self.inactivity_seconds > 5 and self.assist_level_used == 1:
+        if self.inactivity_seconds > cue_after[1] and self.assist_level_used == 1:
             self.show_constructive_message = True
             # Tell the _render() method to show a constructive message (Verbal Directive)]
             self.show_encouraging_message = True
             self.assist_level_used = 2  # Update independence score
             self.inactivity_seconds = 0  # Reset inactivity
+            self.timeline.cue("assist_2")
 
         # Independence Score --> 3
-        if self.inactivity_seconds > 5 and self.assist_level_used == 2:
+        if self.inactivity_seconds > cue_after[2] and self.assist_level_used == 2:
             # Highlight a money sprite
             amount_left_to_pay = self.total - self.payment_total
             # Find the currency with the largest possible value that can be paid
@@ -317,26 +365,35 @@ class MakeChangeTask(BaseTask):
                     break
 
             self.show_encouraging_message = False
-            self.process_score = 2  # Update Process Score
             self.assist_level_used = 3  # Update independence score
             self.inactivity_seconds = 0  # Reset inactivity
+            self.timeline.cue("assist_3")
 
         # Independence Score --> 4
-        if self.inactivity_seconds > 5 and self.assist_level_used == 3:
+        if self.inactivity_seconds > cue_after[3] and self.assist_level_used == 3:
             # Find the highlighted MoneySprite
             highlighted_spr = None
             for sprite in self.wallet_sprites:
                 if sprite.highlighted:
                     highlighted_spr = sprite
                     break
-            # Swap it with the MoneySprite closest to the payment area
-            self.swap_sprite_positions(highlighted_spr, self.wallet_sprites.sprites()[39])
+            # Swap it with the loose MoneySprite closest to the payment area
+            # (nothing to move when no denomination fits the amount left)
+            if highlighted_spr is not None and not highlighted_spr.in_pay_area:
+                target = pygame.Vector2(self.pay_area.center)
+                loose = [s for s in self.wallet_sprites if not s.in_pay_area and s is not highlighted_spr]
+                if loose:
+                    nearest = min(loose, key=lambda s: target.distance_squared_to(s.rect.center))
+                    if target.distance_squared_to(nearest.rect.center) < \
+                            target.distance_squared_to(highlighted_spr.rect.center):
+                        self.swap_sprite_positions(highlighted_spr, nearest)
 
             self.assist_level_used = 4  # Update independence score
             self.inactivity_seconds = 0  # Reset inactivity
+            self.timeline.cue("assist_4")
 
         # Independence Score --> 5
-        if self.inactivity_seconds > 5 and self.assist_level_used == 4:
+        if self.inactivity_seconds > cue_after[4] and self.assist_level_used == 4:
             # Show a message telling the user what do to
             self.show_directive_message = True
             # Move the highlighted MoneySprite to the payment area but DO NOT drop it
@@ -345,12 +402,12 @@ class MakeChangeTask(BaseTask):
                     # Animate the MoneySprite
                     self.animate_to_pay(sprite)
                     break
-            self.process_score = 1  # Update process score
             self.assist_level_used = 5  # Update independence score
             self.inactivity_seconds = 0  # Reset inactivity
+            self.timeline.cue("assist_5")
 
         # Independence Score --> 6
-        if self.inactivity_seconds > 5 and self.assist_level_used == 5:
+        if self.inactivity_seconds > cue_after[5] and self.assist_level_used == 5:
             # Find the biggest MoneySprite available
             for sprite in self.wallet_sprites:
                 if sprite.highlighted:
@@ -360,34 +417,42 @@ class MakeChangeTask(BaseTask):
                     break
             self.assist_level_used = 6  # Update independence score
             self.inactivity_seconds = 0  # Reset inactivity
+            self.timeline.cue("assist_6")
+
+        # assisted move (levels 5 and 6) – advanced here so headless runs animate too
+        if self._anim_sprite:
+            done = self._animate_step(self._anim_sprite, self._anim_step)
+            if done:
+                self._anim_sprite = None
 
         # timer / attempts
-        elapsed = (pygame.time.get_ticks() - self.start_ticks) / 1000
+        elapsed = self.now() - self.attempt_start
         if elapsed >= self.max_time:
             self.max_attempts -= 1
             if self.max_attempts <= 0:
+                self.end_reason = "timeout"
                 self._complete(False)
             else:
-                for spr in self.wallet_sprites:
-                    spr.rect.topleft = spr.rect.initial if hasattr(spr.rect, 'initial') else spr.rect.topleft
-                    spr.in_pay_area = False
+                # Next attempt: the wallet goes back to its slots, the cue ladder carries on
+                reset_sprites(self.wallet_sprites)
+                self._anim_sprite = None
                 self.payment_total = 0.0
-                self.start_ticks = pygame.time.get_ticks()
+                self.attempt_start = self.now()
 
     # -------------------------------------------------------------- render
     def _render(self):
         self.screen.fill(WHITE)
 
         # receipt
-        margin = 40
-        pygame.draw.rect(self.screen, GREY, (margin, margin, RECEIPT_W, RECEIPT_H))
-        y = margin + 10
+        receipt, pad = self.ui.receipt_rect, self.ui.pad
+        pygame.draw.rect(self.screen, GREY, receipt)
+        y = receipt.top + pad
         for item, price in zip(self.items, self.prices):
             txt = self.font.render(f"{item}  ${price:.2f}", True, BLACK)
-            self.screen.blit(txt, (margin + 10, y))
+            self.screen.blit(txt, (receipt.left + pad, y))
             y += txt.get_height() + 4
         total_txt = self.font.render(f"TOTAL: ${self.total:.2f}", True, BLACK)
-        self.screen.blit(total_txt, (margin + 10, margin + RECEIPT_H - 30))
+        self.screen.blit(total_txt, (receipt.left + pad, receipt.bottom - 3 * pad))
 
         # pay area
         pygame.draw.rect(self.screen, GREY, self.pay_area, border_radius=6)
@@ -407,9 +472,9 @@ class MakeChangeTask(BaseTask):
         self.screen.blit(btn_lbl, lbl_rect)
 
         # timer / attempts
-        elapsed = int((pygame.time.get_ticks() - self.start_ticks) / 1000)
+        elapsed = int(self.now() - self.attempt_start)
         timer_txt = self.font.render(f"Time: {self.max_time - elapsed}s  Attempts: {self.max_attempts}", True, BLACK)
-        self.screen.blit(timer_txt, (margin, self.screen.get_height() - 40))
+        self.screen.blit(timer_txt, self.ui.timer_pos)
 
         # draw money
         self.wallet_sprites.draw(self.screen)
@@ -419,11 +484,6 @@ class MakeChangeTask(BaseTask):
             if spr.highlighted:
                 pygame.draw.rect(self.screen, (255, 0, 0), spr.rect, 3)
 
-        if self._anim_sprite:
-            done = self._animate_step(self._anim_sprite, self._anim_step)
-            if done:
-                self._anim_sprite = None
-
         # draw message if necessary
         if self.show_encouraging_message:
             self.message_text = "You Got This!"
@@ -440,19 +500,80 @@ class MakeChangeTask(BaseTask):
 
         pygame.display.flip()
 
+    def observable_state(self):
+        state = super().observable_state()
+        if self.show_directive_message:
+            msg = "directive"
+        elif self.show_constructive_message:
+            msg = "constructive"
+        elif self.show_encouraging_message:
+            msg = "encouraging"
+        else:
+            msg = ""
+        state.update({
+            "areas": {"pay": list(self.pay_area), "submit": list(self.submit_rect),
+                      "give_up": list(self.surrender_rect)},
+            "sprites": {str(s.slot): [s.value, s.rect.x, s.rect.y, s.rect.w, s.rect.h,
+                                      s.in_pay_area, s.highlighted] for s in self.wallet_sprites},
+            "paid": self.payment_total,
+            "assist": self.assist_level_used,
+            "msg": msg,
+            "attempts": self.max_attempts,
+        })
+        return state
+
+    # ------------------------------------------------------------ checkpoint
+    def checkpoint_state(self):
+        state = self.observable_state()
+        state.update({
+            "shown": [self.show_encouraging_message, self.show_constructive_message,
+                      self.show_directive_message],
+            "process": self.process_score,
+            "drags": self.drag_events,
+            "extraneous": self.extraneous_moves,
+            "drop_item": self.drop_item,
+            "homes": {str(s.slot): s.home for s in self.wallet_sprites},  # slots swap, homes do not
+            "anim": self._anim_sprite.slot if self._anim_sprite else None,
+            "anim_step": self._anim_step,
+            "attempt_sec": int(self.now() - self.attempt_start),
+        })
+        return state
+
+    def restore_state(self, state):
+        super().restore_state(state)
+        # Rebuild at the recorded size, then let resize() carry everything over
+        self._screen_size = tuple(state["size"])
+        self._apply_layout(self._screen_size)
+        self.pool.release(self.wallet_sprites)
+        homes = state.get("homes", {})  # journals written before homes were kept
+        for key in sorted(state["sprites"], key=int):
+            value, x, y, _, _, in_pay, highlighted = state["sprites"][key]
+            spr = self.pool.acquire(value, self.ui.images[value], (x, y), self.wallet_sprites)
+            spr.slot = int(key)
+            spr.home = homes.get(key, spr.slot)
+            spr.initial_pos = self.ui.slots[spr.slot]
+            spr.in_pay_area = in_pay
+            spr.highlighted = highlighted
+
+        self.payment_total = state["paid"]
+        self.assist_level_used = state["assist"]
+        self.max_attempts = state["attempts"]
+        (self.show_encouraging_message, self.show_constructive_message,
+         self.show_directive_message) = state["shown"]
+        self.process_score = state["process"]
+        self.drag_events = state["drags"]
+        self.extraneous_moves = state["extraneous"]
+        self.drop_item = state["drop_item"]
+        self._anim_sprite = next((s for s in self.wallet_sprites if s.slot == state["anim"]), None)
+        self._anim_step = state["anim_step"]
+        self.attempt_start = self.now() - state["attempt_sec"]
+        self.inactivity_seconds = 0.0
+        self.resize(self.screen)
+
     def _render_message(self):
         """Draws the assistive message banner across the bottom if needed."""
 
-        # Banner dimensions
-        msg_h = 40
-        padding = 10
-        screen_w, screen_h = self.screen.get_size()
-        banner_rect = pygame.Rect(
-            0,
-            screen_h - msg_h - padding,
-            screen_w,
-            msg_h,
-        )
+        banner_rect = self.ui.banner_rect
 
         # 1) Clear behind the banner
         pygame.draw.rect(self.screen, GREY, banner_rect)
@@ -468,7 +589,7 @@ class MakeChangeTask(BaseTask):
 # ---------------------------------------------------------------------------
 if __name__ == "__main__":
     pygame.init()
-    screen = pygame.display.set_mode((1124, 768))
+    screen = pygame.display.set_mode((1124, 768), pygame.RESIZABLE)
     task = MakeChangeTask(screen)
     task.run()
     print(task.get_results())
@@ -1,6 +1,14 @@
 import pygame
+import random
 import time
 
+import scoring
+from checkpoint import CheckpointJournal
+from event_log import EventRecorder
+from input_layer import InputLayer
+from state_delta import StateTracker
+from timing import EventTimeline, FrameClock, PrecisionClock
+
 class BaseTask:
     def __init__(self, screen, subtask_id="base_task", config=None):
         """
@@ -10,16 +18,61 @@ class BaseTask:
             screen (pygame.Surface): The main screen surface for drawing.
             task_id (str): Unique identifier for the task.
             config (dict): Optional configuration for task parameters.
+                `precision_timing` switches to a perf_counter_ns clock and
+                `busy_wait` adds spin-wait frame pacing on top of it; `clock`
+                supplies a ready-made clock (e.g. a SimulatedClock); `observer`
+                is an ObserverServer that receives state deltas at most every
+                `observer_interval` seconds; `checkpoint` is a journal path (or
+                CheckpointJournal) that receives a delta on every state change;
+                `record` is an event-log path (or EventRecorder) for replay;
+                `memprobe` is a memprofile.MemoryProbe sampled at begin/finish;
+                `trace` is a path that receives the drag segments of the
+                pointer path (trajectory.py), simplified to `trace_epsilon`
+                pixels if given; `scoring` picks the scoring rules version
+                (scoring.py; default the current rules).
         """
         self.screen = screen
+        self._screen_size = screen.get_size()
         self.subtask_id = subtask_id
         self.config = config or {}
 
         self.running = True
-        self.clock = pygame.time.Clock()
+        self.precision_timing = self.config.get("precision_timing", False)
+        if self.config.get("clock") is not None:
+            self.clock = self.config["clock"]
+        elif self.precision_timing:
+            self.clock = PrecisionClock(busy_wait=self.config.get("busy_wait", False))
+        else:
+            self.clock = FrameClock()
+        self.input = InputLayer(coalesce_motion=self.config.get("coalesce_motion", True),
+                                keep_samples=self.config.get("keep_motion_samples", True),
+                                now_ns=self.clock.now_ns)
+        if isinstance(self.clock, PrecisionClock):
+            self.clock.on_spin = self.input.collect
+        self.timeline = EventTimeline()
+        self.observer = self.config.get("observer")
+        self.observer_interval_ns = int(self.config.get("observer_interval", 0.05) * 1e9)
+        self._observed = StateTracker()
+        self._next_publish_ns = 0
+        self.checkpoint = self.config.get("checkpoint")
+        if isinstance(self.checkpoint, str):
+            self.checkpoint = CheckpointJournal(self.checkpoint)
+        self._checkpointed = StateTracker()
+        self.recorder = self.config.get("record")
+        if isinstance(self.recorder, str):
+            self.recorder = EventRecorder(self.recorder)
+        self.memprobe = self.config.get("memprobe")
+        self.rules = scoring.get(self.config.get("scoring"))
+        self.init_args = {}  # JSON-friendly constructor arguments, for resume
+        self.frame = 0
+        self.end_reason = None  # e.g. "submit", "surrender", "timeout"
         self.start_time = None
         self.end_time = None
-        self.result_data = {
+        self._start_ns = None
+        self.result_data = self._new_results()
+
+    def _new_results(self):
+        return {
             "subtask_id": self.subtask_id,
             "start_time": None,
             "end_time": None,
@@ -30,31 +83,220 @@ class BaseTask:
             "process_score": None,
         }
 
+    def restart(self):
+        """
+        Put the task back to its starting state so it can `run()` (or
+        `begin()`) again, keeping everything already built: layout, images,
+        sprites and the input and timing buffers are reused, not rebuilt.
+        """
+        self.running = True
+        self.frame = 0
+        self.end_reason = None
+        self.start_time = None
+        self.end_time = None
+        self._start_ns = None
+        self.result_data = self._new_results()
+        self.input.clear()
+        self.timeline.clear()
+        self._observed = StateTracker()
+        self._checkpointed = StateTracker()
+        self._next_publish_ns = 0
+        self._restart()
+
+    def _restart(self):
+        """Override this to reset task state for `restart()`."""
+        pass
+
+    def now(self):
+        """Seconds on the task clock (monotonic, not wall time)."""
+        return self.clock.now_ns() / 1e9
+
     def run(self):
         """Main loop for the task."""
+        self.begin()
+        while self.running:
+            self.step()
+            self.clock.tick(60)  # Maintain 60 FPS
+        self.finish()
+
+    async def run_async(self):
+        """
+        Main loop as a coroutine: one frame per turn of the event loop.
+
+        Frames are paced by awaiting the clock's next deadline, so uploads,
+        observer streaming or scenario loading scheduled on the same loop
+        run in the gap between frames instead of stalling them. Must be
+        awaited from the main thread, like `run`.
+        """
+        self.begin()
+        while self.running:
+            self.step()
+            await self.clock.tick_async(60)  # Maintain 60 FPS
+        self.finish()
+
+    def begin(self):
+        """Start the task clock and record the start time."""
+        if self.memprobe is not None:
+            self.memprobe.task_boundary(self, "begin")
         self.start_time = time.time()
         self.result_data["start_time"] = self.start_time
+        self.clock.reset()
+        self._start_ns = self.clock.now_ns()
+        self.timeline.cue("task_start")
+        if self.checkpoint is not None:
+            self.checkpoint.open({"task": self.subtask_id, "args": self.init_args, "scoring": self.rules.version},
+                                 self._checkpointed.update(self.checkpoint_state()))
+        if self.recorder is not None:
+            self.recorder.open({"task": self.subtask_id, "args": self.init_args,
+                                "size": list(self.screen.get_size()), "scoring": self.rules.version})
+            random.seed(self.recorder.seed)
 
-        while self.running:
-            self._handle_events()
-            self._update()
+    def step(self, render=True):
+        """
+        Advance the task by one frame without pacing it.
+
+        Args:
+            render (bool): Draw the frame; headless drivers can skip it.
+        """
+        frame_ms = self.clock.get_time()
+        self._handle_events()
+        if self.recorder is not None:
+            self.recorder.frame(frame_ms)
+        self._update()
+        if render:
             self._render()
-            self.clock.tick(60)  # Maintain 60 FPS
+        shown_ns = self.clock.now_ns()
+        self.input.frame_displayed(shown_ns)
+        self.timeline.frame_displayed(shown_ns)
+        self.frame += 1
+        if self.observer is not None:
+            self._publish_state(shown_ns, force=not self.running)
+        if self.checkpoint is not None:
+            delta = self._checkpointed.update(self.checkpoint_state())
+            if delta:
+                self.checkpoint.record(delta)
 
+    def finish(self):
+        """Record end time, duration and timing summaries."""
         self.end_time = time.time()
         self.result_data["end_time"] = self.end_time
-        self.result_data["duration_sec"] = round(self.end_time - self.start_time, 2)
+        self.result_data["duration_sec"] = round((self.clock.now_ns() - self._start_ns) / 1e9, 2)
+        self.result_data["processing_latency"] = self.input.latency_summary()
+        self.result_data["cue_latencies"] = self.timeline.cue_latencies()
+        if self.checkpoint is not None:
+            self.checkpoint.close(final={k: v for k, v in self.result_data.items() if k != "cue_latencies"})
+        if self.recorder is not None:
+            self.recorder.frame(self.clock.get_time())  # the tick after the last step
+            self.recorder.close(final={k: v for k, v in self.result_data.items() if k != "cue_latencies"})
+        if self.config.get("trace") and self.input.keep_samples:
+            import trajectory
+
+            trajectory.save(self.config["trace"], self.input.samples, self._start_ns,
+                            epsilon=self.config.get("trace_epsilon"))
+        if self.memprobe is not None:
+            self.memprobe.task_boundary(self, "end")
 
     def _handle_events(self):
         """Process Pygame events."""
-        for event in pygame.event.get():
+        for t_ns, event in self.input.poll_stamped():
+            if self.recorder is not None:
+                self.recorder.event(event)
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
+                self.timeline.action("keydown", t_ns)
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self.timeline.action("mousedown", t_ns)
+            elif event.type == pygame.VIDEORESIZE:
+                surface = pygame.display.get_surface()
+                if surface is not None:
+                    self.resize(surface)
             self._custom_event_handler(event)
 
+    def resize(self, screen):
+        """
+        Switch to `screen` and re-resolve the layout if its size changed.
+
+        Args:
+            screen (pygame.Surface): The (possibly resized) drawing surface.
+        """
+        self.screen = screen
+        if screen.get_size() != self._screen_size:
+            self._screen_size = screen.get_size()
+            self._on_resize()
+
+    def _on_resize(self):
+        """Override this to move rects and sprites to the new screen size."""
+        pass
+
+    def observable_state(self):
+        """
+        Override this to describe what a remote observer should see.
+
+        Returns:
+            dict: JSON-serialisable snapshot; rebuilt on every call.
+        """
+        return {"task": self.subtask_id, "size": list(self.screen.get_size()), "end": self.end_reason}
+
+    def checkpoint_state(self):
+        """
+        Override this to add whatever `restore_state` needs beyond what an
+        observer sees. Avoid values that change every frame (e.g. idle
+        timers) so deltas are only written when something meaningful moves.
+
+        Returns:
+            dict: JSON-serialisable snapshot; rebuilt on every call.
+        """
+        return self.observable_state()
+
+    def restore_state(self, state):
+        """Override this to reapply a `checkpoint_state` snapshot."""
+        self.end_reason = state.get("end")
+
+    @classmethod
+    def from_checkpoint(cls, screen, args, state, **kw):
+        """
+        Rebuild a task from its journal header arguments and folded state.
+
+        Args:
+            screen (pygame.Surface): Surface for the rebuilt task.
+            args (dict): `init_args` recorded when the journal was opened.
+            state (dict): Latest `checkpoint_state` snapshot.
+            **kw: Extra task configuration.
+        """
+        task = cls(screen, **args, **kw)
+        task.restore_state(state)
+        return task
+
+    def _score(self, facts):
+        """
+        Score the session from its `facts` under this task's rules and store
+        the scores, the facts and the rules version in the results.
+
+        Returns:
+            dict: independence_score, quality_score and process_score.
+        """
+        scores = self.rules.score(self.subtask_id, facts)
+        self.result_data.update(scores)
+        self.result_data["scoring"] = {"version": self.rules.version, "facts": facts}
+        return scores
+
+    def _publish_state(self, now_ns, force=False):
+        if not force and now_ns < self._next_publish_ns:
+            return
+        self._next_publish_ns = now_ns + self.observer_interval_ns
+        first = not self._observed.state
+        delta = self._observed.update(self.observable_state())
+        if not delta:
+            return
+        ms = (now_ns - self._start_ns) // 1_000_000 if self._start_ns is not None else 0
+        if first:
+            self.observer.publish({"t": "snap", "f": self.frame, "ms": ms, "s": self._observed.state})
+        else:
+            self.observer.publish({"t": "d", "f": self.frame, "ms": ms, "d": delta})
+
     def _custom_event_handler(self, event):
         """Override this to handle custom events in derived tasks."""
         pass
@@ -0,0 +1,167 @@
+import copy
+import json
+import os
+import queue
+import threading
+
+import registry
+import state_delta
+
+JOURNAL_VERSION = 1
+
+
+def _line(message):
+    return json.dumps(message, separators=(",", ":")) + "\n"
+
+
+# ---------------------------------------------------------------------------
+#  CheckpointJournal – append-only delta log written on a background thread
+# ---------------------------------------------------------------------------
+class CheckpointJournal:
+    def __init__(self, path, compact_every=1000, fsync=True):
+        """
+        Crash-safe session journal.
+
+        The file is a header line, one full snapshot, then one JSON delta per
+        meaningful state change. `record()` only enqueues; a writer thread
+        appends, flushes and fsyncs in batches, and every `compact_every`
+        deltas rewrites the file as header + snapshot (via an atomic rename)
+        so resume never has to fold a long history.
+
+        Args:
+            path (str): Journal file.
+            compact_every (int): Deltas between compactions.
+            fsync (bool): fsync after every written batch.
+        """
+        self.path = path
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._header = None
+        self._state = {}
+        self._since_compact = 0
+        self._file = None
+
+    def open(self, header, state):
+        """Start a fresh journal for `header` at `state` and start writing."""
+        self._header = dict(header, t="hdr", v=JOURNAL_VERSION)
+        self._state = copy.deepcopy(state)
+        self._thread = threading.Thread(target=self._writer, name="checkpoint-writer", daemon=True)
+        self._compact()
+        self._thread.start()
+
+    def record(self, delta):
+        """Queue one state delta; never blocks the caller."""
+        if self._thread is not None:
+            self._queue.put(delta)
+
+    def close(self, final=None):
+        """Flush everything queued, optionally mark the session finished."""
+        if self._thread is None:
+            return
+        if final is not None:
+            self._queue.put({"__end__": final})
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    # ------------------------------------------------------------- writer
+    def _writer(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:  # drain whatever else is already waiting
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            lines = []
+            for delta in batch:
+                if delta is None:
+                    stop = True
+                    break
+                if "__end__" in delta:
+                    lines.append(_line({"t": "end", "r": delta["__end__"]}))
+                    continue
+                state_delta.apply(self._state, delta)
+                lines.append(_line({"t": "d", "d": delta}))
+                self._since_compact += 1
+            if lines:
+                self._file.write("".join(lines))
+                self._sync()
+            if self._since_compact >= self.compact_every and not stop:
+                self._compact()
+            if stop:
+                self._file.close()
+                return
+
+    def _sync(self):
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _compact(self):
+        if self._file is not None:
+            self._file.close()
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(_line(self._header))
+            f.write(_line({"t": "snap", "s": self._state}))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._since_compact = 0
+
+
+# ---------------------------------------------------------------------------
+#  Loading and resuming
+# ---------------------------------------------------------------------------
+def load(path):
+    """
+    Fold a journal back into the latest state.
+
+    A torn final line (the process died mid-write) is ignored.
+
+    Returns:
+        tuple: (header dict, state dict, finished result or None)
+    """
+    header, state, finished = None, {}, None
+    with open(path, "r", encoding="utf-8") as f:
+        for raw in f:
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                break
+            kind = message.get("t")
+            if kind == "hdr":
+                header = message
+            elif kind == "snap":
+                state = message["s"]
+            elif kind == "d":
+                state_delta.apply(state, message["d"])
+            elif kind == "end":
+                finished = message["r"]
+    if header is None:
+        raise ValueError(f"{path} is not a checkpoint journal")
+    return header, state, finished
+
+
+def resume(path, screen, **kw):
+    """
+    Rebuild a task from its journal and keep journaling to the same file.
+
+    Args:
+        path (str): Journal written by a task run with `checkpoint=path`.
+        screen (pygame.Surface): Surface for the rebuilt task.
+        **kw: Extra task configuration (e.g. clock, observer).
+
+    Returns:
+        BaseTask: The restored task, ready for `run()`.
+    """
+    header, state, _ = load(path)
+    cls = registry.get(header["task"]).load()
+    kw.setdefault("scoring", header.get("scoring", "1"))
+    return cls.from_checkpoint(screen, header["args"], state, checkpoint=path, **kw)
@@ -0,0 +1,266 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import registry
+import scenarios
+
+# Only the registry and the scenario index (neither needs pygame) are imported
+# up front. pygame, the subtask modules and the synthetic agents are imported
+# inside the command that needs them.
+
+
+def _size(text):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def _settings(pairs):
+    """['key=value', ...] -> {key: value} (values are parsed by the schema)."""
+    out = {}
+    for pair in pairs or ():
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise SystemExit(f"--set expects key=value, got {pair!r}")
+        out[key.strip()] = value
+    return out
+
+
+def _emit(results, out):
+    line = json.dumps(results, default=str)
+    if out:
+        with open(out, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    else:
+        print(line)
+
+
+def _open_window(size, title="E-PASS"):
+    import pygame
+
+    from layout import reset_caches
+
+    reset_caches()
+    pygame.init()
+    pygame.display.set_caption(title)
+    return pygame.display.set_mode(size, pygame.RESIZABLE)
+
+
+def _scenario(subtask_id, args):
+    """Constructor arguments of the --scenario band picked by --seed, else {}."""
+    if not args.scenario:
+        return {}
+    return scenarios.scenario_args(subtask_id, args.scenario, args.seed)
+
+
+def _task_config(args):
+    config = {}
+    if args.precision:
+        config["precision_timing"] = True
+    if getattr(args, "checkpoint", None):
+        config["checkpoint"] = args.checkpoint
+    if args.scoring:
+        config["scoring"] = args.scoring
+    return config
+
+
+# ---------------------------------------------------------------------------
+#  Commands
+# ---------------------------------------------------------------------------
+def cmd_list(args):
+    for spec in registry.REGISTRY.values():
+        print(f"{spec.subtask_id:<22} {spec.title}")
+        for name, field in spec.schema.items():
+            default = "" if field.default is None else f" [{field.default}]"
+            choices = f" ({', '.join(map(str, field.choices))})" if field.choices else ""
+            print(f"    {name:<18} {field.kind.__name__:<6} {field.help}{choices}{default}")
+    for name, ids in registry.BATTERIES.items():
+        print(f"battery {name}: {' -> '.join(ids)}")
+    import scoring
+
+    print(f"scoring rules: {', '.join(scoring.RULES)} (current {scoring.CURRENT})")
+
+
+def cmd_run(args):
+    spec = registry.get(args.subtask)
+    # --set overrides the scenario; validate both before opening a window
+    task_args = spec.args({**_scenario(spec.subtask_id, args), **_settings(args.set)})
+    screen = _open_window(args.size, spec.title)
+    config = _task_config(args)
+    if args.record:
+        config["record"] = args.record
+    if args.trace:
+        config["trace"] = args.trace
+    task = spec.create(screen, task_args, **config)
+    task.run()
+    _emit(task.get_results(), args.out)
+
+
+def cmd_battery(args):
+    ids = registry.BATTERIES.get(args.battery[0], args.battery) if len(args.battery) == 1 else args.battery
+    specs = [registry.get(subtask_id) for subtask_id in ids]
+    if args.scenario:  # subtasks without indexed scenarios keep their defaults
+        task_args = [spec.args(_scenario(spec.subtask_id, args)) if spec.subtask_id in scenarios.SUBTASK_KINDS
+                     else None for spec in specs]
+    else:
+        task_args = [None] * len(specs)
+    screen = _open_window(args.size)
+    for i, spec in enumerate(specs):
+        config = _task_config(args)
+        if args.record_dir:
+            os.makedirs(args.record_dir, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            config["record"] = os.path.join(args.record_dir, f"{stamp}-{i:02d}-{spec.subtask_id}.jsonl")
+        task = spec.create(screen, task_args[i], **config)
+        task.run()
+        _emit(task.get_results(), args.out)
+        screen = task.screen  # keep whatever size the window was resized to
+
+
+def cmd_batch(args):
+    spec = registry.get(args.subtask)
+    if not spec.headless_agent:
+        raise SystemExit(f"{spec.subtask_id} has no synthetic agent for headless runs")
+    from synthetic_agents import sweep
+
+    grid = {}
+    for key, values in _settings(args.param).items():
+        grid[key] = [float(v) for v in values.split(",")]
+    if args.scenario:
+        _scenario(spec.subtask_id, args)  # build the index once, before the workers share it
+    for row in sweep(spec.subtask_id, grid, sessions_per_cell=args.sessions,
+                     workers=args.workers, seed=args.seed, scenario=args.scenario):
+        _emit(row, args.out)
+
+
+def cmd_replay(args):
+    from event_log import load, replay
+
+    header, _, _ = load(args.log)
+    if args.headless:
+        from layout import init_headless
+
+        init_headless()
+        screen = None
+    else:
+        screen = _open_window(tuple(header["size"]), f"Replay: {registry.get(header['task']).title}")
+    results, recorded = replay(args.log, screen, render=not args.headless or args.render,
+                               realtime=not args.headless)
+    _emit(results, args.out)
+    if recorded is not None:
+        keys = ("independence_score", "quality_score", "process_score", "success")
+        mismatched = {k: (recorded.get(k), results.get(k)) for k in keys if recorded.get(k) != results.get(k)}
+        if mismatched:
+            print(f"replay differs from the recording: {mismatched}", file=sys.stderr)
+            return 1
+    return 0
+
+
+def cmd_rescore(args):
+    import scoring
+
+    rules = scoring.get(args.scoring)  # fail on an unknown version before starting workers
+    rows = scoring.rescore(scoring.iter_logs(args.logs), rules, workers=args.workers, replay=args.replay)
+
+    def emitted():
+        for row in rows:
+            _emit(row, args.out)
+            yield row
+
+    summary = scoring.summarize(emitted())
+    print(f"rescored under {rules.version}: {json.dumps(summary)}", file=sys.stderr)
+    return 1 if summary["errors"] else 0
+
+
+def cmd_serve(args):
+    import asyncio
+
+    from session_server import SessionServer
+
+    async def _serve():
+        server = await SessionServer(args.host, args.port, workers=args.workers,
+                                     max_sessions_per_worker=args.per_worker).serve()
+        print(f"serving on {server.host}:{server.port} with {server.n_workers} workers", file=sys.stderr)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.aclose()
+
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="epass", description="Launch E-PASS subtasks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="show subtasks, their settings and batteries")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("run", help="run one subtask in a window")
+    p.add_argument("subtask")
+    p.add_argument("--set", action="append", metavar="KEY=VALUE", help="subtask setting (repeatable)")
+    p.add_argument("--record", metavar="LOG", help="write an event log for replay")
+    p.add_argument("--checkpoint", metavar="JOURNAL", help="journal state for crash-safe resume")
+    p.add_argument("--trace", metavar="FILE", help="store the drag paths compactly (see trajectory.py)")
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("battery", help="run several subtasks in one window")
+    p.add_argument("battery", nargs="+", help="battery name or subtask ids in order")
+    p.add_argument("--record-dir", metavar="DIR", help="write one event log per subtask")
+    p.set_defaults(func=cmd_battery)
+
+    p = sub.add_parser("batch", help="headless synthetic sessions for one subtask")
+    p.add_argument("subtask")
+    p.add_argument("--sessions", type=int, default=100, help="sessions per parameter combination")
+    p.add_argument("--param", action="append", metavar="NAME=V1,V2",
+                   help="agent parameter values to sweep (repeatable)")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--seed", type=int, default=0, help="first session seed; with --scenario each session picks its own")
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser("replay", help="replay an event log")
+    p.add_argument("log")
+    p.add_argument("--headless", action="store_true", help="replay as fast as possible without a window")
+    p.add_argument("--render", action="store_true", help="draw frames even when headless")
+    p.set_defaults(func=cmd_replay)
+
+    p = sub.add_parser("rescore", help="recompute scores of recorded sessions under a scoring version")
+    p.add_argument("logs", nargs="+", help="event logs or directories of them")
+    p.add_argument("--scoring", default=None, metavar="VERSION", help="rules version (default: current)")
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--replay", action="store_true", help="replay every session, even where facts would do")
+    p.set_defaults(func=cmd_rescore)
+
+    p = sub.add_parser("serve", help="host headless sessions for remote clients")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    p.add_argument("--per-worker", type=int, default=64, help="session limit per worker")
+    p.set_defaults(func=cmd_serve)
+
+    for p in sub.choices.values():
+        if p.get_default("func") is not cmd_serve:
+            p.add_argument("--out", metavar="FILE", help="append results as JSON lines instead of printing")
+        if p.get_default("func") in (cmd_run, cmd_battery):
+            p.add_argument("--size", type=_size, default=(1124, 768), metavar="WxH")
+            p.add_argument("--precision", action="store_true", help="perf_counter_ns frame timing")
+            p.add_argument("--scoring", metavar="VERSION", help="scoring rules version (default: current)")
+            p.add_argument("--seed", type=int, default=0, help="picks the scenario within the --scenario band")
+        if p.get_default("func") in (cmd_run, cmd_battery, cmd_batch):
+            p.add_argument("--scenario", choices=scenarios.BANDS, metavar="BAND",
+                           help=f"start from an indexed scenario ({', '.join(scenarios.BANDS)}; see scenarios.py)")
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args) or 0
+    except ValueError as exc:
+        parser.error(str(exc))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
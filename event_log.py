@@ -0,0 +1,163 @@
+import json
+import random
+import time
+
+import pygame
+
+import registry
+from timing import SimulatedClock
+
+LOG_VERSION = 1
+
+
+def _line(message):
+    return json.dumps(message, separators=(",", ":")) + "\n"
+
+
+def encode_event(event):
+    """[type, {attr: value}] with only the JSON-friendly attributes."""
+    attrs = {}
+    for key, value in event.dict.items():
+        if isinstance(value, (bool, int, float, str)):
+            attrs[key] = value
+        elif isinstance(value, (tuple, list)) and all(isinstance(v, (bool, int, float)) for v in value):
+            attrs[key] = list(value)
+    return [event.type, attrs]
+
+
+def decode_event(item):
+    """Inverse of `encode_event`; raises TypeError or ValueError for anything else."""
+    event_type, attrs = item
+    if not isinstance(event_type, int) or not isinstance(attrs, dict):
+        raise TypeError("an event is [type, {attrs}]")
+    return pygame.event.Event(event_type, {k: tuple(v) if isinstance(v, list) else v for k, v in attrs.items()})
+
+
+# ---------------------------------------------------------------------------
+#  EventRecorder – the input a task consumed, frame by frame
+# ---------------------------------------------------------------------------
+class EventRecorder:
+    def __init__(self, path, seed=None):
+        """
+        Record a session so it can be replayed exactly.
+
+        The file is a header line (subtask id, constructor arguments, screen
+        size, random seed), then one line per frame: `[dt_ms]` or
+        `[dt_ms, [[type, attrs], ...]]` with the frame delta the task saw and
+        the (already coalesced) events it handled, then an end line with the
+        results. The last frame line before the end is the tick that
+        followed the final step. A task with `record=...` reseeds `random` when it begins,
+        so choices made during the session replay identically.
+
+        Args:
+            path (str): Log file.
+            seed (int): Random seed for the session; drawn fresh if None.
+        """
+        self.path = path
+        self.seed = random.SystemRandom().randrange(2 ** 32) if seed is None else seed
+        self._file = None
+        self._events = []
+
+    def open(self, header):
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write(_line(dict(header, t="hdr", v=LOG_VERSION, seed=self.seed)))
+
+    def event(self, event):
+        self._events.append(encode_event(event))
+
+    def frame(self, dt_ms):
+        """Write the frame that consumed the events recorded since the last call."""
+        if self._file is None:
+            return
+        # exact, not rounded: idle timers add these up and a rounded delta can
+        # move a cue threshold by a frame
+        self._file.write(_line([dt_ms, self._events] if self._events else [dt_ms]))
+        self._events = []
+
+    def close(self, final=None):
+        if self._file is None:
+            return
+        if final is not None:
+            self._file.write(_line({"t": "end", "r": final}))
+        self._file.close()
+        self._file = None
+
+
+def load(path):
+    """
+    Read an event log.
+
+    Returns:
+        tuple: (header dict, list of (dt_ms, events) per frame, results or None)
+    """
+    header, frames, finished = None, [], None
+    with open(path, "r", encoding="utf-8") as f:
+        for raw in f:
+            try:
+                message = json.loads(raw)
+            except ValueError:
+                break  # torn last line
+            if isinstance(message, list):
+                frames.append((message[0], message[1] if len(message) > 1 else []))
+            elif message.get("t") == "hdr":
+                header = message
+            elif message.get("t") == "end":
+                finished = message["r"]
+    if header is None:
+        raise ValueError(f"{path} is not an event log")
+    return header, frames, finished
+
+
+# ---------------------------------------------------------------------------
+#  Replay
+# ---------------------------------------------------------------------------
+def replay(path, screen=None, render=True, realtime=False, **config):
+    """
+    Rebuild the recorded subtask and feed it the recorded frames.
+
+    Time comes from the log (a SimulatedClock advanced by each recorded
+    frame delta), so cue timing, timeouts and scores come out as recorded.
+    Only the recorded subtask's module is imported.
+
+    Args:
+        path (str): Log written by a task run with `record=path`.
+        screen (pygame.Surface): Window to draw in; None replays headless on
+            an off-screen surface of the recorded size.
+        render (bool): Draw every frame.
+        realtime (bool): Sleep each frame's delta (for watching a replay).
+        **config: Extra task configuration (e.g. observer, or `scoring` to
+            score under other rules than the recording's).
+
+    Returns:
+        tuple: (replayed results, recorded results or None)
+    """
+    header, frames, recorded = load(path)
+    config.setdefault("scoring", header.get("scoring", "1"))  # logs before versioned rules
+    headless = screen is None
+    if headless:
+        screen = pygame.Surface(header["size"])
+    clock = SimulatedClock()
+    task = registry.create(header["task"], screen, header["args"], clock=clock, **config)
+    task.begin()
+    random.seed(header["seed"])
+    for dt_ms, events in frames:
+        clock.advance(dt_ms)
+        if not task.running:
+            break  # the trailing entry is the tick between the last step and finish()
+        if not headless:
+            for real in pygame.event.get():  # only the log drives the task
+                if real.type == pygame.QUIT:
+                    task.running = False
+        for item in events:
+            event = decode_event(item)
+            if event.type == pygame.VIDEORESIZE and headless:
+                task.resize(pygame.Surface(event.size))
+                continue
+            if event.type == pygame.VIDEORESIZE:
+                pygame.display.set_mode(event.size, pygame.RESIZABLE)
+            task.input.inject(event, clock.now_ns())
+        task.step(render=render)
+        if realtime:
+            time.sleep(dt_ms / 1000)
+    task.finish()
+    return task.get_results(), recorded
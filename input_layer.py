@@ -0,0 +1,138 @@
+import time
+from array import array
+
+import pygame
+
+
+# ---------------------------------------------------------------------------
+#  Input layer – per-frame event intake, motion coalescing, processing latency
+# ---------------------------------------------------------------------------
+class InputLayer:
+    def __init__(self, coalesce_motion=True, keep_samples=True, now_ns=time.perf_counter_ns):
+        """
+        Collect Pygame events once per frame and hand them to the task.
+
+        Consecutive MOUSEMOTION events with the same button state are merged
+        into one event carrying the latest position and the summed `rel`, so a
+        1000 Hz mouse moves a dragged sprite once per frame instead of dozens
+        of times. Every raw motion sample is still kept in `samples` for
+        trajectory analysis.
+
+        Events are stamped with `now_ns()` when they are drained from the
+        Pygame queue; `frame_displayed()` measures the time from that stamp to
+        the end of the frame that showed their effect. That is processing
+        latency, a lower bound on input-to-display latency: time an event
+        spent in the SDL queue before the drain is not seen. Draining happens
+        at the start of each frame, and also while a busy-waiting
+        `PrecisionClock` spins, which brings the stamp close to arrival.
+        Injected events (synthetic agents, replay) are stamped on the task
+        clock, so under a `SimulatedClock` the figure is zero by construction.
+
+        Args:
+            coalesce_motion (bool): Merge consecutive motion events per frame.
+            keep_samples (bool): Keep every raw motion sample in `samples`.
+            now_ns (callable): Monotonic nanosecond time source.
+        """
+        self.coalesce_motion = coalesce_motion
+        self.keep_samples = keep_samples
+        self.now_ns = now_ns
+
+        self._pending = []  # (t_ns, event) drained but not yet delivered
+        self._delivered = array("q")  # stamps of events handed out this frame
+        self.samples = []  # (t_ns, x, y, buttons) for every raw motion event
+        self.latencies_ns = array("q")  # drain-to-display latency per raw event
+        self.raw_events = 0
+        self.delivered_events = 0
+
+    def clear(self):
+        """Forget pending events, samples and latency stats, keeping the buffers."""
+        self._pending.clear()
+        del self._delivered[:]
+        self.samples.clear()
+        del self.latencies_ns[:]
+        self.raw_events = 0
+        self.delivered_events = 0
+
+    # -------------------------------------------------------------- intake
+    def collect(self):
+        """Drain the Pygame queue into the pending buffer with a timestamp."""
+        events = pygame.event.get()
+        if events:
+            t = self.now_ns()
+            for event in events:
+                self._stamp(t, event)
+
+    def inject(self, event, t_ns=None):
+        """Queue a synthetic event as if it had come from the Pygame queue."""
+        self._stamp(self.now_ns() if t_ns is None else t_ns, event)
+
+    def _stamp(self, t, event):
+        self._pending.append((t, event))
+        self.raw_events += 1
+        if self.keep_samples and event.type == pygame.MOUSEMOTION:
+            x, y = event.pos
+            self.samples.append((t, x, y, tuple(event.buttons)))
+
+    def poll(self):
+        """
+        Return this frame's events, with motion runs coalesced.
+
+        Returns:
+            list: Events in queue order, ready for `_custom_event_handler`.
+        """
+        return [event for _, event in self.poll_stamped()]
+
+    def poll_stamped(self):
+        """
+        Like `poll`, but pair every event with its drain timestamp.
+
+        Returns:
+            list: (t_ns, event) tuples; a coalesced motion event carries the
+            stamp of the latest sample merged into it.
+        """
+        self.collect()
+        pending, self._pending = self._pending, []
+
+        out = []
+        run_rel = None  # summed rel of the motion run ending in out[-1]
+        for t, event in pending:
+            self._delivered.append(t)
+            if (self.coalesce_motion and event.type == pygame.MOUSEMOTION and run_rel is not None
+                    and tuple(out[-1][1].buttons) == tuple(event.buttons)):
+                run_rel = (run_rel[0] + event.rel[0], run_rel[1] + event.rel[1])
+                out[-1] = (t, pygame.event.Event(pygame.MOUSEMOTION, pos=event.pos, rel=run_rel,
+                                                 buttons=event.buttons,
+                                                 touch=getattr(event, "touch", False)))
+                continue
+            run_rel = tuple(event.rel) if event.type == pygame.MOUSEMOTION else None
+            out.append((t, event))
+
+        self.delivered_events += len(out)
+        return out
+
+    def frame_displayed(self, t_ns=None):
+        """Record latency for every event delivered since the last display."""
+        if not self._delivered:
+            return
+        t = self.now_ns() if t_ns is None else t_ns
+        self.latencies_ns.extend(t - s for s in self._delivered)
+        del self._delivered[:]
+
+    # ------------------------------------------------------------- summary
+    def latency_summary(self):
+        """
+        Summarise processing latency (drain to display; see the class notes).
+
+        Returns:
+            dict: Sample count and mean / p95 / max latency in milliseconds.
+        """
+        n = len(self.latencies_ns)
+        if not n:
+            return {"events": 0, "mean_ms": None, "p95_ms": None, "max_ms": None}
+        ordered = sorted(self.latencies_ns)
+        return {
+            "events": n,
+            "mean_ms": round(sum(ordered) / n / 1e6, 3),
+            "p95_ms": round(ordered[min(n - 1, int(n * 0.95))] / 1e6, 3),
+            "max_ms": round(ordered[-1] / 1e6, 3),
+        }
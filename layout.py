@@ -0,0 +1,151 @@
+import os
+from collections import OrderedDict
+from functools import lru_cache
+
+import pygame
+
+ASSETS_DIR = os.path.join(os.path.dirname(__file__), "assets")
+
+# Every subtask is designed on this canvas; other display sizes are a uniform
+# scale of it, centred (letterboxed) on the real screen.
+REFERENCE_SIZE = (1124, 768)
+
+
+# ---------------------------------------------------------------------------
+#  Layout – reference-canvas coordinates resolved for one display size
+# ---------------------------------------------------------------------------
+class Layout:
+    def __init__(self, size, reference=REFERENCE_SIZE):
+        """
+        Map design coordinates on the reference canvas to a display size.
+
+        Args:
+            size (tuple): Real display size in pixels.
+            reference (tuple): Canvas size the subtask was designed for.
+        """
+        self.size = tuple(size)
+        self.reference = reference
+        w, h = self.size
+        rw, rh = reference
+        self.scale = min(w / rw, h / rh)
+        self.offset = ((w - rw * self.scale) / 2, (h - rh * self.scale) / 2)
+
+    def length(self, n):
+        return max(1, int(round(n * self.scale)))
+
+    def dims(self, wh):
+        return self.length(wh[0]), self.length(wh[1])
+
+    def point(self, x, y):
+        return (int(round(self.offset[0] + x * self.scale)),
+                int(round(self.offset[1] + y * self.scale)))
+
+    def rect(self, x, y, w, h):
+        left, top = self.point(x, y)
+        return pygame.Rect(left, top, self.length(w), self.length(h))
+
+    def to_reference(self, pos):
+        """Inverse of `point`, for carrying positions across a resize."""
+        return ((pos[0] - self.offset[0]) / self.scale, (pos[1] - self.offset[1]) / self.scale)
+
+
+def carry(pos, old, new):
+    """Move a screen position from layout `old` to the same spot in `new`."""
+    return new.point(*old.to_reference(pos))
+
+
+# ---------------------------------------------------------------------------
+#  Shared, pre-scaled assets and fonts
+# ---------------------------------------------------------------------------
+class AssetCache:
+    def __init__(self, assets_dir=ASSETS_DIR, max_scaled=48):
+        """
+        Load each image file once and keep one scaled copy per size.
+
+        Sprites share these Surfaces, so a task with forty coins holds six
+        images, and a resize scales each image once rather than once per
+        sprite. Only the `max_scaled` most recently used copies are kept
+        (a few display sizes' worth); sprites still showing an evicted copy
+        keep it alive until they are rescaled.
+        """
+        self.assets_dir = assets_dir
+        self.max_scaled = max_scaled
+        self._originals = {}
+        self._scaled = OrderedDict()
+
+    def original(self, filename):
+        img = self._originals.get(filename)
+        if img is None:
+            img = pygame.image.load(os.path.join(self.assets_dir, filename)).convert_alpha()
+            self._originals[filename] = img
+        return img
+
+    def image(self, filename, size):
+        """
+        Return `filename` scaled to `size`; raises pygame.error if missing.
+        """
+        key = (filename, tuple(size))
+        img = self._scaled.get(key)
+        if img is None:
+            img = pygame.transform.smoothscale(self.original(filename), key[1])
+            self._scaled[key] = img
+            if len(self._scaled) > self.max_scaled:
+                self._scaled.popitem(last=False)
+        else:
+            self._scaled.move_to_end(key)
+        return img
+
+    def clear(self):
+        self._originals.clear()
+        self._scaled.clear()
+
+
+ASSETS = AssetCache()
+
+_CACHES = []  # lru_cache'd functions whose results hold Fonts or Surfaces
+
+
+def pygame_cache(maxsize):
+    """
+    `functools.lru_cache` for results that hold pygame objects (fonts,
+    converted Surfaces, resolved layouts); `reset_caches()` empties it.
+    """
+    def wrap(func):
+        cached = lru_cache(maxsize=maxsize)(func)
+        _CACHES.append(cached)
+        return cached
+    return wrap
+
+
+def reset_caches():
+    """
+    Drop every cached Font, image and resolved layout.
+
+    These belong to one pygame session: after `pygame.quit()` they point at
+    freed SDL objects, and using them after the next `pygame.init()` crashes.
+    Launchers call this whenever they (re)initialise pygame.
+    """
+    ASSETS.clear()
+    for cached in _CACHES:
+        cached.cache_clear()
+
+
+def init_headless():
+    """
+    Start pygame without a window, unless a display is already up.
+
+    Headless drivers (synthetic agents, replay, workers) draw on off-screen
+    Surfaces; the 1x1 dummy display only exists so `convert_alpha()` works.
+    """
+    if pygame.display.get_surface() is None:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        reset_caches()  # anything cached belongs to a previous pygame session
+        pygame.init()
+        pygame.display.set_mode((1, 1))
+
+
+@pygame_cache(maxsize=32)
+def font(px):
+    """Default system font at `px` points, created once per size."""
+    return pygame.font.SysFont(None, px)
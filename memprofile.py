@@ -0,0 +1,274 @@
+import gc
+import sys
+import tracemalloc
+
+import pygame
+
+from layout import ASSETS
+
+
+# ---------------------------------------------------------------------------
+#  Surface accounting
+# ---------------------------------------------------------------------------
+def surface_bytes(surface):
+    """Pixel memory held by `surface` (rows include their padding)."""
+    return surface.get_pitch() * surface.get_height()
+
+
+def live_surfaces():
+    """
+    Every Surface reachable from a Python container.
+
+    Surfaces are not tracked by the garbage collector themselves, so this
+    looks through the referents of every tracked object instead. Slow (tens
+    of milliseconds); meant for task boundaries, not frames.
+
+    Returns:
+        dict: id -> Surface
+    """
+    found = {}
+    for obj in gc.get_objects():
+        for ref in gc.get_referents(obj):
+            if isinstance(ref, pygame.Surface):
+                found[id(ref)] = ref
+    return found
+
+
+def _task_owners(task):
+    """(owner, surface) pairs for the surfaces a task holds directly."""
+    yield "screen", task.screen
+    for name, value in vars(task).items():
+        if isinstance(value, pygame.sprite.AbstractGroup):
+            for spr in value:
+                image = getattr(spr, "image", None)
+                if image is not None:
+                    yield f"group:{name}", image
+    ui = getattr(task, "ui", None)
+    if ui is not None:
+        for value in vars(ui).values():
+            if isinstance(value, pygame.Surface):
+                yield "ui", value
+            elif isinstance(value, dict):
+                for item in value.values():
+                    if isinstance(item, pygame.Surface):
+                        yield "ui", item
+
+
+def surface_report(task=None):
+    """
+    Surface pixel memory by owner.
+
+    Each Surface is counted once, under the first owner that claims it:
+    the shared asset cache, then the display, then `task` (its screen,
+    sprite groups and resolved layout), and anything else still alive as
+    "other" (text renders, layouts of other sizes, leaks).
+
+    Returns:
+        dict: owner -> {"surfaces": n, "bytes": b}, plus "total".
+    """
+    alive = live_surfaces()
+    owners = []
+    owners.extend(("assets:original", s) for s in ASSETS._originals.values())
+    owners.extend(("assets:scaled", s) for s in ASSETS._scaled.values())
+    display = pygame.display.get_surface() if pygame.display.get_init() else None
+    if display is not None:
+        owners.append(("display", display))
+    if task is not None:
+        owners.extend(_task_owners(task))
+
+    report = {}
+    claimed = set()
+
+    def claim(owner, surface):
+        if id(surface) in claimed:
+            return
+        claimed.add(id(surface))
+        entry = report.setdefault(owner, {"surfaces": 0, "bytes": 0})
+        entry["surfaces"] += 1
+        entry["bytes"] += surface_bytes(surface)
+
+    for owner, surface in owners:
+        claim(owner, surface)
+    for sid, surface in alive.items():
+        claim("other", surface)
+    report["total"] = {"surfaces": sum(e["surfaces"] for e in report.values()),
+                       "bytes": sum(e["bytes"] for e in report.values())}
+    return report
+
+
+# ---------------------------------------------------------------------------
+#  MemoryProbe – snapshots at task boundaries
+# ---------------------------------------------------------------------------
+class MemoryProbe:
+    def __init__(self, frames=1, top=10):
+        """
+        Python heap (tracemalloc) and Surface memory at task boundaries.
+
+        Pass it as `memprobe=` to a task and it records a sample when the
+        task begins and when it finishes; call `boundary()` directly for
+        points between tasks. SDL allocates pixel data outside Python's
+        allocator, which is why Surfaces are accounted separately. The
+        heap figure leaves out the probe's own allocations.
+
+        Args:
+            frames (int): Traceback depth kept by tracemalloc.
+            top (int): Allocation sites listed by `growth()`.
+        """
+        self.frames = frames
+        self.top = top
+        self.samples = []  # {"label", "heap", "peak", "surfaces"}
+        self._baseline = None
+        self._last = None
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        return self
+
+    def boundary(self, label, task=None):
+        """
+        Collect garbage and record one sample.
+
+        Args:
+            label (str): e.g. "make_change_submit:begin".
+            task (BaseTask): Task whose Surfaces are attributed by owner.
+        """
+        self.start()
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        if self._baseline is None:
+            self._baseline = snapshot
+        self._last = snapshot
+        heap = sum(stat.size for stat in snapshot.statistics("filename"))
+        sample = {"label": label, "heap": heap, "peak": tracemalloc.get_traced_memory()[1],
+                  "surfaces": surface_report(task)}
+        self.samples.append(sample)
+        return sample
+
+    def task_boundary(self, task, phase):
+        """Called by BaseTask with phase "begin" or "end"."""
+        return self.boundary(f"{task.subtask_id}:{phase}", task)
+
+    def rebase(self):
+        """Make the latest snapshot the baseline (e.g. after warm-up)."""
+        self._baseline = self._last
+
+    def growth(self):
+        """
+        Largest allocation-site differences since the baseline.
+
+        Returns:
+            list: (file:line, size_diff_bytes, count_diff) tuples.
+        """
+        if self._baseline is None or self._last is None:
+            return []
+        stats = self._last.compare_to(self._baseline, "lineno")
+        return [(f"{s.traceback[0].filename.split('/')[-1]}:{s.traceback[0].lineno}", s.size_diff, s.count_diff)
+                for s in stats[:self.top] if s.size_diff]
+
+    def stop(self):
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+# ---------------------------------------------------------------------------
+#  Leak benchmark
+# ---------------------------------------------------------------------------
+def _slope(values):
+    """Least-squares growth per step of `values`."""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean_x, mean_y = (n - 1) / 2, sum(values) / n
+    num = sum((i - mean_x) * (v - mean_y) for i, v in enumerate(values))
+    den = sum((i - mean_x) ** 2 for i in range(n))
+    return num / den
+
+
+def leak_benchmark(task_id, sessions=30, warmup=5, seed=0, sizes=None,
+                   max_heap_per_session=4096, max_surface_growth=0):
+    """
+    Run synthetic sessions back to back in this process and measure growth.
+
+    After `warmup` sessions (first-use caches filling up), the Python heap
+    and the live Surface bytes are sampled between sessions, with no task
+    alive. A heap that keeps growing by more than `max_heap_per_session`
+    bytes per session is a leak, and so is Surface memory that grows by
+    more than `max_surface_growth` bytes in both halves of the measured
+    sessions (a late first use of a cached image is a one-off step in one
+    half, a leak grows in both).
+
+    Args:
+        task_id (str): Registered subtask id.
+        sessions (int): Measured sessions after warm-up.
+        warmup (int): Unmeasured sessions first (at least 1).
+        seed (int): Base seed for the sessions.
+        sizes (list): Screen sizes cycled across sessions (window resizes,
+            different kiosks); None keeps the reference size.
+        max_heap_per_session (int): Allowed heap slope in bytes/session.
+        max_surface_growth (int): Allowed Surface growth per half in bytes.
+
+    Returns:
+        dict: Heap slope, Surface growth by owner, top growing allocation
+        sites and a `leaked` verdict.
+    """
+    from layout import init_headless
+    from synthetic_agents import SCREEN_SIZE, AgentParams, simulate
+
+    init_headless()
+    sizes = sizes or [SCREEN_SIZE]
+    probe = MemoryProbe().start()
+    params = AgentParams(think_time=0.5)
+    warmup = max(1, warmup)
+    measured = []  # the sample right after warm-up, then one per session
+    for i in range(warmup + sessions):
+        simulate(task_id, params, seed=seed + i, max_seconds=120.0, render=True,
+                 screen_size=sizes[i % len(sizes)], memprobe=probe)
+        sample = probe.boundary(f"after session {i}")
+        if i == warmup - 1:
+            probe.rebase()
+        if i >= warmup - 1:
+            measured.append(sample)
+    probe.stop()
+
+    heap = [s["heap"] for s in measured]
+    surfaces = [s["surfaces"]["total"]["bytes"] for s in measured]
+    first, last = measured[0]["surfaces"], measured[-1]["surfaces"]
+    by_owner = {owner: last.get(owner, {}).get("bytes", 0) - first.get(owner, {}).get("bytes", 0)
+                for owner in set(first) | set(last) if owner != "total"}
+    slope = _slope(heap)
+    mid = len(surfaces) // 2
+    early_growth = surfaces[mid] - surfaces[0]
+    late_growth = surfaces[-1] - surfaces[mid]
+    return {
+        "task": task_id,
+        "sessions": sessions,
+        "heap_bytes_per_session": round(slope, 1),
+        "heap_growth": heap[-1] - heap[0],
+        "surface_growth": surfaces[-1] - surfaces[0],
+        "surface_growth_early": early_growth,
+        "surface_growth_late": late_growth,
+        "surface_growth_by_owner": {k: v for k, v in by_owner.items() if v},
+        "top_growth": probe.growth(),
+        "leaked": slope > max_heap_per_session or min(early_growth, late_growth) > max_surface_growth,
+    }
+
+
+if __name__ == "__main__":
+    # python memprofile.py [SESSIONS] – exits 1 if any subtask leaks
+    import registry
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    failed = False
+    for subtask_id in registry.REGISTRY:
+        # a new display size every session; warm-up outlasts the bounded
+        # layout and font caches so only unbounded growth is left
+        resizing = [(1124 - 7 * i, 768 - 5 * i) for i in range(2 * n + 20)]
+        for label, sizes, warmup in (("fixed size", None, 5), ("resizing", resizing, n + 20)):
+            result = leak_benchmark(subtask_id, sessions=n, warmup=warmup, sizes=sizes)
+            failed |= result["leaked"]
+            print(label, result)
+    sys.exit(1 if failed else 0)
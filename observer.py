@@ -0,0 +1,221 @@
+import asyncio
+import copy
+import json
+import sys
+import threading
+
+import pygame
+
+import state_delta
+from layout import font as layout_font
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+#  ObserverServer – publishes task state deltas to local clinician clients
+# ---------------------------------------------------------------------------
+class ObserverServer:
+    def __init__(self, host="127.0.0.1", port=0, max_buffer=64 * 1024):
+        """
+        Newline-delimited JSON stream of task state changes.
+
+        Every client first receives a full snapshot ({"t": "snap"}) and then
+        the deltas ({"t": "d"}) the task publishes. The server runs its own
+        asyncio loop on a background thread; `publish()` only hands the
+        message to that loop, so the task's frame loop never waits on a
+        socket. A client whose send buffer exceeds `max_buffer` stops
+        receiving deltas and is resynchronised with a snapshot once it has
+        caught up.
+
+        Args:
+            host (str): Interface to bind (local only by default).
+            port (int): TCP port; 0 picks a free one (see `self.port`).
+            max_buffer (int): Per-client backlog in bytes before skipping.
+        """
+        self.host = host
+        self.port = port
+        self.max_buffer = max_buffer
+        self.state = {}
+        self.messages = 0
+        self.bytes_sent = 0
+        self._clients = {}  # writer -> needs snapshot
+        self._handlers = set()
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    # --------------------------------------------------------- lifecycle
+    def start(self):
+        """Start the server thread; returns once the socket is listening."""
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._thread_main, args=(ready,),
+                                        name="observer-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def _thread_main(self, ready):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self.serve())
+        ready.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def serve(self):
+        """Open the listening socket on the running loop (no extra thread)."""
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._on_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    def stop(self):
+        """Close the server and its thread (use `aclose()` when not threaded)."""
+        if self._loop is None or self._thread is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.aclose(), self._loop).result(timeout=2)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=2)
+
+    async def aclose(self):
+        if self._server is not None:
+            self._server.close()
+        for writer in list(self._clients):
+            writer.close()
+        self._clients.clear()
+        if self._handlers:  # closing the writers ends their reads
+            await asyncio.wait(list(self._handlers), timeout=1)
+
+    # ---------------------------------------------------------- publishing
+    def publish(self, message):
+        """
+        Queue a message for every client. Safe to call from any thread and
+        never blocks.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        if self._thread is None:
+            self._broadcast(message)
+        else:
+            loop.call_soon_threadsafe(self._broadcast, message)
+
+    def _broadcast(self, message):
+        if message.get("t") == "snap":
+            self.state = copy.deepcopy(message["s"])
+        else:
+            state_delta.apply(self.state, message["d"])
+        self.messages += 1
+        if not self._clients:
+            return
+        data = encode(message)
+        for writer, needs_snapshot in list(self._clients.items()):
+            if writer.is_closing():
+                self._clients.pop(writer, None)
+                continue
+            if writer.transport.get_write_buffer_size() > self.max_buffer:
+                self._clients[writer] = True
+                continue
+            if needs_snapshot:
+                self._send(writer, encode({"t": "snap", "s": self.state}))
+                self._clients[writer] = False
+            else:
+                self._send(writer, data)
+
+    def _send(self, writer, data):
+        writer.write(data)
+        self.bytes_sent += len(data)
+
+    async def _on_client(self, reader, writer):
+        self._send(writer, encode({"t": "snap", "s": self.state}))
+        self._clients[writer] = False
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            await reader.read()  # clients only listen; wait for them to hang up
+        except ConnectionError:
+            pass
+        finally:
+            self._handlers.discard(handler)
+            self._clients.pop(writer, None)
+            writer.close()
+
+
+# ---------------------------------------------------------------------------
+#  ObserverClient – rebuilds the task state from the stream
+# ---------------------------------------------------------------------------
+class ObserverClient:
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self.state = {}
+        self.received_bytes = 0
+
+    async def run(self, on_update=None):
+        """
+        Read the stream until the server closes it.
+
+        Args:
+            on_update (callable): Called with (state, message) after each
+                message is applied.
+        """
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                self.received_bytes += len(line)
+                message = json.loads(line)
+                if message["t"] == "snap":
+                    self.state = message["s"]
+                else:
+                    state_delta.apply(self.state, message["d"])
+                if on_update:
+                    on_update(self.state, message)
+        finally:
+            writer.close()
+
+
+def render_view(surface, state):
+    """
+    Draw a schematic of the patient's screen from observer state: areas,
+    buttons and money as labelled boxes, plus the current cue level.
+    """
+    surface.fill((255, 255, 255))
+    font = layout_font(24)
+    for name, rect in state.get("areas", {}).items():
+        pygame.draw.rect(surface, (220, 220, 235), rect, border_radius=4)
+        surface.blit(font.render(name, True, (60, 60, 60)), (rect[0] + 4, rect[1] + 4))
+    for sid, (value, x, y, w, h, in_pay, highlighted) in state.get("sprites", {}).items():
+        color = (120, 200, 120) if in_pay else (200, 200, 120)
+        pygame.draw.rect(surface, color, (x, y, w, h))
+        if highlighted:
+            pygame.draw.rect(surface, (255, 0, 0), (x, y, w, h), 3)
+        surface.blit(font.render(f"{value:g}", True, (0, 0, 0)), (x + 2, y + 2))
+    lines = [f"assist level: {state.get('assist')}", state.get("msg", ""), state.get("end") or ""]
+    for i, text in enumerate(filter(None, lines)):
+        surface.blit(font.render(str(text), True, (150, 0, 0)), (10, surface.get_height() - 24 * (i + 1)))
+
+
+if __name__ == "__main__":
+    # python observer.py PORT [HOST] – watch a running task
+    port = int(sys.argv[1])
+    host = sys.argv[2] if len(sys.argv) > 2 else "127.0.0.1"
+    pygame.init()
+    client = ObserverClient(host, port)
+
+    def _show(state, message):
+        size = tuple(state.get("size") or (1124, 768))
+        view = pygame.display.get_surface()
+        if view is None or view.get_size() != size:
+            view = pygame.display.set_mode(size)
+        render_view(view, state)
+        pygame.display.flip()
+        pygame.event.pump()
+
+    asyncio.run(client.run(_show))
+    pygame.quit()
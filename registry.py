@@ -0,0 +1,172 @@
+import importlib
+import json
+
+# Nothing in this module imports pygame or a subtask; a subtask's module is
+# only imported the first time something actually builds it.
+
+
+# ---------------------------------------------------------------------------
+#  Config schema
+# ---------------------------------------------------------------------------
+class Field:
+    def __init__(self, kind, default=None, help="", choices=None):
+        """
+        One constructor argument a subtask accepts from the outside.
+
+        Args:
+            kind (type): int, float, str, bool or dict/list (given as JSON on
+                the command line).
+            default: Value used when the argument is not given; None leaves
+                the subtask's own default in place.
+            help (str): One-line description for `epass.py list`.
+            choices (tuple): The only values accepted, if given.
+        """
+        self.kind = kind
+        self.default = default
+        self.help = help
+        self.choices = choices
+
+    def parse(self, text):
+        """Convert a command-line string to this field's type."""
+        if self.kind in (dict, list):
+            value = json.loads(text)
+        elif self.kind is bool:
+            value = text.strip().lower() in ("1", "true", "yes", "on")
+        else:
+            value = self.kind(text)
+        return self.check(value)
+
+    def check(self, value):
+        if value is None:
+            return value
+        if self.kind is float and isinstance(value, int) and not isinstance(value, bool):
+            return float(value)
+        if not isinstance(value, self.kind):
+            raise TypeError(f"expected {self.kind.__name__}, got {type(value).__name__}")
+        if self.choices is not None and value not in self.choices:
+            raise ValueError(f"expected one of {', '.join(map(str, self.choices))}, got {value!r}")
+        return value
+
+
+# ---------------------------------------------------------------------------
+#  SubtaskSpec – a subtask declared by id, imported on first use
+# ---------------------------------------------------------------------------
+class SubtaskSpec:
+    def __init__(self, subtask_id, module, cls, schema=None, title="", headless_agent=True):
+        """
+        Args:
+            subtask_id (str): Id the subtask reports in its results.
+            module (str): Module that defines the subtask.
+            cls (str): Class name inside `module`.
+            schema (dict): Constructor argument name -> Field.
+            title (str): Human-readable name.
+            headless_agent (bool): A synthetic agent exists for batch runs.
+        """
+        self.subtask_id = subtask_id
+        self.module = module
+        self.cls = cls
+        self.schema = schema or {}
+        self.title = title
+        self.headless_agent = headless_agent
+        self._loaded = None
+
+    def load(self):
+        """Import the subtask module (once) and return the task class."""
+        if self._loaded is None:
+            self._loaded = getattr(importlib.import_module(self.module), self.cls)
+        return self._loaded
+
+    def args(self, overrides=None):
+        """
+        Validate constructor arguments against the schema.
+
+        Args:
+            overrides (dict): Argument values; strings are parsed with the
+                field's type.
+
+        Returns:
+            dict: Defaults merged with `overrides`, None values dropped.
+        """
+        overrides = overrides or {}
+        unknown = set(overrides) - set(self.schema)
+        if unknown:
+            raise ValueError(f"{self.subtask_id} does not take {', '.join(sorted(unknown))}")
+        args = {}
+        for name, field in self.schema.items():
+            value = overrides.get(name, field.default)
+            try:
+                value = field.parse(value) if isinstance(value, str) and field.kind is not str else field.check(value)
+            except (TypeError, ValueError) as exc:
+                raise ValueError(f"{self.subtask_id}.{name}: {exc}") from None
+            if value is not None:
+                args[name] = value
+        return args
+
+    def create(self, screen, args=None, **config):
+        """
+        Build the subtask.
+
+        Args:
+            screen (pygame.Surface): Drawing surface.
+            args (dict): Constructor arguments (validated with `args`).
+            **config: BaseTask configuration (clock, observer, checkpoint…).
+        """
+        return self.load()(screen, **self.args(args), **config)
+
+
+REGISTRY = {}
+
+
+def register(spec):
+    """Add `spec` to the registry; ids must be unique."""
+    if spec.subtask_id in REGISTRY:
+        raise ValueError(f"Subtask id {spec.subtask_id!r} is already registered")
+    REGISTRY[spec.subtask_id] = spec
+    return spec
+
+
+def get(subtask_id):
+    try:
+        return REGISTRY[subtask_id]
+    except KeyError:
+        raise ValueError(f"Unknown subtask id {subtask_id!r}") from None
+
+
+def create(subtask_id, screen, args=None, **config):
+    """Shorthand for `get(subtask_id).create(screen, args, **config)`."""
+    return get(subtask_id).create(screen, args, **config)
+
+
+# ---------------------------------------------------------------------------
+#  Shopping subtasks
+# ---------------------------------------------------------------------------
+register(SubtaskSpec(
+    "make_change_submit", "Shopping_PayWithCash_Subtask", "MakeChangeTask",
+    title="Pay with cash",
+    schema={
+        "items": Field(list, help="item names on the receipt (random if omitted)"),
+        "prices": Field(list, help="item prices in dollars, same order as items"),
+        "wallet": Field(dict, help='denomination -> count, e.g. {"5.0": 1, "1.0": 5}'),
+        "max_time_sec": Field(int, 120, "time limit in seconds"),
+        "max_attempts": Field(int, 3, "time limits allowed to run out before the task ends"),
+    },
+))
+
+register(SubtaskSpec(
+    "incorrect_change", "Shopping_IncorrectChange_Subtask", "IncorrectChange",
+    title="Check the change",
+    schema={
+        # ChangeMode names, listed here so the subtask module is not imported
+        "change_mode": Field(str, "FIFTY_FIFTY", "whether the change shown is right",
+                             choices=("FIFTY_FIFTY", "ALWAYS_RIGHT", "ALWAYS_WRONG")),
+        "price": Field(float, 1.25, "price of the purchase in dollars"),
+        "payment_amount": Field(float, 5.00, "bill handed over in dollars (only the $5 has artwork)",
+                                choices=(5.00,)),
+        "change_offset": Field(float, help="fixed error in the change given (overrides change_mode)"),
+    },
+))
+
+# Batteries run their subtasks in order on one window.
+BATTERIES = {
+    "shopping": ["make_change_submit", "incorrect_change"],
+}
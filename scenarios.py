@@ -0,0 +1,341 @@
+import hashlib
+import itertools
+import json
+import os
+import random
+import sqlite3
+
+# ---------------------------------------------------------------------------
+#  Catalogs (all money in integer cents)
+# ---------------------------------------------------------------------------
+DEFAULT_CATALOG = [
+    ("Campbell’s Tomato Rice soup", 79),
+    ("Tomato sauce", 45),
+    ("Local brand Chicken Noodle soup", 69),
+    ("Local brand Tomato soup", 39),
+    ("Box of crackers", 129),
+    ("Can of tuna", 99),
+    ("Loaf of bread", 215),
+    ("Carton of eggs", 189),
+]
+
+DEFAULT_WALLETS = [
+    {500: 1, 100: 5, 25: 4, 10: 10, 5: 10, 1: 10},  # MakeChangeTask.WALLET_COUNTS
+    {500: 1, 100: 3, 25: 2, 10: 4, 5: 4, 1: 4},
+    {100: 8, 25: 8, 10: 5, 5: 5, 1: 5},
+    {500: 2, 100: 2, 25: 3, 10: 2, 5: 1, 1: 3},
+]
+
+DEFAULT_CHANGE_PRICES = [39, 45, 69, 79, 99, 125, 129, 189, 215, 349]
+DEFAULT_PAYMENTS = [500]  # IncorrectChange only has artwork for the $5 bill
+DEFAULT_OFFSETS = [-100, -25, -20, -10, -5, -1, 0, 1, 5, 10, 20, 25, 100]
+
+BILL_DENOMS = (500, 100)
+COIN_DENOMS = (25, 10, 5, 1)
+BANDS = ("easy", "medium", "hard")
+
+INDEX_VERSION = 1
+DEFAULT_INDEX = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios.sqlite3")
+
+# Subtask id -> scenario kind in the index
+SUBTASK_KINDS = {"make_change_submit": "make_change", "incorrect_change": "incorrect_change"}
+
+
+# ---------------------------------------------------------------------------
+#  Difficulty features
+# ---------------------------------------------------------------------------
+def min_pieces(amount, wallet):
+    """
+    Fewest bills/coins from a limited wallet that add up to `amount` exactly.
+
+    Args:
+        amount (int): Target in cents.
+        wallet (dict): Denomination in cents -> count available.
+
+    Returns:
+        tuple: (pieces, denominations used) or (None, 0) when no exact
+        combination exists.
+    """
+    inf = float("inf")
+    best = [inf] * (amount + 1)
+    masks = [0] * (amount + 1)
+    best[0] = 0
+    for bit, (denom, count) in enumerate(sorted(wallet.items(), reverse=True)):
+        for _ in range(count):  # bounded: treat every piece as a 0/1 item
+            for a in range(amount, denom - 1, -1):
+                if best[a - denom] + 1 < best[a]:
+                    best[a] = best[a - denom] + 1
+                    masks[a] = masks[a - denom] | (1 << bit)
+    if best[amount] == inf:
+        return None, 0
+    return best[amount], bin(masks[amount]).count("1")
+
+
+def greedy_split(amount):
+    """Split `amount` cents into bills and coins the way IncorrectChange does."""
+    pieces = []
+    for denom in BILL_DENOMS + COIN_DENOMS:
+        n, amount = divmod(amount, denom)
+        pieces.extend([denom] * n)
+    return pieces
+
+
+def make_change_difficulty(total, n_items, pieces, n_denoms, exact):
+    if not exact:
+        return 100.0 + n_items  # cannot be paid exactly: always hardest
+    return round(pieces + 1.5 * n_denoms + 0.5 * n_items + (total % 5 != 0), 2)
+
+
+def incorrect_change_difficulty(due, offset, shown_pieces, n_denoms):
+    # Small errors hidden among many pieces are the hardest to spot; a
+    # correct handful is easiest.
+    if offset == 0:
+        return round(0.5 * shown_pieces + n_denoms, 2)
+    return round(0.5 * shown_pieces + n_denoms + 10.0 / abs(offset) + (due % 5 != 0), 2)
+
+
+# ---------------------------------------------------------------------------
+#  Enumeration
+# ---------------------------------------------------------------------------
+def enumerate_make_change(catalog, wallets, items_per_receipt=(2, 3, 4)):
+    for k in items_per_receipt:
+        for combo in itertools.combinations(catalog, k):
+            names = [name for name, _ in combo]
+            prices = [price for _, price in combo]
+            total = sum(prices)
+            for w, wallet in enumerate(wallets):
+                pieces, n_denoms = min_pieces(total, wallet)
+                exact = pieces is not None
+                yield {
+                    "items": names,
+                    "prices": prices,
+                    "total": total,
+                    "wallet_id": w,
+                    "wallet": wallet,
+                    "min_pieces": pieces,
+                    "n_denoms": n_denoms,
+                    "exact": exact,
+                    "difficulty": make_change_difficulty(total, k, pieces, n_denoms, exact),
+                }
+
+
+def enumerate_incorrect_change(prices, payments, offsets):
+    for price, payment, offset in itertools.product(prices, payments, offsets):
+        due = payment - price
+        shown = due + offset
+        if due <= 0 or shown <= 0:
+            continue
+        pieces = greedy_split(shown)
+        yield {
+            "price": price,
+            "payment": payment,
+            "offset": offset,
+            "due": due,
+            "shown": shown,
+            "shown_pieces": len(pieces),
+            "n_denoms": len(set(pieces)),
+            "difficulty": incorrect_change_difficulty(due, offset, len(pieces), len(set(pieces))),
+        }
+
+
+def _band_cutoffs(values):
+    ordered = sorted(values)
+    if not ordered:
+        return (0.0, 0.0)
+    return ordered[len(ordered) // 3], ordered[(2 * len(ordered)) // 3]
+
+
+def _band(value, cutoffs):
+    if value < cutoffs[0]:
+        return "easy"
+    if value < cutoffs[1]:
+        return "medium"
+    return "hard"
+
+
+# ---------------------------------------------------------------------------
+#  On-disk index
+# ---------------------------------------------------------------------------
+def _config_hash(config):
+    blob = json.dumps([INDEX_VERSION, config], sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def build_index(path, catalog=None, wallets=None, items_per_receipt=(2, 3, 4),
+                change_prices=None, payments=None, offsets=None, force=False):
+    """
+    Enumerate every scenario, compute its features and write a SQLite index.
+
+    The index is rebuilt only when the configuration changes (or `force`),
+    so launches reuse the precomputed file.
+
+    Returns:
+        ScenarioIndex: The opened index.
+    """
+    config = {
+        "catalog": catalog or DEFAULT_CATALOG,
+        "wallets": [{str(k): v for k, v in w.items()} for w in (wallets or DEFAULT_WALLETS)],
+        "items_per_receipt": list(items_per_receipt),
+        "change_prices": change_prices or DEFAULT_CHANGE_PRICES,
+        "payments": payments or DEFAULT_PAYMENTS,
+        "offsets": offsets or DEFAULT_OFFSETS,
+    }
+    digest = _config_hash(config)
+    if not force and os.path.exists(path):
+        index = ScenarioIndex(path)
+        if index.meta.get("config_hash") == digest:
+            return index
+        index.close()
+
+    tmp = path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    db = sqlite3.connect(tmp)
+    db.executescript("""
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE make_change (
+            id INTEGER PRIMARY KEY, items TEXT, prices TEXT, total INTEGER,
+            wallet_id INTEGER, wallet TEXT, min_pieces INTEGER, n_denoms INTEGER,
+            exact INTEGER, difficulty REAL, band TEXT);
+        CREATE TABLE incorrect_change (
+            id INTEGER PRIMARY KEY, price INTEGER, payment INTEGER, offset INTEGER,
+            due INTEGER, shown INTEGER, shown_pieces INTEGER, n_denoms INTEGER,
+            difficulty REAL, band TEXT);
+    """)
+
+    wallets = wallets or DEFAULT_WALLETS
+    mc = list(enumerate_make_change(config["catalog"], wallets, items_per_receipt))
+    mc_cut = _band_cutoffs([r["difficulty"] for r in mc if r["exact"]])
+    db.executemany(
+        "INSERT INTO make_change (items, prices, total, wallet_id, wallet, min_pieces, n_denoms,"
+        " exact, difficulty, band) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [(json.dumps(r["items"]), json.dumps(r["prices"]), r["total"], r["wallet_id"],
+          json.dumps({str(k): v for k, v in r["wallet"].items()}), r["min_pieces"], r["n_denoms"],
+          int(r["exact"]), r["difficulty"], _band(r["difficulty"], mc_cut) if r["exact"] else "infeasible")
+         for r in mc])
+
+    ic = list(enumerate_incorrect_change(config["change_prices"], config["payments"], config["offsets"]))
+    ic_cut = _band_cutoffs([r["difficulty"] for r in ic])
+    db.executemany(
+        "INSERT INTO incorrect_change (price, payment, offset, due, shown, shown_pieces, n_denoms,"
+        " difficulty, band) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [(r["price"], r["payment"], r["offset"], r["due"], r["shown"], r["shown_pieces"],
+          r["n_denoms"], r["difficulty"], _band(r["difficulty"], ic_cut)) for r in ic])
+
+    db.execute("CREATE INDEX make_change_band ON make_change (band, id)")
+    db.execute("CREATE INDEX incorrect_change_band ON incorrect_change (band, id)")
+    db.executemany("INSERT INTO meta VALUES (?, ?)", [
+        ("config_hash", digest),
+        ("config", json.dumps(config)),
+        ("make_change_cutoffs", json.dumps(mc_cut)),
+        ("incorrect_change_cutoffs", json.dumps(ic_cut)),
+    ])
+    db.commit()
+    db.close()
+    os.replace(tmp, path)
+    return ScenarioIndex(path)
+
+
+class ScenarioIndex:
+    def __init__(self, path):
+        """
+        Read-only view of a scenario index built by `build_index`.
+
+        `pick(kind, band, seed)` is deterministic: the same seed always maps to
+        the same scenario for a given index.
+        """
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.meta = dict(self.db.execute("SELECT key, value FROM meta").fetchall())
+
+    def close(self):
+        self.db.close()
+
+    def count(self, kind, band=None):
+        table = self._table(kind)
+        if band is None:
+            return self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        return self.db.execute(f"SELECT COUNT(*) FROM {table} WHERE band = ?", (band,)).fetchone()[0]
+
+    def pick(self, kind, band, seed):
+        """
+        Choose one scenario of `kind` in difficulty `band`.
+
+        Args:
+            kind (str): "make_change" or "incorrect_change".
+            band (str): "easy", "medium" or "hard".
+            seed (int): Selection seed.
+
+        Returns:
+            dict: Scenario row, ready for `task_kwargs`.
+        """
+        table = self._table(kind)
+        n = self.count(kind, band)
+        if not n:
+            raise LookupError(f"No {kind} scenarios in band {band!r}")
+        offset = random.Random(seed).randrange(n)
+        row = self.db.execute(f"SELECT * FROM {table} WHERE band = ? ORDER BY id LIMIT 1 OFFSET ?",
+                              (band, offset)).fetchone()
+        return dict(row, kind=kind)
+
+    @staticmethod
+    def _table(kind):
+        if kind not in ("make_change", "incorrect_change"):
+            raise ValueError(f"Unknown scenario kind {kind!r}")
+        return kind
+
+
+def task_kwargs(scenario):
+    """
+    Translate a scenario row into constructor arguments for its task.
+
+    Returns:
+        dict: Keyword arguments for MakeChangeTask or IncorrectChange.
+    """
+    if scenario["kind"] == "make_change":
+        wallet = {int(k) / 100: v for k, v in json.loads(scenario["wallet"]).items()}
+        return {
+            "items": json.loads(scenario["items"]),
+            "prices": [p / 100 for p in json.loads(scenario["prices"])],
+            "wallet": wallet,
+        }
+    return {
+        "price": scenario["price"] / 100,
+        "payment_amount": scenario["payment"] / 100,
+        "change_offset": scenario["offset"] / 100,
+    }
+
+
+def scenario_args(subtask_id, band, seed, path=DEFAULT_INDEX):
+    """
+    Constructor arguments for one indexed scenario of a subtask.
+
+    The index at `path` is built on first use and reused while the
+    configuration is unchanged, so a launch costs one query.
+
+    Args:
+        subtask_id (str): "make_change_submit" or "incorrect_change".
+        band (str): "easy", "medium" or "hard".
+        seed (int): Selection seed (see `ScenarioIndex.pick`).
+
+    Raises:
+        ValueError: The subtask has no scenarios or the band is unknown.
+    """
+    kind = SUBTASK_KINDS.get(subtask_id)
+    if kind is None:
+        raise ValueError(f"{subtask_id} has no indexed scenarios")
+    if band not in BANDS:
+        raise ValueError(f"Unknown band {band!r}; expected one of {', '.join(BANDS)}")
+    index = build_index(path)
+    try:
+        return task_kwargs(index.pick(kind, band, seed))
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    index = build_index(DEFAULT_INDEX)
+    for kind in ("make_change", "incorrect_change"):
+        for band in BANDS:
+            print(kind, band, index.count(kind, band), index.pick(kind, band, seed=0))
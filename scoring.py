@@ -0,0 +1,331 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Scores are a pure function of a session's scoring facts and a versioned rule
+# set. The subtasks collect the facts and call `Rules.score`; nothing here
+# imports pygame, except `rescore_log` when it has to replay a session (it
+# then starts pygame headless in whichever process it runs in).
+
+
+# ---------------------------------------------------------------------------
+#  Rules
+# ---------------------------------------------------------------------------
+class Rules:
+    def __init__(self, version, ladders, surrender_close=1.50, quality_close=1.00,
+                 change_quality=((0.10, 2), (0.50, 1)), change_process=((4, 0), (3, 1), (2, 2)),
+                 change_process_default=3, change_surrender_close=1.50, diff_from_shown=True,
+                 surrender_while_guessing=True):
+        """
+        One version of the E-PASS scoring rules.
+
+        Args:
+            version (str): Reported with every score as `scoring.version`.
+            ladders (dict): Subtask id -> seconds of inactivity before each
+                cue level (1, 2, ...). The subtasks decide when the idle
+                timer resets; the ladder only sets the thresholds.
+            surrender_close (float): Make Change surrender within this many
+                dollars of the total scores independence 7.
+            quality_close (float): Make Change payment within this many
+                dollars of the total (but not exact) scores quality 2.
+            change_quality (tuple): Incorrect Change (max diff, score) tiers,
+                checked in order; anything larger scores 0.
+            change_process (tuple): Incorrect Change (errors above, score)
+                tiers, checked in order.
+            change_process_default (int): Process score for a success with
+                fewer errors than any tier.
+            change_surrender_close (float): Incorrect Change surrender on
+                wrong change off by less than this scores independence 7.
+            diff_from_shown (bool): Measure the change difference between the
+                change shown and the change due. Version 1 measured the
+                change due itself (the difference was taken before the
+                change was laid out).
+            surrender_while_guessing (bool): Apply the surrender tiers when
+                giving up while typing the correct change.
+        """
+        self.version = version
+        self.ladders = ladders
+        self.surrender_close = surrender_close
+        self.quality_close = quality_close
+        self.change_quality = change_quality
+        self.change_process = change_process
+        self.change_process_default = change_process_default
+        self.change_surrender_close = change_surrender_close
+        self.diff_from_shown = diff_from_shown
+        self.surrender_while_guessing = surrender_while_guessing
+
+    def __repr__(self):
+        return f"<Rules {self.version}>"
+
+    def ladder(self, subtask_id):
+        return self.ladders[subtask_id]
+
+    # ------------------------------------------------------------ scores
+    def score(self, subtask_id, facts):
+        """
+        Args:
+            subtask_id (str): Registered subtask id.
+            facts (dict): What the subtask recorded at completion (see
+                `make_change_submit` and `incorrect_change`).
+
+        Returns:
+            dict: independence_score, quality_score and process_score.
+        """
+        return getattr(self, subtask_id)(facts)
+
+    def make_change_submit(self, facts):
+        """
+        Facts: end ("submit", "surrender" or "timeout"), cue (highest cue
+        level reached), target and paid (dollars).
+        """
+        target, paid, cue = facts["target"], facts["paid"], facts["cue"]
+        difference = abs(target - paid)
+        independence = cue
+        process = 3
+        if cue >= 5:
+            process = 1
+        elif cue >= 3:
+            process = 2
+        if facts["end"] == "surrender":
+            if difference < self.surrender_close:
+                independence = 7
+            elif difference < paid:
+                independence = 8
+            else:
+                independence = 9
+            process = 0
+
+        if difference == 0:
+            quality = 3
+        elif difference < self.quality_close:
+            quality = 2
+        elif difference < paid:
+            quality = 1
+        else:
+            quality = 0
+        return {"independence_score": independence, "quality_score": quality, "process_score": process}
+
+    def incorrect_change(self, facts):
+        """
+        Facts: end ("answer", "guess" or "surrender"), success, cue, errors,
+        correct (the change shown was right), shown and due (dollars), and
+        guessing (the participant was typing the correct change).
+        """
+        diff = abs(facts["shown"] - facts["due"]) if self.diff_from_shown else facts["due"]
+        independence = facts["cue"]
+        if facts["end"] == "surrender" and (self.surrender_while_guessing or not facts["guessing"]):
+            if facts["correct"]:
+                independence = 9
+            elif diff < self.change_surrender_close:
+                independence = 7
+            else:
+                independence = 8
+
+        process = 0
+        if facts["success"]:
+            process = self.change_process_default
+            for above, tier in self.change_process:
+                if facts["errors"] > above:
+                    process = tier
+                    break
+
+        quality = 0
+        for below, tier in self.change_quality:
+            if diff < below:
+                quality = tier
+                break
+        return {"independence_score": independence, "quality_score": quality, "process_score": process}
+
+
+LADDERS = {
+    "make_change_submit": (3, 5, 5, 5, 5, 5),
+    "incorrect_change": (5, 3, 3, 3, 3, 3),
+}
+
+RULES = {}
+
+
+def register(rules):
+    RULES[rules.version] = rules
+    return rules
+
+
+# Version 1 is what the subtasks computed before the rules moved here, so
+# rescoring an old log under "1" reproduces its recorded scores; it stays the
+# default. Version 2 (process 3 for a clean Incorrect Change, the change
+# difference taken from the change shown, surrender tiers while guessing) is
+# a proposal, available through `--scoring 2` and `rescore` for comparison.
+register(Rules("1", LADDERS, change_process_default=0, diff_from_shown=False,
+               surrender_while_guessing=False))
+register(Rules("2", LADDERS))
+CURRENT = "1"
+
+
+def get(rules=None):
+    """Rules by version string, a Rules instance as is, or the current rules for None."""
+    if isinstance(rules, Rules):
+        return rules
+    version = CURRENT if rules is None else str(rules)
+    try:
+        return RULES[version]
+    except KeyError:
+        raise ValueError(f"unknown scoring version {version!r}; known: {', '.join(RULES)}") from None
+
+
+# ---------------------------------------------------------------------------
+#  Rescoring stored sessions
+# ---------------------------------------------------------------------------
+SCORES = ("independence_score", "quality_score", "process_score")
+
+
+def _read_ends(path, block=8192):
+    """(header, end results or None) from the first and last line of a log."""
+    with open(path, "rb") as f:
+        header = json.loads(f.readline())
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        tail = b""
+        while size > 0:
+            step = min(block, size)
+            size -= step
+            f.seek(size)
+            tail = f.read(step) + tail
+            lines = tail.rstrip(b"\n").rsplit(b"\n", 1)
+            if len(lines) == 2 or size == 0:
+                break
+            block *= 2
+    try:
+        last = json.loads(tail.rstrip(b"\n").rsplit(b"\n", 1)[-1])
+    except ValueError:
+        return header, None  # torn last line
+    return header, last.get("r") if isinstance(last, dict) and last.get("t") == "end" else None
+
+
+def rescore_log(path, rules=None, replay=False):
+    """
+    Scores of one recorded session under `rules`.
+
+    When the log's results carry scoring facts and the cue ladder is the
+    one the session ran with, the facts are simply scored again. Otherwise
+    (older logs, a changed ladder, `replay=True`) the session is replayed
+    headless under the new rules, which also moves cues to the new ladder
+    against the participant's recorded input.
+
+    Returns:
+        dict: log, task, version, method ("facts" or "replay"), the new
+        scores, and the recorded version and scores under "was".
+    """
+    rules = get(rules)
+    header, recorded = _read_ends(path)
+    task = header["task"]
+    row = {"log": path, "task": task, "version": rules.version}
+    stored = (recorded or {}).get("scoring") or {}
+    before = RULES.get(stored.get("version"))
+    if recorded is not None:
+        row["was"] = {"version": stored.get("version", "1"), **{k: recorded.get(k) for k in SCORES}}
+    if not replay and "facts" in stored and before is not None and before.ladder(task) == rules.ladder(task):
+        row["method"] = "facts"
+        row.update(rules.score(task, stored["facts"]))
+        return row
+
+    from event_log import replay as replay_log
+    from layout import init_headless
+
+    init_headless()
+    results, _ = replay_log(path, render=False, scoring=rules)
+    row["method"] = "replay"
+    row.update({k: results.get(k) for k in SCORES})
+    return row
+
+
+def _rescore_batch(paths, rules, replay):
+    rows = []
+    for path in paths:
+        try:
+            rows.append(rescore_log(path, rules, replay))
+        except Exception as exc:  # one unreadable log should not stop a cohort
+            rows.append({"log": path, "error": f"{type(exc).__name__}: {exc}"})
+    return rows
+
+
+def iter_logs(paths, suffix=".jsonl"):
+    """Yield log files from files and directories (walked recursively), lazily."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(suffix):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def rescore(paths, rules=None, workers=None, chunk=64, replay=False):
+    """
+    Rescore stored sessions, streaming.
+
+    Logs are read in batches of `chunk` by a process pool with a bounded
+    number of batches in flight, so a cohort of any size is never held in
+    memory; rows come back in input order.
+
+    Args:
+        paths (iterable): Log files (e.g. from `iter_logs`).
+        rules: Version string or Rules; None for the current rules.
+        workers (int): Process count (defaults to the CPU count); 1 runs in
+            this process.
+        chunk (int): Logs per job sent to a worker.
+        replay (bool): Always replay, even where the facts would do.
+
+    Yields:
+        dict: One `rescore_log` row per log (or {"log", "error"}).
+    """
+    rules = get(rules)
+    workers = workers or os.cpu_count() or 1
+    batches = _batched(paths, chunk)
+    if workers == 1:
+        for batch in batches:
+            yield from _rescore_batch(batch, rules, replay)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for batch in batches:
+            pending.append(pool.submit(_rescore_batch, batch, rules, replay))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _batched(items, n):
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == n:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def summarize(rows):
+    """
+    Aggregate rescoring rows.
+
+    Returns:
+        dict: sessions, errors, how many were rescored from facts and by
+        replay, and per score how many changed from the recorded value.
+    """
+    out = {"sessions": 0, "errors": 0, "facts": 0, "replay": 0, "changed": {k: 0 for k in SCORES}}
+    for row in rows:
+        out["sessions"] += 1
+        if "error" in row:
+            out["errors"] += 1
+            continue
+        out[row["method"]] += 1
+        was = row.get("was") or {}
+        for k in SCORES:
+            if k in was and was[k] != row[k]:
+                out["changed"][k] += 1
+    return out
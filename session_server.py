@@ -0,0 +1,709 @@
+import asyncio
+import json
+import math
+import multiprocessing
+import os
+import queue
+import secrets
+import sys
+import threading
+import time
+
+import registry
+
+# The router process only parses JSON and forwards it; pygame and the
+# subtasks are imported by the worker processes alone.
+
+
+def _encode(message):
+    return (json.dumps(message, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+
+class _PipeWriter:
+    def __init__(self, conn, name):
+        """
+        Send messages down a multiprocessing Connection from a writer thread.
+
+        `Connection.send` blocks once the pipe is full. The worker's frame
+        loop and the router's event loop only enqueue here, so a slow peer
+        delays its own messages rather than the caller, and a router and a
+        worker that both have a full pipe cannot deadlock.
+        """
+        self.conn = conn
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._writer, name=name, daemon=True)
+        self._thread.start()
+
+    def send(self, message):
+        """Queue one message; never blocks the caller."""
+        self._queue.put(message)
+
+    def close(self, timeout=None):
+        """Send everything queued, then stop the thread (waits up to `timeout`)."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _writer(self):
+        while True:
+            message = self._queue.get()
+            if message is None:
+                return
+            try:
+                self.conn.send(message)
+            except OSError:  # the other end is gone; its reader sees EOF
+                return
+
+
+# ---------------------------------------------------------------------------
+#  Client input – only what a participant can produce, fully formed
+# ---------------------------------------------------------------------------
+MAX_SIZE = 4096  # largest session surface side, in pixels
+_COORD_LIMIT = 1 << 20
+
+
+def _coord(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    if not math.isfinite(value) or abs(value) >= _COORD_LIMIT:
+        return None
+    return int(value)
+
+
+def _pair(value):
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        return None
+    pair = tuple(_coord(v) for v in value)
+    return None if None in pair else pair
+
+
+def _valid_size(value):
+    pair = _pair(value)
+    return pair is not None and all(0 < v <= MAX_SIZE for v in pair)
+
+
+def client_event(item):
+    """
+    Turn a client's `[type, {attrs}]` into a pygame event, or None to drop it.
+
+    Only mouse buttons, mouse motion, key presses and window resizes are
+    accepted, and only when every attribute the subtasks read is present
+    and well typed (positions are two numbers, `buttons` three flags,
+    `button` and `key` integers, `unicode` a string). Anything else would
+    raise inside the task's frame and end the session, so it is dropped.
+    """
+    import pygame
+
+    try:
+        event_type, attrs = item
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(attrs, dict) or isinstance(event_type, bool) or not isinstance(event_type, int):
+        return None
+    if event_type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+        button = attrs.get("button")
+        fields = {"pos": _pair(attrs.get("pos")),
+                  "button": button if type(button) is int and 0 < button < 32 else None}
+    elif event_type == pygame.MOUSEMOTION:
+        buttons = attrs.get("buttons")
+        if isinstance(buttons, (list, tuple)) and len(buttons) == 3 and all(type(b) in (bool, int) for b in buttons):
+            buttons = tuple(int(bool(b)) for b in buttons)
+        else:
+            buttons = None
+        fields = {"pos": _pair(attrs.get("pos")), "rel": _pair(attrs.get("rel")), "buttons": buttons}
+    elif event_type == pygame.KEYDOWN:
+        key, text = attrs.get("key"), attrs.get("unicode")
+        fields = {"key": key if type(key) is int and 0 <= key < 1 << 31 else None,
+                  "unicode": text if isinstance(text, str) and len(text) <= 4 else None}
+    elif event_type == pygame.VIDEORESIZE:
+        size = attrs.get("size")
+        fields = {"size": _pair(size) if _valid_size(size) else None}
+    else:
+        return None
+    if None in fields.values():
+        return None
+    return pygame.event.Event(event_type, fields)
+
+
+# ---------------------------------------------------------------------------
+#  Worker process – many headless sessions on one frame loop
+# ---------------------------------------------------------------------------
+class _Publisher:
+    def __init__(self, sid, out):
+        """Observer stand-in: a task's state messages go to the worker outbox."""
+        self.sid = sid
+        self.out = out
+
+    def publish(self, message):
+        self.out.append(("msg", self.sid, message))
+
+
+class SessionWorker:
+    def __init__(self, index, conn, max_sessions=64, fps=60, render=False, observer_interval=0.05):
+        """
+        Host up to `max_sessions` tasks in one process.
+
+        Every frame the worker applies the commands the router sent, steps
+        each session once and sends everything the sessions published back
+        as one batch. Each session has a SimulatedClock that is advanced to
+        the real time elapsed since it opened, so task timers follow wall
+        time even when a crowded frame runs late. A session that raises, or
+        whose command cannot be applied, is ended with an error without
+        touching its neighbours.
+
+        Args:
+            index (int): Worker number, reported in stats.
+            conn (multiprocessing.connection.Connection): Pipe to the router.
+            max_sessions (int): Sessions this worker accepts.
+            fps (int): Target frame rate.
+            render (bool): Draw every session off-screen (not needed for deltas).
+            observer_interval (float): Seconds between state messages per session.
+        """
+        self.index = index
+        self.conn = conn
+        self.max_sessions = max_sessions
+        self.fps = fps
+        self.render = render
+        self.observer_interval = observer_interval
+        self.sessions = {}  # sid -> (task, clock, monotonic_ns at open)
+        self.out = []
+        self.frame_ms = []
+        self._running = True
+
+    def run(self):
+        import pygame
+        from layout import init_headless
+
+        init_headless()
+        self._pygame = pygame
+        writer = _PipeWriter(self.conn, f"epass-worker-{self.index}-writer")
+        period_ns = int(1e9 / self.fps)
+        next_stats = time.monotonic_ns()
+        while self._running:
+            if not self.sessions:
+                self.conn.poll(0.5)  # idle: sleep until the router has something
+            self._drain()
+            now = time.monotonic_ns()
+            self._frame(now)
+            self.frame_ms.append((time.monotonic_ns() - now) / 1e6)
+            if now >= next_stats:
+                next_stats = now + 2_000_000_000
+                self.out.append(("stats", None, self.stats()))
+            if self.out:
+                writer.send(self.out[:])
+                self.out.clear()  # publishers hold this list
+            spare = period_ns - (time.monotonic_ns() - now)
+            if spare > 0 and self.sessions:
+                time.sleep(spare / 1e9)
+        for sid in list(self.sessions):
+            self._end(sid)
+        if self.out:
+            writer.send(self.out[:])
+        writer.close()
+
+    def stats(self):
+        ordered = sorted(self.frame_ms)
+        self.frame_ms = []
+        n = len(ordered)
+        return {
+            "worker": self.index,
+            "pid": os.getpid(),
+            "sessions": len(self.sessions),
+            "frames": n,
+            "frame_ms_p50": round(ordered[n // 2], 3) if n else None,
+            "frame_ms_p99": round(ordered[min(n - 1, int(n * 0.99))], 3) if n else None,
+        }
+
+    # ----------------------------------------------------------- commands
+    def _drain(self):
+        while self.conn.poll():
+            try:
+                command = self.conn.recv()
+            except EOFError:  # router went away
+                self._running = False
+                return
+            try:
+                self._apply(command)
+            except Exception as exc:  # a bad command ends its own session, not the worker
+                sid = command[1] if len(command) > 1 else None
+                self.out.append(("error", sid, f"{type(exc).__name__}: {exc}"))
+                if sid in self.sessions:
+                    self._end(sid, reason="error")
+
+    def _apply(self, command):
+        op = command[0]
+        if op == "open":
+            self._open(*command[1:])
+        elif op == "input":
+            self._input(*command[1:])
+        elif op == "resync":
+            self._resync(command[1])
+        elif op == "close" and command[1] in self.sessions:
+            self._end(command[1], reason="closed")
+        elif op == "stop":
+            self._running = False
+
+    def _open(self, sid, subtask_id, args, size):
+        from timing import SimulatedClock
+
+        if len(self.sessions) >= self.max_sessions:
+            self.out.append(("error", sid, "worker full"))
+            return
+        clock = SimulatedClock()
+        try:
+            task = registry.create(subtask_id, self._pygame.Surface(size), args, clock=clock,
+                                   observer=_Publisher(sid, self.out),
+                                   observer_interval=self.observer_interval,
+                                   keep_motion_samples=False)
+            task.begin()
+        except Exception as exc:
+            self.out.append(("error", sid, f"{type(exc).__name__}: {exc}"))
+            return
+        self.sessions[sid] = (task, clock, time.monotonic_ns())
+        self.out.append(("opened", sid, {"worker": self.index}))
+
+    def _input(self, sid, events):
+        session = self.sessions.get(sid)
+        if session is None:
+            return
+        task, clock, _ = session
+        if not isinstance(events, list):
+            raise TypeError("events must be a list of [type, {attrs}]")
+        for item in events:
+            event = client_event(item)
+            if event is None:
+                continue  # malformed or non-input events from a client are dropped
+            if event.type == self._pygame.VIDEORESIZE:
+                # the worker's display is a shared 1x1 dummy: resize onto a
+                # surface of the session's own, as a headless replay does
+                task.resize(self._pygame.Surface(event.size))
+                continue
+            task.input.inject(event, clock.now_ns())
+
+    def _resync(self, sid):
+        from state_delta import StateTracker
+
+        session = self.sessions.get(sid)
+        if session is not None:
+            task = session[0]
+            task._observed = StateTracker()  # next publish is a full snapshot
+            task._next_publish_ns = 0
+
+    def _frame(self, now_ns):
+        for sid, (task, clock, origin_ns) in list(self.sessions.items()):
+            clock.advance((now_ns - origin_ns - clock.now_ns()) / 1e6)
+            try:
+                task.step(render=self.render)
+            except Exception as exc:
+                self.out.append(("error", sid, f"{type(exc).__name__}: {exc}"))
+                self._end(sid, reason="error")
+                continue
+            if not task.running:
+                self._end(sid)
+
+    def _end(self, sid, reason=None):
+        task, _, _ = self.sessions.pop(sid)
+        if reason is not None and task.end_reason is None:
+            task.end_reason = reason
+        task.running = False
+        try:
+            task.finish()
+            results = dict(task.get_results(), end_reason=task.end_reason)
+        except Exception as exc:
+            results = {"error": f"{type(exc).__name__}: {exc}", "end_reason": task.end_reason}
+        self.out.append(("end", sid, results))
+
+
+def _worker_main(index, conn, max_sessions, fps, render, observer_interval):
+    SessionWorker(index, conn, max_sessions, fps, render, observer_interval).run()
+
+
+# ---------------------------------------------------------------------------
+#  SessionServer – routes clients to workers with session affinity
+# ---------------------------------------------------------------------------
+class _Route:
+    def __init__(self, worker, writer):
+        self.worker = worker
+        self.writer = writer  # None while the client is away
+        self.opened = False
+        self.stale = False  # deltas were dropped; waiting for a snapshot
+        self.detached_at = None
+
+
+class SessionServer:
+    def __init__(self, host="127.0.0.1", port=0, workers=None, max_sessions_per_worker=64,
+                 fps=60, render=False, observer_interval=0.05, linger=30.0, max_buffer=256 * 1024,
+                 max_line=1024 * 1024):
+        """
+        Headless E-PASS sessions for remote clients, sharded over processes.
+
+        Clients speak newline-delimited JSON over TCP:
+
+            {"op": "open", "task": "make_change_submit", "args": {...}, "size": [w, h]}
+            {"op": "input", "sid": ..., "events": [[type, {attrs}], ...]}
+            {"op": "attach", "sid": ...}     resume a session after a reconnect
+            {"op": "close", "sid": ...}
+            {"op": "stats"}
+
+        and receive {"t": "opened"}, the session's state as {"t": "snap"} /
+        {"t": "d"} messages (see observer.py), {"t": "end"} with the final
+        `get_results()`, or {"t": "error"}; every message carries its "sid".
+
+        A new session goes to the least-loaded worker that is below
+        `max_sessions_per_worker`, and every later message for it goes to
+        that same worker. If a worker process dies, its sessions end with
+        an error result and a new worker takes its place (unless it died
+        before it ever reported, i.e. could not start). A client that falls
+        behind has deltas skipped and is resynchronised with a snapshot, as
+        with ObserverServer.
+        Sessions of a client that disconnects are kept for `linger` seconds
+        so the client can reattach.
+
+        Args:
+            host (str): Interface to bind.
+            port (int): TCP port; 0 picks a free one (see `self.port`).
+            workers (int): Worker processes (defaults to the CPU count).
+            max_sessions_per_worker (int): Per-worker session limit.
+            fps (int): Worker frame rate.
+            render (bool): Draw sessions off-screen in the workers.
+            observer_interval (float): Seconds between state messages.
+            linger (float): Seconds a detached session survives.
+            max_buffer (int): Per-client backlog in bytes before skipping.
+            max_line (int): Longest request line in bytes; a client that sends
+                a longer one gets an error and is disconnected.
+        """
+        self.host = host
+        self.port = port
+        self.n_workers = workers or os.cpu_count() or 1
+        self.max_sessions_per_worker = max_sessions_per_worker
+        self.fps = fps
+        self.render = render
+        self.observer_interval = observer_interval
+        self.linger = linger
+        self.max_buffer = max_buffer
+        self.max_line = max_line
+        self.routes = {}  # sid -> _Route
+        self.load = [0] * self.n_workers
+        self.worker_stats = [None] * self.n_workers
+        self._conns = [None] * self.n_workers  # None once a worker is gone for good
+        self._writers = [None] * self.n_workers
+        self._procs = [None] * self.n_workers
+        self._clients = {}  # writer -> handler task
+        self._server = None
+        self._loop = None
+        self._reaper = None
+        self._closing = False
+
+    # --------------------------------------------------------- lifecycle
+    async def serve(self):
+        """Start the workers and open the listening socket on the running loop."""
+        self._loop = asyncio.get_running_loop()
+        for i in range(self.n_workers):
+            self._spawn(i)
+        self._server = await asyncio.start_server(self._on_client, self.host, self.port, limit=self.max_line)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._reaper = asyncio.ensure_future(self._reap_detached())
+        return self
+
+    def _spawn(self, i):
+        ctx = multiprocessing.get_context("spawn")
+        parent, child = ctx.Pipe()
+        proc = ctx.Process(target=_worker_main, name=f"epass-worker-{i}", daemon=True,
+                           args=(i, child, self.max_sessions_per_worker, self.fps,
+                                 self.render, self.observer_interval))
+        proc.start()
+        child.close()
+        self._conns[i], self._procs[i] = parent, proc
+        self._writers[i] = _PipeWriter(parent, f"epass-router-{i}-writer")
+        self.load[i] = 0
+        self.worker_stats[i] = None
+        self._loop.add_reader(parent.fileno(), self._on_worker, i)
+
+    async def aclose(self):
+        self._closing = True
+        if self._server is not None:
+            self._server.close()
+        if self._reaper is not None:
+            self._reaper.cancel()
+        for writer in list(self._clients):
+            writer.close()
+        if self._clients:  # closing the writers ends their reads
+            await asyncio.wait(list(self._clients.values()), timeout=1)
+        live = [i for i, conn in enumerate(self._conns) if conn is not None]
+        for i in live:
+            self._loop.remove_reader(self._conns[i].fileno())
+            self._writers[i].send(("stop",))
+        for i in live:
+            await self._loop.run_in_executor(None, self._writers[i].close, 5)
+            proc = self._procs[i]
+            await self._loop.run_in_executor(None, proc.join, 5)
+            if proc.is_alive():
+                proc.terminate()
+            self._conns[i].close()
+
+    # ------------------------------------------------------------ routing
+    def _pick_worker(self):
+        candidates = [i for i in range(self.n_workers)
+                      if self._conns[i] is not None and self.load[i] < self.max_sessions_per_worker]
+        return min(candidates, key=lambda i: self.load[i]) if candidates else None
+
+    def _to_worker(self, worker, command):
+        self._writers[worker].send(command)
+
+    def _reply(self, writer, message):
+        if writer is not None and not writer.is_closing():
+            writer.write(_encode(message))
+
+    def _command(self, writer, request):
+        op = request.get("op")
+        sid = request.get("sid")
+        route = self.routes.get(sid) if isinstance(sid, str) else None
+        if op == "open":
+            subtask_id = request.get("task")
+            size = request.get("size") or (1124, 768)
+            try:
+                args = registry.get(subtask_id).args(request.get("args"))
+                if not _valid_size(size):
+                    raise ValueError(f"size must be [width, height], at most {MAX_SIZE} pixels each")
+            except (ValueError, TypeError) as exc:
+                self._reply(writer, {"t": "error", "sid": None, "error": str(exc)})
+                return
+            worker = self._pick_worker()
+            if worker is None:
+                self._reply(writer, {"t": "error", "sid": None, "error": "server full"})
+                return
+            sid = secrets.token_hex(8)
+            self.routes[sid] = _Route(worker, writer)
+            self.load[worker] += 1
+            self._to_worker(worker, ("open", sid, subtask_id, args, tuple(size)))
+        elif route is None or (route.writer is not writer and not (op == "attach" and route.writer is None)):
+            self._reply(writer, {"t": "error", "sid": sid, "error": "unknown session"})
+        elif op == "input":
+            events = request.get("events") or []
+            if not isinstance(events, list):
+                self._reply(writer, {"t": "error", "sid": sid, "error": "events must be a list"})
+                return
+            self._to_worker(route.worker, ("input", sid, events))
+        elif op == "attach":
+            route.writer, route.detached_at = writer, None
+            route.stale = True
+            self._to_worker(route.worker, ("resync", sid))
+        elif op == "close":
+            self._to_worker(route.worker, ("close", sid))
+        else:
+            self._reply(writer, {"t": "error", "sid": sid, "error": f"unknown op {op!r}"})
+
+    def _on_worker(self, worker):
+        conn = self._conns[worker]
+        try:
+            while conn.poll():
+                batch = conn.recv()
+                for kind, sid, payload in batch:
+                    self._from_worker(worker, kind, sid, payload)
+        except (EOFError, OSError):
+            self._worker_exited(worker)
+
+    def _worker_exited(self, worker):
+        """End the sessions routed to a worker that died, then replace it."""
+        self._loop.remove_reader(self._conns[worker].fileno())
+        self._writers[worker].close(timeout=0)  # its thread stops at the broken pipe
+        started = self.worker_stats[worker] is not None
+        self._conns[worker] = self._writers[worker] = None
+        for sid, route in list(self.routes.items()):
+            if route.worker != worker:
+                continue
+            self._release(sid)
+            if route.opened:
+                self._reply(route.writer, {"t": "end", "sid": sid,
+                                           "r": {"error": "worker exited", "end_reason": "error"}})
+            else:
+                self._reply(route.writer, {"t": "error", "sid": None, "error": "worker exited"})
+        self.load[worker] = 0
+        if started and not self._closing:
+            self._spawn(worker)
+
+    def _from_worker(self, worker, kind, sid, payload):
+        if kind == "stats":
+            self.worker_stats[worker] = payload
+            return
+        route = self.routes.get(sid)
+        if route is None:
+            return
+        if kind == "msg":
+            writer = route.writer
+            if writer is None or writer.is_closing():
+                return
+            if payload["t"] == "snap":
+                route.stale = False
+            elif route.stale:
+                return  # waiting for the resync snapshot
+            elif writer.transport.get_write_buffer_size() > self.max_buffer:
+                route.stale = True
+                self._to_worker(worker, ("resync", sid))
+                return
+            self._reply(writer, dict(payload, sid=sid))
+        elif kind == "opened":
+            route.opened = True
+            self._reply(route.writer, {"t": "opened", "sid": sid, **payload})
+        elif kind == "end":
+            self._release(sid)
+            self._reply(route.writer, {"t": "end", "sid": sid, "r": payload})
+        elif kind == "error":
+            if not route.opened:  # a session that crashes later still sends "end"
+                self._release(sid)
+            self._reply(route.writer, {"t": "error", "sid": sid if route.opened else None, "error": payload})
+
+    def _release(self, sid):
+        route = self.routes.pop(sid, None)
+        if route is not None:
+            self.load[route.worker] -= 1
+
+    async def _reap_detached(self):
+        while True:
+            await asyncio.sleep(min(1.0, self.linger))
+            now = time.monotonic()
+            for sid, route in list(self.routes.items()):
+                if route.detached_at is not None and now - route.detached_at > self.linger:
+                    route.detached_at = None  # close once
+                    self._to_worker(route.worker, ("close", sid))
+
+    async def _on_client(self, reader, writer):
+        self._clients[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # longer than max_line
+                    self._reply(writer, {"t": "error", "sid": None, "error": "request too long"})
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    self._reply(writer, {"t": "error", "sid": None, "error": "bad json"})
+                    continue
+                if not isinstance(request, dict):
+                    self._reply(writer, {"t": "error", "sid": None, "error": "expected a JSON object"})
+                    continue
+                if request.get("op") == "stats":
+                    self._reply(writer, {"t": "stats", "workers": self.worker_stats, "load": self.load})
+                    continue
+                self._command(writer, request)
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.pop(writer, None)
+            now = time.monotonic()
+            for route in self.routes.values():
+                if route.writer is writer:
+                    route.writer, route.detached_at = None, now
+            writer.close()
+
+
+# ---------------------------------------------------------------------------
+#  SessionClient – minimal client, used by the load test below
+# ---------------------------------------------------------------------------
+class SessionClient:
+    def __init__(self, host="127.0.0.1", port=0):
+        self.host = host
+        self.port = port
+        self.states = {}  # sid -> latest folded state
+        self.results = {}  # sid -> final results
+        self.errors = []
+        self.received_bytes = 0
+        self._reader = None
+        self._writer = None
+        self._opened = asyncio.Queue()
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        return self
+
+    def send(self, request):
+        self._writer.write(_encode(request))
+
+    async def open(self, subtask_id, args=None, size=(1124, 768)):
+        """Open a session and return its id."""
+        self.send({"op": "open", "task": subtask_id, "args": args or {}, "size": list(size)})
+        message = await self._opened.get()
+        if message["t"] == "error":
+            raise RuntimeError(message["error"])
+        return message["sid"]
+
+    def input(self, sid, events):
+        self.send({"op": "input", "sid": sid, "events": events})
+
+    async def run(self, on_update=None):
+        """Read until the server closes the connection."""
+        import state_delta
+
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+            self.received_bytes += len(line)
+            message = json.loads(line)
+            kind, sid = message["t"], message.get("sid")
+            if kind == "opened" or (kind == "error" and sid is None):
+                await self._opened.put(message)
+            elif kind == "snap":
+                self.states[sid] = message["s"]
+            elif kind == "d":
+                state_delta.apply(self.states.setdefault(sid, {}), message["d"])
+            elif kind == "end":
+                self.results[sid] = message["r"]
+            elif kind == "error":
+                self.errors.append(message)
+            if on_update:
+                on_update(message)
+
+    async def close(self):
+        self._writer.close()
+
+
+async def _load_test(clients, seconds, workers, per_worker):
+    """Open `clients` sessions, click and drag at random, report worker frame times."""
+    import random
+
+    server = await SessionServer(workers=workers, max_sessions_per_worker=per_worker).serve()
+    rng = random.Random(0)
+    client = await SessionClient(port=server.port).connect()
+    reader = asyncio.ensure_future(client.run())
+    ids = list(registry.REGISTRY)
+    sids = [await client.open(ids[i % len(ids)]) for i in range(clients)]
+    t_end = time.monotonic() + seconds
+    while time.monotonic() < t_end:
+        for sid in sids:
+            if sid in client.results:
+                continue
+            x, y = rng.randrange(1124), rng.randrange(768)
+            client.input(sid, [[1024, {"pos": [x, y], "rel": [1, 1], "buttons": [0, 0, 0]}]] +
+                         ([[1025, {"pos": [x, y], "button": 1}], [1026, {"pos": [x, y], "button": 1}]]
+                          if rng.random() < 0.05 else []))
+        await asyncio.sleep(0.05)
+    stats = [s for s in server.worker_stats if s]
+    for sid in sids:
+        if sid not in client.results:
+            client.send({"op": "close", "sid": sid})
+    await asyncio.sleep(0.5)
+    await client.close()
+    await server.aclose()
+    reader.cancel()
+    return {"clients": clients, "ended": len(client.results), "errors": len(client.errors),
+            "received_kb": round(client.received_bytes / 1024, 1), "workers": stats}
+
+
+if __name__ == "__main__":
+    # python session_server.py [PORT]          – serve until interrupted
+    # python session_server.py --load N SECS   – local load test
+    if len(sys.argv) > 1 and sys.argv[1] == "--load":
+        n = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+        secs = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+        print(asyncio.run(_load_test(n, secs, workers=None, per_worker=max(64, n))))
+    else:
+        async def _main():
+            server = await SessionServer(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8765).serve()
+            print(f"E-PASS session server on {server.host}:{server.port} with {server.n_workers} workers")
+            await asyncio.Event().wait()
+
+        asyncio.run(_main())
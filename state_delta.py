@@ -0,0 +1,70 @@
+import copy
+
+DELETED = "__del__"
+
+
+# ---------------------------------------------------------------------------
+#  State deltas – compact diffs between successive task state snapshots
+# ---------------------------------------------------------------------------
+def diff(old, new):
+    """
+    Return the changes that turn dict `old` into dict `new`.
+
+    Nested dicts are diffed recursively; keys that disappear are listed under
+    `DELETED`. Lists and scalars are replaced whole.
+
+    Returns:
+        dict: The delta, empty when nothing changed.
+    """
+    delta = {}
+    for key, value in new.items():
+        if key not in old:
+            delta[key] = value
+            continue
+        before = old[key]
+        if before == value:
+            continue
+        if isinstance(value, dict) and isinstance(before, dict):
+            sub = diff(before, value)
+            if sub:
+                delta[key] = sub
+        else:
+            delta[key] = value
+    removed = [key for key in old if key not in new]
+    if removed:
+        delta[DELETED] = removed
+    return delta
+
+
+def apply(state, delta):
+    """Apply `delta` to `state` in place and return it."""
+    for key in delta.get(DELETED, ()):
+        state.pop(key, None)
+    for key, value in delta.items():
+        if key == DELETED:
+            continue
+        if isinstance(value, dict) and isinstance(state.get(key), dict):
+            apply(state[key], value)
+        else:
+            state[key] = copy.deepcopy(value)
+    return state
+
+
+class StateTracker:
+    def __init__(self):
+        """Remember the last published snapshot and emit deltas against it."""
+        self.state = {}
+
+    def update(self, snapshot):
+        """
+        Args:
+            snapshot (dict): The task's current observable state; it is kept
+                by reference, so build a fresh one each call.
+
+        Returns:
+            dict: Delta since the previous call (empty if unchanged).
+        """
+        delta = diff(self.state, snapshot)
+        if delta:
+            self.state = snapshot
+        return delta
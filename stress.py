@@ -0,0 +1,209 @@
+import heapq
+import random
+import sys
+import time
+import traceback
+from collections import Counter
+
+import pygame
+
+import registry
+from layout import init_headless
+from scenarios import DEFAULT_WALLETS
+from synthetic_agents import FPS, SCREEN_SIZE
+from timing import SimulatedClock
+
+FRAME_BUDGET_MS = 1000 / FPS
+
+
+# ---------------------------------------------------------------------------
+#  Event storms
+# ---------------------------------------------------------------------------
+AREAS = ("pay_area", "payment_area", "guess_box", "change_box")
+ENDING_BUTTONS = ("submit_rect", "surrender_rect", "yes_btn", "no_btn", "surrender_btn", "submit_btn")
+
+
+def _targets(task, include_endings):
+    """Points worth hammering: every sprite, area and (optionally) button."""
+    points = []
+    for name in ("wallet_sprites", "sprites", "change_sprites"):
+        group = getattr(task, name, None)
+        if group is not None:
+            points.extend(s.rect.center for s in group)
+    for name in AREAS + (ENDING_BUTTONS if include_endings else ()):
+        rect = getattr(task, name, None)
+        if rect is not None:
+            points.append(rect.center)
+    return points
+
+
+def storm(task, rng, n, end_click_prob=0.05):
+    """
+    Build `n` random input events: clicks, drags and drops on real targets,
+    motion floods, and typing (digits, dots, junk, backspace, enter).
+    ESC and QUIT are left out, and Submit/Give Up/Yes/No are only in the
+    target set for a fraction `end_click_prob` of storms, so sessions live
+    long enough to reach the later cue levels.
+    """
+    w, h = task.screen.get_size()
+    targets = _targets(task, rng.random() < end_click_prob) or [(w // 2, h // 2)]
+    events = []
+    pos = rng.choice(targets)
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.25:
+            pos = rng.choice(targets) if rng.random() < 0.8 else (rng.randrange(-50, w + 50),
+                                                                   rng.randrange(-50, h + 50))
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=rng.choice((1, 1, 1, 3))))
+        elif roll < 0.45:
+            events.append(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=1))
+        elif roll < 0.85:
+            new = (pos[0] + rng.randint(-40, 40), pos[1] + rng.randint(-40, 40))
+            events.append(pygame.event.Event(pygame.MOUSEMOTION, pos=new, rel=(new[0] - pos[0], new[1] - pos[1]),
+                                             buttons=(rng.random() < 0.7, 0, 0), touch=False))
+            pos = new
+        else:
+            ch = rng.choice("0123456789....$-x ")
+            key = rng.choice((pygame.K_BACKSPACE, pygame.K_RETURN, pygame.K_KP_ENTER, ord(ch), ord(ch)))
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=key, unicode=ch if key == ord(ch) else "",
+                                             mod=0, scancode=0))
+    return events
+
+
+# ---------------------------------------------------------------------------
+#  Harness
+# ---------------------------------------------------------------------------
+class StressReport:
+    def __init__(self, task_id, top=10):
+        self.task_id = task_id
+        self.top = top
+        self.frame_ms = []
+        self.event_costs = []  # min-heap of (ms, seq, event description)
+        self.exceptions = Counter()
+        self.first_traceback = {}
+        self.cues = Counter()  # which cue levels the storms actually reached
+        self.sessions = 0
+        self.events = 0
+        self._seq = 0
+
+    def add_event_cost(self, ms, event):
+        self._seq += 1
+        item = (ms, self._seq, pygame.event.event_name(event.type))
+        if len(self.event_costs) < self.top:
+            heapq.heappush(self.event_costs, item)
+        elif ms > self.event_costs[0][0]:
+            heapq.heapreplace(self.event_costs, item)
+
+    def add_exception(self, exc):
+        frame = traceback.extract_tb(exc.__traceback__)[-1]
+        key = f"{type(exc).__name__}: {exc} @ {frame.filename.split('/')[-1]}:{frame.lineno}"
+        if key not in self.exceptions:
+            self.first_traceback[key] = "".join(traceback.format_exception(exc))
+        self.exceptions[key] += 1
+
+    def summary(self):
+        ordered = sorted(self.frame_ms)
+        n = len(ordered)
+
+        def pct(p):
+            return round(ordered[min(n - 1, int(n * p))], 3) if n else None
+
+        median = pct(0.5) or 0.0
+        return {
+            "task": self.task_id,
+            "sessions": self.sessions,
+            "frames": n,
+            "events": self.events,
+            "frame_ms": {"p50": median, "p95": pct(0.95), "p99": pct(0.99), "max": pct(1.0)},
+            "over_budget": sum(1 for ms in ordered if ms > FRAME_BUDGET_MS),
+            "cliffs": sum(1 for ms in ordered if median and ms > 10 * median),
+            "worst_events": [(round(ms, 3), name) for ms, _, name in sorted(self.event_costs, reverse=True)],
+            "cues": dict(self.cues),
+            "exceptions": dict(self.exceptions),
+        }
+
+
+def stress(task_id, seconds=120.0, max_events_per_frame=60, idle_prob=0.02, seed=0, render=True, variants=None):
+    """
+    Drive one subtask headless with random event storms on a virtual clock.
+
+    Storms are interleaved with idle stretches of 3–30 virtual seconds so the
+    cue ladder escalates under load too. A session that ends (or crashes) is
+    replaced by a fresh one until `seconds` of virtual time have passed.
+
+    Args:
+        task_id (str): "make_change_submit" or "incorrect_change".
+        seconds (float): Virtual time to cover.
+        max_events_per_frame (int): Upper bound of events injected per frame.
+        idle_prob (float): Chance per frame to start an idle stretch.
+        seed (int): Storm seed.
+        render (bool): Draw every frame (covers the render-only paths).
+        variants (list): Constructor kwargs cycled across sessions, e.g.
+            different wallets; None uses the task defaults.
+
+    Returns:
+        StressReport: Frame costs (real time), worst events, exceptions.
+    """
+    init_headless()
+    rng = random.Random(seed)
+    random.seed(seed)
+    report = StressReport(task_id)
+    clock = SimulatedClock()
+    end_ns = int(seconds * 1e9)
+    task = None
+    idle_until = 0
+
+    def timed(handler):
+        def wrapper(event):
+            t0 = time.perf_counter_ns()
+            handler(event)
+            report.add_event_cost((time.perf_counter_ns() - t0) / 1e6, event)
+        return wrapper
+
+    def retire(task):
+        task.timeline.frame_displayed(clock.now_ns())
+        report.cues.update(name for _, name in task.timeline.cues)
+
+    while clock.now_ns() < end_ns:
+        if task is not None and not task.running:
+            retire(task)
+        if task is None or not task.running:
+            kw = variants[report.sessions % len(variants)] if variants else {}
+            task = registry.create(task_id, pygame.Surface(SCREEN_SIZE), kw, clock=clock,
+                                   keep_motion_samples=False)
+            task._custom_event_handler = timed(task._custom_event_handler)
+            task.begin()
+            report.sessions += 1
+
+        now = clock.now_ns()
+        if now >= idle_until:
+            if rng.random() < idle_prob:
+                idle_until = now + int(rng.uniform(3, 30) * 1e9)
+            else:
+                events = storm(task, rng, rng.randint(0, max_events_per_frame))
+                report.events += len(events)
+                for event in events:
+                    task.input.inject(event)
+
+        t0 = time.perf_counter_ns()
+        try:
+            task.step(render=render)
+        except Exception as exc:
+            report.add_exception(exc)
+            retire(task)
+            task = None
+        report.frame_ms.append((time.perf_counter_ns() - t0) / 1e6)
+        clock.tick(FPS)
+    if task is not None:
+        retire(task)
+    return report
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 120.0
+    wallets = [{"wallet": {cents / 100: n for cents, n in w.items()}} for w in DEFAULT_WALLETS]
+    for tid, variants in (("make_change_submit", wallets), ("incorrect_change", None)):
+        rep = stress(tid, seconds=seconds, variants=variants)
+        print(rep.summary())
+        for key, tb in rep.first_traceback.items():
+            print(f"--- {key}\n{tb}")
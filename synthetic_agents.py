@@ -0,0 +1,332 @@
+import itertools
+import math
+import random
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+
+import pygame
+
+import registry
+from layout import init_headless
+from scenarios import scenario_args
+from timing import SimulatedClock
+
+SCREEN_SIZE = (1124, 768)
+FPS = 60
+
+
+# ---------------------------------------------------------------------------
+#  Agent parameters
+# ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class AgentParams:
+    think_time: float = 1.5  # mean seconds between decisions
+    error_prob: float = 0.05  # chance any single decision is wrong
+    motor_noise: float = 8.0  # std-dev in px of grab and drop positions
+    persistence: float = 60.0  # seconds before the agent presses Give Up
+
+
+def _mouse_down(pos):
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=1)
+
+
+def _mouse_up(pos):
+    return pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=1)
+
+
+def _mouse_move(pos, rel, buttons=(1, 0, 0)):
+    return pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=rel, buttons=buttons, touch=False)
+
+
+def _key(key, char=""):
+    return pygame.event.Event(pygame.KEYDOWN, key=key, unicode=char, mod=0, scancode=0)
+
+
+# ---------------------------------------------------------------------------
+#  SyntheticAgent – scheduled pointer/keyboard actions with human-like noise
+# ---------------------------------------------------------------------------
+class SyntheticAgent:
+    def __init__(self, params: AgentParams, rng: random.Random):
+        """
+        Base class for simulated users.
+
+        Subclasses implement `_decide(task, t)`, which schedules the events
+        for one action; the agent then waits out the action plus a sampled
+        think time before deciding again.
+        """
+        self.params = params
+        self.rng = rng
+        self._queue = deque()  # (t_sec, event), ordered by time
+        self._next_decision = None
+        self._t0 = None
+
+    def events_for(self, task, t):
+        """
+        Return the events the agent produces up to task time `t` (seconds).
+        """
+        if self._t0 is None:
+            self._t0 = t
+            self._next_decision = t + self._think()
+        if not self._queue and t >= self._next_decision:
+            self._decide(task, t)
+        out = []
+        while self._queue and self._queue[0][0] <= t:
+            out.append(self._queue.popleft()[1])
+        return out
+
+    def _decide(self, task, t):
+        raise NotImplementedError
+
+    def _out_of_patience(self, t):
+        return t - self._t0 >= self.params.persistence
+
+    # ------------------------------------------------------------- motor
+    def _think(self):
+        mean = max(self.params.think_time, 1e-3)
+        return self.rng.gammavariate(2.0, mean / 2.0)
+
+    def _jitter(self, pos):
+        sigma = self.params.motor_noise
+        return (int(round(pos[0] + self.rng.gauss(0, sigma))),
+                int(round(pos[1] + self.rng.gauss(0, sigma))))
+
+    def _schedule(self, t, event):
+        self._queue.append((t, event))
+
+    def _click(self, t, pos):
+        pos = self._jitter(pos)
+        self._schedule(t, _mouse_down(pos))
+        self._schedule(t + 0.08, _mouse_up(pos))
+        self._next_decision = t + 0.08 + self._think()
+
+    def _drag(self, t, start, end):
+        start, end = self._jitter(start), self._jitter(end)
+        dist = math.hypot(end[0] - start[0], end[1] - start[1])
+        duration = 0.25 + dist / 1200.0  # rough Fitts-style movement time
+        steps = max(2, int(duration * 120))  # 120 Hz pointer samples
+
+        self._schedule(t, _mouse_down(start))
+        prev = start
+        for i in range(1, steps + 1):
+            f = i / steps
+            f = f * f * (3 - 2 * f)  # smooth start and stop
+            pos = (int(round(start[0] + (end[0] - start[0]) * f)),
+                   int(round(start[1] + (end[1] - start[1]) * f)))
+            self._schedule(t + duration * i / steps, _mouse_move(pos, (pos[0] - prev[0], pos[1] - prev[1])))
+            prev = pos
+        self._schedule(t + duration + 0.05, _mouse_up(end))
+        self._next_decision = t + duration + 0.05 + self._think()
+
+    def _type(self, t, text, clear=0):
+        for _ in range(clear):
+            self._schedule(t, _key(pygame.K_BACKSPACE))
+            t += 0.12
+        for ch in text:
+            self._schedule(t, _key(ord(ch), ch))
+            t += 0.12 + self.rng.random() * 0.1
+        self._schedule(t, _key(pygame.K_RETURN, "\r"))
+        self._next_decision = t + self._think()
+
+
+class MakeChangeAgent(SyntheticAgent):
+    """Pays for the receipt coin by coin, then presses Submit or Give Up."""
+
+    def _decide(self, task, t):
+        if self._out_of_patience(t):
+            self._click(t, task.surrender_rect.center)
+            return
+
+        remaining = round(task.total - task.payment_total, 2)
+        if abs(remaining) < 0.005:
+            self._click(t, task.submit_rect.center)
+            return
+
+        if remaining < 0:
+            # overpaid: take the smallest coin back out of the pay area
+            paid = [s for s in task.wallet_sprites if s.in_pay_area]
+            spr = min(paid, key=lambda s: s.value)
+            self._drag(t, spr.rect.center, spr.initial_pos or spr.rect.topleft)
+            return
+
+        loose = [s for s in task.wallet_sprites if not s.in_pay_area]
+        fitting = [s for s in loose if s.value <= remaining + 1e-9]
+        if not fitting:
+            self._click(t, task.submit_rect.center)
+            return
+        if self.rng.random() < self.params.error_prob:
+            spr = self.rng.choice(loose)
+        else:
+            best = max(s.value for s in fitting)
+            spr = self.rng.choice([s for s in fitting if s.value == best])
+        self._drag(t, spr.rect.center, task.pay_area.center)
+
+
+class IncorrectChangeAgent(SyntheticAgent):
+    """Hands over the $5, checks the change, answers and types a correction."""
+
+    def _decide(self, task, t):
+        if task.phase == 1:
+            bill = task.sprites.sprites()[0]
+            self._drag(t, bill.rect.center, task.payment_area.center)
+            return
+
+        if self._out_of_patience(t):
+            self._click(t, task.surrender_btn.center)
+            return
+
+        due = round(task.payment_amount - task.price, 2)
+        if task.collect_guess:
+            text = f"{due:.2f}"
+            if self.rng.random() < self.params.error_prob:
+                i = self.rng.choice([i for i, ch in enumerate(text) if ch.isdigit()])
+                text = text[:i] + str(self.rng.randrange(10)) + text[i + 1:]
+            self._type(t, text, clear=len(task.user_guess))
+            return
+
+        shown = round(sum(s.value for s in task.change_sprites), 2)
+        says_correct = (shown == due) != (self.rng.random() < self.params.error_prob)
+        self._click(t, task.yes_btn.center if says_correct else task.no_btn.center)
+
+
+# ---------------------------------------------------------------------------
+#  Headless driver
+# ---------------------------------------------------------------------------
+def _make_task(task_id, screen, clock, args=None, **config):
+    config.setdefault("keep_motion_samples", bool(config.get("trace")))
+    return registry.create(task_id, screen, args, clock=clock, **config)
+
+
+AGENTS = {
+    "make_change_submit": MakeChangeAgent,
+    "incorrect_change": IncorrectChangeAgent,
+}
+
+
+def simulate(task_id, params: AgentParams, seed=0, max_seconds=600.0, render=False,
+             screen_size=SCREEN_SIZE, **config):
+    """
+    Run one synthetic session on a virtual clock.
+
+    Args:
+        task_id (str): "make_change_submit" or "incorrect_change".
+        params (AgentParams): Agent behaviour.
+        seed (int): Seeds both the task (receipt, change) and the agent.
+        max_seconds (float): Virtual-time cap for sessions that never end.
+        render (bool): Draw every frame (slower; useful for debugging).
+        screen_size (tuple): Size of the off-screen surface.
+        **config: Extra task configuration (e.g. memprobe).
+
+    Returns:
+        dict: The task's `get_results()`.
+    """
+    init_headless()
+    random.seed(seed)
+    clock = SimulatedClock()
+    task = _make_task(task_id, pygame.Surface(screen_size), clock, **config)
+    agent = AGENTS[task_id](params, random.Random(seed ^ 0x5EED))
+
+    limit_ns = int(max_seconds * 1e9)
+    task.begin()
+    while task.running and clock.now_ns() < limit_ns:
+        t = task.now()
+        for event in agent.events_for(task, t):
+            task.input.inject(event)
+        task.step(render=render)
+        clock.tick(FPS)
+    task.finish()
+    return task.get_results()
+
+
+# ---------------------------------------------------------------------------
+#  Parameter sweeps
+# ---------------------------------------------------------------------------
+def _run_cell(task_id, params_dict, seeds, scenario=None):
+    scores = {"independence": Counter(), "quality": Counter(), "process": Counter()}
+    successes = 0
+    durations = []
+    failures = Counter()
+    for seed in seeds:
+        try:
+            args = scenario_args(task_id, scenario, seed) if scenario else None
+            r = simulate(task_id, AgentParams(**params_dict), seed=seed, args=args)
+        except Exception as exc:  # a crash is a finding, not the end of the sweep
+            failures[f"{type(exc).__name__}: {exc}"] += 1
+            continue
+        scores["independence"][r.get("independence_score")] += 1
+        scores["quality"][r.get("quality_score")] += 1
+        scores["process"][r.get("process_score")] += 1
+        successes += bool(r.get("success"))
+        durations.append(r.get("duration_sec") or 0.0)
+    return params_dict, scores, successes, durations, failures
+
+
+def sweep(task_id, grid, sessions_per_cell=100, workers=None, seed=0, chunk=25, scenario=None):
+    """
+    Fan a parameter grid out over a process pool and aggregate scores.
+
+    Args:
+        task_id (str): Subtask to drive.
+        grid (dict): AgentParams field -> list of values; missing fields use
+            the defaults.
+        sessions_per_cell (int): Sessions simulated for every grid point.
+        workers (int): Process count (defaults to the CPU count).
+        seed (int): Base seed; session seeds are derived deterministically.
+        chunk (int): Sessions per job sent to a worker.
+        scenario (str): Difficulty band; every session then runs the indexed
+            scenario its seed picks (see `scenarios.scenario_args`).
+
+    Returns:
+        list: One dict per grid point with its parameters, score
+        distributions, success rate, mean duration and crash counts.
+    """
+    keys = sorted(grid)
+    cells = [dict(zip(keys, values)) for values in itertools.product(*(grid[k] for k in keys))]
+    defaults = asdict(AgentParams())
+
+    jobs = []
+    for ci, cell in enumerate(cells):
+        params = {**defaults, **cell}
+        seeds = [seed * 1_000_003 + ci * sessions_per_cell + i for i in range(sessions_per_cell)]
+        for i in range(0, len(seeds), chunk):
+            jobs.append((ci, params, seeds[i:i + chunk]))
+
+    agg = [{"params": {**defaults, **cell}, "sessions": 0, "independence": Counter(),
+            "quality": Counter(), "process": Counter(), "successes": 0,
+            "duration_total": 0.0, "failures": Counter()} for cell in cells]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_headless) as pool:
+        futures = [(ci, pool.submit(_run_cell, task_id, params, seeds, scenario)) for ci, params, seeds in jobs]
+        for ci, fut in futures:
+            _, scores, successes, durations, failures = fut.result()
+            a = agg[ci]
+            a["sessions"] += len(durations)
+            for name in ("independence", "quality", "process"):
+                a[name].update(scores[name])
+            a["successes"] += successes
+            a["duration_total"] += sum(durations)
+            a["failures"].update(failures)
+
+    out = []
+    for a in agg:
+        n = a.pop("sessions")
+        total = a.pop("duration_total")
+        successes = a.pop("successes")
+        out.append({
+            **a,
+            "sessions": n,
+            "success_rate": successes / n if n else None,
+            "mean_duration_sec": total / n if n else None,
+            "independence": dict(a["independence"]),
+            "quality": dict(a["quality"]),
+            "process": dict(a["process"]),
+            "failures": dict(a["failures"]),
+        })
+    return out
+
+
+if __name__ == "__main__":
+    grid = {"think_time": [1.0, 4.0, 8.0], "error_prob": [0.0, 0.2]}
+    for task_id in AGENTS:
+        for row in sweep(task_id, grid, sessions_per_cell=20):
+            print(task_id, row)
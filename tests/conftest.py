@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The modules live at the repository root, not in a package; pygame runs
+# headless for the tests that start a task.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
@@ -0,0 +1,114 @@
+import json
+import random
+
+import pygame
+import pytest
+
+import checkpoint
+import registry
+from checkpoint import CheckpointJournal
+from synthetic_agents import AGENTS, FPS, AgentParams
+from timing import SimulatedClock
+
+SIZE = (1124, 768)
+HEADER = {"task": "incorrect_change", "args": {"price": 1.29}, "size": list(SIZE), "scoring": "1"}
+
+
+@pytest.fixture(scope="module")
+def screen():
+    pygame.init()
+    yield pygame.display.set_mode(SIZE)
+    pygame.quit()
+
+
+def write_journal(path, states, compact_every=1000, final=None):
+    journal = CheckpointJournal(path, compact_every=compact_every, fsync=False)
+    journal.open(HEADER, states[0])
+    tracker = checkpoint.state_delta.StateTracker()
+    tracker.update(states[0])
+    for state in states[1:]:
+        journal.record(tracker.update(state))
+    journal.close(final=final)
+
+
+STATES = [{"phase": 1, "errors": 0, "sprites": {}},
+          {"phase": 1, "errors": 1, "sprites": {}},
+          {"phase": 2, "errors": 1, "sprites": {"c0": [1.0, 5, 5]}},
+          {"phase": 2, "errors": 1, "sprites": {"c0": [1.0, 9, 5], "c1": [0.25, 1, 1]}}]
+
+
+@pytest.mark.parametrize("compact_every", [1000, 2])
+def test_load_folds_the_journal_back_to_the_last_state(tmp_path, compact_every):
+    path = str(tmp_path / "session.ckpt")
+    write_journal(path, STATES, compact_every=compact_every, final={"success": True})
+    header, state, finished = checkpoint.load(path)
+    assert {k: header[k] for k in HEADER} == HEADER
+    assert state == STATES[-1]
+    assert finished == {"success": True}
+
+
+def test_load_ignores_a_torn_last_line(tmp_path):
+    path = str(tmp_path / "session.ckpt")
+    write_journal(path, STATES)
+    with open(path, "rb") as f:
+        lines = f.readlines()
+    with open(path, "wb") as f:
+        f.writelines(lines[:-1])
+        f.write(lines[-1][:len(lines[-1]) // 2])  # the process died halfway through the last delta
+    header, state, finished = checkpoint.load(path)
+    assert state == STATES[-2]
+    assert finished is None
+
+
+def test_load_rejects_a_file_without_a_header(tmp_path):
+    path = tmp_path / "other.jsonl"
+    path.write_text(json.dumps({"t": "d", "d": {}}) + "\n")
+    with pytest.raises(ValueError):
+        checkpoint.load(str(path))
+
+
+@pytest.mark.parametrize("task_id, clicks", [("make_change_submit", 4), ("make_change_submit", 12),
+                                             ("incorrect_change", 1), ("incorrect_change", 3)])
+def test_resume_restores_a_session_in_progress(screen, tmp_path, task_id, clicks):
+    path = str(tmp_path / "session.ckpt")
+    random.seed(3)
+    clock = SimulatedClock()
+    task = registry.create(task_id, screen, clock=clock, checkpoint=path)
+    agent = AGENTS[task_id](AgentParams(think_time=1.0, error_prob=0.3), random.Random(3))
+    task.begin()
+    while task.running and clicks:
+        for event in agent.events_for(task, task.now()):
+            clicks -= event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP)
+            task.input.inject(event)
+        task.step(render=False)
+        clock.tick(FPS)
+    assert task.running, "the session should still be in progress"
+    task.checkpoint.close()  # flush, as a crash right after the last write would leave it
+    expected = json.loads(json.dumps(task.checkpoint_state()))
+
+    _, state, finished = checkpoint.load(path)
+    assert state == expected and finished is None
+    resumed = checkpoint.resume(path, pygame.Surface(SIZE), clock=SimulatedClock())
+    assert resumed.init_args == task.init_args
+    assert json.loads(json.dumps(resumed.checkpoint_state())) == expected
+
+
+def sprite_places(task):
+    return sorted((spr.slot, spr.home, spr.value) for spr in task.wallet_sprites)
+
+
+def test_resume_keeps_swapped_sprites_homes(screen, tmp_path):
+    path = str(tmp_path / "session.ckpt")
+    task = registry.create("make_change_submit", screen, {"wallet": {1.0: 2, 0.25: 2}},
+                           clock=SimulatedClock(), checkpoint=path)
+    task.begin()
+    task.step(render=False)
+    first, last = task.wallet_sprites.sprites()[0], task.wallet_sprites.sprites()[-1]
+    task.swap_sprite_positions(first, last)  # what a cue does
+    task.step(render=False)
+    task.checkpoint.close()
+
+    resumed = checkpoint.resume(path, pygame.Surface(SIZE), clock=SimulatedClock())
+    assert sprite_places(resumed) == sprite_places(task)
+    resumed.restart()
+    assert all(spr.slot == spr.home for spr in resumed.wallet_sprites)
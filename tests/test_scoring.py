@@ -0,0 +1,83 @@
+import pytest
+
+import scoring
+
+# Version 1 must score exactly as the subtasks did before the rules moved
+# into scoring.py; these are the tiers of that code.
+V1 = scoring.get("1")
+
+
+def make_change(end="submit", cue=0, target=5.00, paid=5.00):
+    return V1.score("make_change_submit", {"end": end, "cue": cue, "target": target, "paid": paid})
+
+
+def incorrect_change(end="answer", success=True, cue=0, errors=0, correct=True, shown=3.75, due=3.75,
+                     guessing=False):
+    return V1.score("incorrect_change", {"end": end, "success": success, "cue": cue, "errors": errors,
+                                         "correct": correct, "shown": shown, "due": due,
+                                         "guessing": guessing})
+
+
+def scores(independence, quality, process):
+    return {"independence_score": independence, "quality_score": quality, "process_score": process}
+
+
+def test_version_1_is_the_default():
+    assert scoring.CURRENT == "1"
+    assert scoring.get() is V1
+
+
+@pytest.mark.parametrize("kwargs, expected", [
+    ({}, scores(0, 3, 3)),
+    ({"cue": 2, "paid": 4.50}, scores(2, 2, 3)),
+    ({"cue": 3, "paid": 4.00}, scores(3, 1, 2)),
+    ({"cue": 4, "paid": 4.00}, scores(4, 1, 2)),
+    ({"cue": 5, "paid": 2.00}, scores(5, 0, 1)),
+    ({"cue": 6, "end": "timeout", "paid": 0.00}, scores(6, 0, 1)),
+    ({"end": "surrender", "cue": 2, "paid": 3.60}, scores(7, 1, 0)),
+    ({"end": "surrender", "paid": 3.00}, scores(8, 1, 0)),
+    ({"end": "surrender", "paid": 1.00}, scores(9, 0, 0)),
+])
+def test_make_change_v1(kwargs, expected):
+    assert make_change(**kwargs) == expected
+
+
+@pytest.mark.parametrize("kwargs, expected", [
+    # quality comes from the change due, not from the change shown
+    ({}, scores(0, 0, 0)),
+    ({"shown": 0.30, "due": 0.05}, scores(0, 2, 0)),
+    ({"shown": 0.05, "due": 0.30}, scores(0, 1, 0)),
+    # a success scores process 0 unless there were more than two errors
+    ({"errors": 2}, scores(0, 0, 0)),
+    ({"errors": 3}, scores(0, 0, 2)),
+    ({"errors": 4}, scores(0, 0, 1)),
+    ({"errors": 5}, scores(0, 0, 0)),
+    ({"success": False, "errors": 3, "cue": 4}, scores(4, 0, 0)),
+    # surrender tiers
+    ({"end": "surrender", "success": False}, scores(9, 0, 0)),
+    ({"end": "surrender", "success": False, "correct": False, "due": 1.00}, scores(7, 0, 0)),
+    ({"end": "surrender", "success": False, "correct": False, "due": 1.50}, scores(8, 0, 0)),
+    # ... which giving up while typing the correct change did not apply
+    ({"end": "surrender", "success": False, "correct": False, "guessing": True, "cue": 2}, scores(2, 0, 0)),
+])
+def test_incorrect_change_v1(kwargs, expected):
+    assert incorrect_change(**kwargs) == expected
+
+
+def test_v1_ladders():
+    assert V1.ladder("make_change_submit") == (3, 5, 5, 5, 5, 5)
+    assert V1.ladder("incorrect_change") == (5, 3, 3, 3, 3, 3)
+
+
+@pytest.mark.parametrize("task_id", ["make_change_submit", "incorrect_change"])
+def test_rescoring_a_recorded_session_reproduces_its_scores(tmp_path, task_id):
+    from synthetic_agents import AgentParams, simulate
+
+    for seed in range(4):
+        path = str(tmp_path / f"{task_id}-{seed}.jsonl")
+        recorded = simulate(task_id, AgentParams(think_time=2.0, error_prob=0.3, persistence=30.0), seed=seed,
+                            max_seconds=180.0, record=path)
+        for replay in (False, True):
+            row = scoring.rescore_log(path, "1", replay=replay)
+            assert row["method"] == ("replay" if replay else "facts")
+            assert {k: row[k] for k in scoring.SCORES} == {k: recorded[k] for k in scoring.SCORES}
@@ -0,0 +1,52 @@
+import copy
+
+import pytest
+
+import state_delta
+from state_delta import DELETED, StateTracker
+
+OLD = {"size": [1124, 768], "phase": 1, "end": None,
+       "sprites": {"0": [1.0, 10, 20], "1": [0.25, 30, 40], "2": [0.1, 50, 60]},
+       "areas": {"pay": [0, 0, 100, 50], "nested": {"a": 1, "b": 2}}}
+
+
+@pytest.mark.parametrize("new", [
+    OLD,
+    {**OLD, "phase": 2},
+    {**OLD, "end": "submit", "paid": 1.25},
+    {**OLD, "sprites": {"0": [1.0, 99, 20], "2": [0.1, 50, 60], "3": [0.05, 1, 1]}},
+    {**OLD, "areas": {"pay": [0, 0, 100, 50], "nested": {"a": 1}}},
+    {**OLD, "areas": [1, 2, 3]},  # a dict replaced by a list
+    {"size": [800, 600]},
+    {},
+])
+def test_apply_of_diff_reproduces_the_new_state(new):
+    delta = state_delta.diff(OLD, new)
+    assert state_delta.apply(copy.deepcopy(OLD), delta) == new
+    assert (delta == {}) == (new == OLD)
+
+
+def test_only_changes_are_in_the_delta():
+    new = copy.deepcopy(OLD)
+    new["sprites"]["1"] = [0.25, 31, 40]
+    del new["areas"]["nested"]["b"]
+    assert state_delta.diff(OLD, new) == {"sprites": {"1": [0.25, 31, 40]},
+                                          "areas": {"nested": {DELETED: ["b"]}}}
+
+
+def test_applied_values_do_not_alias_the_delta():
+    state = copy.deepcopy(OLD)
+    delta = {"sprites": {"0": [5.0, 1, 1]}}
+    state_delta.apply(state, delta)
+    delta["sprites"]["0"].append("changed later")
+    assert state["sprites"]["0"] == [5.0, 1, 1]
+
+
+def test_tracker_folds_back_to_the_latest_snapshot():
+    snapshots = [OLD, {**OLD, "phase": 2}, {**OLD, "phase": 2}, {"size": [800, 600], "end": "timeout"}]
+    tracker, folded = StateTracker(), {}
+    deltas = [tracker.update(copy.deepcopy(s)) for s in snapshots]
+    for delta in deltas:
+        state_delta.apply(folded, delta)
+    assert folded == snapshots[-1]
+    assert deltas[2] == {}  # nothing changed, nothing to write
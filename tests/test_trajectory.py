@@ -0,0 +1,88 @@
+import io
+import math
+import random
+
+import pytest
+
+import trajectory
+from trajectory import DRAG, HOVER, Segment, TraceReader
+
+UNIT = 100_000  # the default 0.1 ms time unit
+
+
+def random_segments(seed, n=12, unit=UNIT):
+    """Segments with times on the time grid, so the encoding is exact."""
+    rng = random.Random(seed)
+    t, segs = 0, []
+    for i in range(n):
+        t += rng.randrange(1, 50_000) * unit
+        points = []
+        for _ in range(rng.choice((0, 1, 2, 40, 300))):
+            t += rng.randrange(0, 200) * unit
+            points.append((t, rng.randrange(-5000, 5000), rng.randrange(-5000, 5000)))
+        segs.append(Segment(DRAG if i % 2 else HOVER, points))
+    return segs
+
+
+def as_tuples(segs):
+    return [(seg.kind, seg.points) for seg in segs]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_decode_of_encode_is_exact_on_the_time_grid(seed):
+    segs = random_segments(seed)
+    data = trajectory.encode(segs)
+    assert as_tuples(trajectory.decode(data)) == as_tuples(segs)
+    assert as_tuples(trajectory.iter_decode(io.BytesIO(data))) == as_tuples(segs)
+
+
+def test_times_are_rounded_to_the_time_unit():
+    points = [(123_456_789, 1, 2), (123_500_001, 3, 4), (999_999_999_999, -7, 8)]
+    decoded = trajectory.decode(trajectory.encode([Segment(DRAG, points)], time_unit_ns=1_000_000))
+    for (t, x, y), (dt, dx, dy) in zip(points, decoded[0].points):
+        assert abs(t - dt) <= 500_000 and (x, y) == (dx, dy)
+
+
+def test_reader_gives_random_access_to_every_segment():
+    segs = random_segments(7)
+    reader = TraceReader(trajectory.encode(segs))
+    assert len(reader) == len(segs)
+    for i in reversed(range(len(segs))):
+        assert (reader[i].kind, reader[i].points) == (segs[i].kind, segs[i].points)
+        if segs[i].points:
+            assert reader.start_ns(i) == segs[i].points[0][0]
+    assert as_tuples(reader) == as_tuples(segs)
+
+
+def test_simplified_trace_keeps_ends_and_stays_within_epsilon():
+    points = [(i * UNIT * 80, int(300 * math.cos(i / 20)), int(200 * math.sin(i / 13))) for i in range(400)]
+    kept = trajectory.decode(trajectory.encode([Segment(DRAG, points)], epsilon=2.0))[0].points
+    assert kept[0] == points[0] and kept[-1] == points[-1]
+    assert set(kept) <= set(points) and len(kept) < len(points)
+    for t, x, y in points:  # where the simplified path has the pointer at t
+        (t0, x0, y0), (t1, x1, y1) = next((a, b) for a, b in zip(kept, kept[1:]) if a[0] <= t <= b[0])
+        f = (t - t0) / (t1 - t0) if t1 > t0 else 0.0
+        assert math.hypot(x - (x0 + f * (x1 - x0)), y - (y0 + f * (y1 - y0))) <= 2.0 + 1e-9
+
+
+def test_truncated_and_foreign_data_are_rejected():
+    data = trajectory.encode(random_segments(1))
+    with pytest.raises(EOFError):
+        trajectory.decode(data[:len(data) // 2])
+    with pytest.raises(ValueError):
+        trajectory.decode(b"JUNK" + data[4:])
+    with pytest.raises(ValueError):
+        TraceReader(data[:-1] + b"X")
+
+
+def test_saved_samples_load_back_as_their_drags(tmp_path):
+    start = 5_000_000_000
+    samples = [(start + i * UNIT * 10, 100 + i, 200 - i, (1, 0, 0) if 10 <= i < 30 else (0, 0, 0))
+               for i in range(50)]
+    path = str(tmp_path / "session.ept")
+    size = trajectory.save(path, samples, start_ns=start)
+    reader = trajectory.load(path)
+    assert len(reader.data) == size
+    assert as_tuples(reader) == [(DRAG, [(t - start, x, y) for t, x, y, b in samples if b[0]])]
+    trajectory.save(path, samples, start_ns=start, hover=True)
+    assert [seg.kind for seg in trajectory.load(path)] == [HOVER, DRAG, HOVER]
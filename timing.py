@@ -0,0 +1,237 @@
+import asyncio
+import time
+
+import pygame
+
+
+# ---------------------------------------------------------------------------
+#  Frame clocks – one monotonic nanosecond source per task
+# ---------------------------------------------------------------------------
+class FrameClock:
+    def __init__(self):
+        """
+        Default task clock: Pygame frame pacing, monotonic timestamps.
+
+        Mirrors the `pygame.time.Clock` calls the tasks use (`tick`,
+        `get_time`, `get_fps`) and adds `now_ns()` so every duration in a task
+        comes from the same monotonic source instead of `time.time()` or
+        `pygame.time.get_ticks()`.
+        """
+        self.reset()
+
+    def reset(self):
+        """Start frame timing afresh so set-up time is not counted as a frame."""
+        self._clock = pygame.time.Clock()
+        self._deadline = time.monotonic_ns()
+
+    def now_ns(self):
+        return time.monotonic_ns()
+
+    def tick(self, framerate=0):
+        return self._clock.tick(framerate)
+
+    async def tick_async(self, framerate=0):
+        """Like `tick`, but await the frame deadline instead of blocking."""
+        # pygame's Clock can only block, so pace against our own deadline and
+        # let it merely measure the frame.
+        if framerate:
+            now = time.monotonic_ns()
+            self._deadline = max(self._deadline + int(1e9 / framerate), now)
+            await asyncio.sleep((self._deadline - now) / 1e9)
+        else:
+            await asyncio.sleep(0)
+        return self._clock.tick()
+
+    def get_time(self):
+        return self._clock.get_time()
+
+    def get_fps(self):
+        return self._clock.get_fps()
+
+
+class PrecisionClock:
+    def __init__(self, busy_wait=False, spin_ns=2_000_000, on_spin=None):
+        """
+        High-resolution task clock driven by `time.perf_counter_ns`.
+
+        Frames are paced against absolute deadlines, so sleep overshoot in one
+        frame does not accumulate. With `busy_wait` the clock sleeps until
+        `spin_ns` before the deadline and spins for the rest, calling
+        `on_spin()` on every pass; the task uses that to drain input while it
+        waits, so events are stamped within a fraction of a millisecond of
+        arriving rather than at the start of the next frame.
+
+        Args:
+            busy_wait (bool): Spin for the last `spin_ns` of every frame.
+            spin_ns (int): Length of the spin window in nanoseconds.
+            on_spin (callable): Optional hook called while spinning.
+        """
+        self.busy_wait = busy_wait
+        self.spin_ns = spin_ns
+        self.on_spin = on_spin
+        self.reset()
+
+    def reset(self):
+        """Start frame timing afresh so set-up time is not counted as a frame."""
+        self._last = time.perf_counter_ns()
+        self._deadline = self._last
+        self._frame_ms = 0.0
+        self._fps_window = []
+
+    def now_ns(self):
+        return time.perf_counter_ns()
+
+    def tick(self, framerate=0):
+        """
+        Wait for the next frame deadline.
+
+        Returns:
+            float: Milliseconds since the previous tick.
+        """
+        if framerate:
+            period = int(1e9 / framerate)
+            self._deadline = max(self._deadline + period, self._last)
+            self._wait_until(self._deadline)
+        return self._advance(framerate)
+
+    async def tick_async(self, framerate=0):
+        """
+        Like `tick`, but await the frame deadline so other coroutines run in
+        the gap. Busy-waiting is skipped here: spinning would starve them.
+        """
+        if framerate:
+            period = int(1e9 / framerate)
+            self._deadline = max(self._deadline + period, self._last)
+            remaining = self._deadline - time.perf_counter_ns()
+            await asyncio.sleep(max(remaining, 0) / 1e9)
+        else:
+            await asyncio.sleep(0)
+        return self._advance(framerate)
+
+    def _advance(self, framerate):
+        now = time.perf_counter_ns()
+        if not framerate:
+            self._deadline = now
+        self._frame_ms = (now - self._last) / 1e6
+        self._last = now
+
+        self._fps_window.append(self._frame_ms)
+        if len(self._fps_window) > 10:
+            del self._fps_window[0]
+        return self._frame_ms
+
+    def _wait_until(self, deadline):
+        remaining = deadline - time.perf_counter_ns()
+        if not self.busy_wait:
+            if remaining > 0:
+                time.sleep(remaining / 1e9)
+            return
+        if remaining > self.spin_ns:
+            time.sleep((remaining - self.spin_ns) / 1e9)
+        while time.perf_counter_ns() < deadline:
+            if self.on_spin:
+                self.on_spin()
+
+    def get_time(self):
+        return self._frame_ms
+
+    def get_fps(self):
+        total = sum(self._fps_window)
+        return 1000.0 * len(self._fps_window) / total if total else 0.0
+
+
+class SimulatedClock:
+    def __init__(self, start_ns=0):
+        """
+        Virtual task clock for headless drivers.
+
+        `tick(framerate)` advances time by exactly one frame period and returns
+        immediately, so synthetic sessions run as fast as the CPU allows while
+        the task still sees realistic frame deltas.
+        """
+        self._now = start_ns
+        self._frame_ms = 0.0
+        self._fps = 0.0
+
+    def reset(self):
+        self._frame_ms = 0.0
+
+    def now_ns(self):
+        return self._now
+
+    def tick(self, framerate=0):
+        period = int(1e9 / framerate) if framerate else 0
+        self._now += period
+        self._frame_ms = period / 1e6
+        self._fps = float(framerate)
+        return self._frame_ms
+
+    async def tick_async(self, framerate=0):
+        await asyncio.sleep(0)
+        return self.tick(framerate)
+
+    def advance(self, ms):
+        """Advance by an arbitrary frame delta (e.g. one read from an event log)."""
+        self._now += int(ms * 1e6)
+        self._frame_ms = float(ms)
+        return self._frame_ms
+
+    def get_time(self):
+        return self._frame_ms
+
+    def get_fps(self):
+        return self._fps
+
+
+# ---------------------------------------------------------------------------
+#  Event timeline – cue onsets and the actions that follow them
+# ---------------------------------------------------------------------------
+class EventTimeline:
+    def __init__(self):
+        """
+        Record cue onsets and user actions on the task clock.
+
+        A cue is only stamped once the frame showing it has been displayed, so
+        cue-onset-to-next-action latencies measure what the patient saw.
+        """
+        self.cues = []  # (t_ns, name)
+        self.actions = []  # (t_ns, name)
+        self._pending_cues = []
+
+    def cue(self, name):
+        """Queue a cue; it is stamped by the next `frame_displayed`."""
+        self._pending_cues.append(name)
+
+    def action(self, name, t_ns):
+        self.actions.append((t_ns, name))
+
+    def clear(self):
+        self.cues.clear()
+        self.actions.clear()
+        self._pending_cues.clear()
+
+    def frame_displayed(self, t_ns):
+        for name in self._pending_cues:
+            self.cues.append((t_ns, name))
+        self._pending_cues.clear()
+
+    def cue_latencies(self):
+        """
+        Pair each cue with the first action at or after its onset.
+
+        Returns:
+            list: Dicts with cue name, onset and latency in milliseconds
+            (None when no action followed).
+        """
+        out = []
+        i = 0
+        for t_cue, name in self.cues:
+            while i < len(self.actions) and self.actions[i][0] < t_cue:
+                i += 1
+            latency = None
+            action = None
+            if i < len(self.actions):
+                latency = round((self.actions[i][0] - t_cue) / 1e6, 3)
+                action = self.actions[i][1]
+            out.append({"cue": name, "onset_ns": t_cue, "next_action": action, "latency_ms": latency})
+        return out
@@ -0,0 +1,375 @@
+import io
+import math
+import struct
+
+MAGIC = b"EPT1"
+DRAG, HOVER = 1, 0
+_FOOTER = struct.Struct("<I4s")  # index offset, magic
+
+
+# ---------------------------------------------------------------------------
+#  Varints
+# ---------------------------------------------------------------------------
+def _zigzag(n):
+    return (n << 1) ^ (n >> 63)
+
+
+def _unzigzag(n):
+    return (n >> 1) ^ -(n & 1)
+
+
+def _put_varint(buf, n):
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _get_varint(data, pos):
+    shift = result = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _read_varint(stream):
+    shift = result = 0
+    while True:
+        raw = stream.read(1)
+        if not raw:
+            raise EOFError("truncated trace")
+        b = raw[0]
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result
+        shift += 7
+
+
+# ---------------------------------------------------------------------------
+#  Segments
+# ---------------------------------------------------------------------------
+class Segment:
+    def __init__(self, kind, points):
+        """
+        One stretch of pointer movement.
+
+        Args:
+            kind (int): DRAG (button 1 held) or HOVER.
+            points (list): (t_ns, x, y) tuples, t relative to session start.
+        """
+        self.kind = kind
+        self.points = points
+
+    def __len__(self):
+        return len(self.points)
+
+    def __repr__(self):
+        kind = "drag" if self.kind == DRAG else "hover"
+        span = (self.points[-1][0] - self.points[0][0]) / 1e6 if self.points else 0
+        return f"<Segment {kind} {len(self.points)} pts {span:.0f} ms>"
+
+
+def segments(samples, start_ns=0, hover=False):
+    """
+    Split InputLayer motion samples into drag (and optionally hover) segments.
+
+    Args:
+        samples (list): (t_ns, x, y, buttons) from `InputLayer.samples`.
+        start_ns (int): Session start on the same clock; times become relative.
+        hover (bool): Keep the movement between drags too.
+
+    Returns:
+        list: Segment objects in time order.
+    """
+    out = []
+    current = None
+    for t, x, y, buttons in samples:
+        kind = DRAG if buttons and buttons[0] else HOVER
+        if current is None or current.kind != kind:
+            current = Segment(kind, [])
+            out.append(current)
+        current.points.append((t - start_ns, int(round(x)), int(round(y))))
+    return [s for s in out if hover or s.kind == DRAG]
+
+
+# ---------------------------------------------------------------------------
+#  Ramer–Douglas–Peucker
+# ---------------------------------------------------------------------------
+def simplify(points, epsilon, synchronized=True):
+    """
+    Drop points that lie within `epsilon` pixels of the simplified path.
+
+    With `synchronized` (the default) the distance is measured to where the
+    simplified path puts the pointer at that point's own timestamp, so the
+    error bound holds in time as well as space and speed and pause
+    features survive. Without it only the shape of the path is kept.
+
+    Args:
+        points (list): (t_ns, x, y) tuples.
+        epsilon (float): Maximum deviation in pixels.
+        synchronized (bool): Time-synchronized rather than perpendicular
+            distance.
+
+    Returns:
+        list: The kept points, first and last always included.
+    """
+    n = len(points)
+    if n < 3 or epsilon <= 0:
+        return list(points)
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    eps2 = epsilon * epsilon
+    while stack:  # iterative, so long drags cannot hit the recursion limit
+        lo, hi = stack.pop()
+        ta, xa, ya = points[lo]
+        tb, xb, yb = points[hi]
+        dx, dy, dt = xb - xa, yb - ya, tb - ta
+        d2_ab = dx * dx + dy * dy
+        worst, worst_d2 = None, eps2
+        for i in range(lo + 1, hi):
+            t, x, y = points[i]
+            if synchronized:
+                u = (t - ta) / dt if dt else 0.0
+            elif d2_ab:
+                u = max(0.0, min(1.0, ((x - xa) * dx + (y - ya) * dy) / d2_ab))
+            else:
+                u = 0.0
+            ex, ey = x - xa - u * dx, y - ya - u * dy
+            d2 = ex * ex + ey * ey
+            if d2 > worst_d2:
+                worst, worst_d2 = i, d2
+        if worst is not None:
+            keep[worst] = True
+            stack.append((lo, worst))
+            stack.append((worst, hi))
+    return [p for p, k in zip(points, keep) if k]
+
+
+# ---------------------------------------------------------------------------
+#  Encoding
+# ---------------------------------------------------------------------------
+def _encode_segment(segment, prev_t0, time_unit_ns):
+    buf = bytearray()
+    pts = segment.points
+    _put_varint(buf, segment.kind)
+    _put_varint(buf, len(pts))
+    t_prev = prev_t0
+    x_prev = y_prev = 0
+    for t, x, y in pts:
+        tq = int(round(t / time_unit_ns))
+        _put_varint(buf, _zigzag(tq - t_prev))
+        _put_varint(buf, _zigzag(x - x_prev))
+        _put_varint(buf, _zigzag(y - y_prev))
+        t_prev, x_prev, y_prev = tq, x, y
+    first_t = int(round(pts[0][0] / time_unit_ns)) if pts else prev_t0
+    return bytes(buf), first_t
+
+
+def encode(segs, time_unit_ns=100_000, epsilon=None, synchronized=True):
+    """
+    Pack segments into a compact byte string.
+
+    Layout: magic, time unit, segment count, then one length-prefixed block
+    per segment (kind, point count, zigzag varint deltas of t, x and y;
+    each block's time starts from the previous block's first sample), then
+    an index of block offsets and first timestamps, then a fixed footer
+    pointing at the index. Blocks can be read front to back from a stream;
+    the index gives random access to any segment.
+
+    Args:
+        segs (list): Segment objects.
+        time_unit_ns (int): Timestamp resolution (default 0.1 ms).
+        epsilon (float): Simplify each segment with RDP at this tolerance
+            in pixels; None keeps every sample.
+        synchronized (bool): Passed to `simplify`.
+
+    Returns:
+        bytes: The encoded trace.
+    """
+    out = bytearray(MAGIC)
+    _put_varint(out, time_unit_ns)
+    _put_varint(out, len(segs))
+    index = []
+    prev_t0 = 0
+    for seg in segs:
+        if epsilon:
+            seg = Segment(seg.kind, simplify(seg.points, epsilon, synchronized))
+        block, first_t = _encode_segment(seg, prev_t0, time_unit_ns)
+        index.append((len(out), first_t))
+        _put_varint(out, len(block))
+        out += block
+        prev_t0 = first_t
+    index_at = len(out)
+    for offset, first_t in index:
+        _put_varint(out, offset)
+        _put_varint(out, first_t)
+    out += _FOOTER.pack(index_at, MAGIC)
+    return bytes(out)
+
+
+def _decode_block(block, prev_t0, time_unit_ns):
+    kind, pos = _get_varint(block, 0)
+    n, pos = _get_varint(block, pos)
+    t = prev_t0
+    x = y = 0
+    points = []
+    for _ in range(n):
+        dt, pos = _get_varint(block, pos)
+        dx, pos = _get_varint(block, pos)
+        dy, pos = _get_varint(block, pos)
+        t += _unzigzag(dt)
+        x += _unzigzag(dx)
+        y += _unzigzag(dy)
+        points.append((t * time_unit_ns, x, y))
+    first_t = points[0][0] // time_unit_ns if points else prev_t0
+    return Segment(kind, points), first_t
+
+
+# ---------------------------------------------------------------------------
+#  Decoding
+# ---------------------------------------------------------------------------
+def iter_decode(stream):
+    """
+    Decode segments one at a time from a binary file-like object.
+
+    Only one block is held in memory, so a large trace can be processed
+    (or forwarded) while it is still being read.
+
+    Yields:
+        Segment: In stored order.
+    """
+    if isinstance(stream, (bytes, bytearray)):
+        stream = io.BytesIO(stream)
+    if stream.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not an E-PASS trace")
+    time_unit_ns = _read_varint(stream)
+    count = _read_varint(stream)
+    prev_t0 = 0
+    for _ in range(count):
+        size = _read_varint(stream)
+        block = stream.read(size)
+        if len(block) != size:
+            raise EOFError("truncated trace")
+        seg, prev_t0 = _decode_block(block, prev_t0, time_unit_ns)
+        yield seg
+
+
+def decode(data):
+    """Decode every segment of an encoded trace."""
+    return list(iter_decode(data))
+
+
+class TraceReader:
+    def __init__(self, data):
+        """
+        Random access to the segments of an encoded trace.
+
+        Args:
+            data (bytes): Output of `encode` (e.g. read from a file or a
+                database blob).
+        """
+        self.data = data
+        index_at, magic = _FOOTER.unpack_from(data, len(data) - _FOOTER.size)
+        if data[:len(MAGIC)] != MAGIC or magic != MAGIC:
+            raise ValueError("not an E-PASS trace")
+        pos = len(MAGIC)
+        self.time_unit_ns, pos = _get_varint(data, pos)
+        count, pos = _get_varint(data, pos)
+        self._index = []
+        pos = index_at
+        for _ in range(count):
+            offset, pos = _get_varint(data, pos)
+            first_t, pos = _get_varint(data, pos)
+            self._index.append((offset, first_t))
+
+    def __len__(self):
+        return len(self._index)
+
+    def __getitem__(self, i):
+        offset, _ = self._index[i]
+        prev_t0 = self._index[i - 1][1] if i > 0 else 0
+        size, pos = _get_varint(self.data, offset)
+        seg, _ = _decode_block(self.data[pos:pos + size], prev_t0, self.time_unit_ns)
+        return seg
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def start_ns(self, i):
+        """Time of segment `i`'s first sample without decoding it."""
+        return self._index[i][1] * self.time_unit_ns
+
+
+# ---------------------------------------------------------------------------
+#  Kinematic features
+# ---------------------------------------------------------------------------
+def kinematics(segment, pause_ms=100, pause_speed=20.0):
+    """
+    Summary features of one segment, as analysts compute them.
+
+    Args:
+        segment (Segment): Decoded or freshly split segment.
+        pause_ms (int): Shortest gap counted as a pause.
+        pause_speed (float): Speed (px/s) below which a gap is a pause.
+
+    Returns:
+        dict: duration_ms, path_px, straightness (chord / path),
+        mean and peak speed in px/s, and the number of pauses.
+    """
+    pts = segment.points
+    if len(pts) < 2:
+        return {"duration_ms": 0.0, "path_px": 0.0, "straightness": None,
+                "mean_speed": None, "peak_speed": None, "pauses": 0}
+    path = 0.0
+    peak = 0.0
+    pauses = 0
+    for (t0, x0, y0), (t1, x1, y1) in zip(pts, pts[1:]):
+        step = math.hypot(x1 - x0, y1 - y0)
+        dt = (t1 - t0) / 1e9
+        path += step
+        if dt > 0:
+            peak = max(peak, step / dt)
+        if dt * 1000 >= pause_ms and step / dt < pause_speed:
+            pauses += 1
+    duration = (pts[-1][0] - pts[0][0]) / 1e9
+    chord = math.hypot(pts[-1][1] - pts[0][1], pts[-1][2] - pts[0][2])
+    return {
+        "duration_ms": round(duration * 1000, 1),
+        "path_px": round(path, 1),
+        "straightness": round(chord / path, 3) if path else None,
+        "mean_speed": round(path / duration, 1) if duration else None,
+        "peak_speed": round(peak, 1),
+        "pauses": pauses,
+    }
+
+
+def save(path, samples, start_ns=0, hover=False, **encode_kw):
+    """Encode InputLayer samples and write them to `path`; returns the size."""
+    data = encode(segments(samples, start_ns, hover), **encode_kw)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+
+def load(path):
+    with open(path, "rb") as f:
+        return TraceReader(f.read())
+
+
+if __name__ == "__main__":
+    # python trajectory.py TRACE [EPSILON] – per-segment features, and the
+    # size the trace would have simplified to EPSILON pixels
+    import sys
+
+    reader = load(sys.argv[1])
+    print(f"{len(reader)} segments, {len(reader.data)} bytes")
+    for i, seg in enumerate(reader):
+        print(i, seg, kinematics(seg))
+    if len(sys.argv) > 2:
+        simplified = encode(list(reader), reader.time_unit_ns, epsilon=float(sys.argv[2]))
+        print(f"simplified to {sys.argv[2]} px: {len(simplified)} bytes")